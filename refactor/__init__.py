@@ -11,7 +11,7 @@
     from refactor.core import DownloadManager, ReportManager
     
     dm = DownloadManager(data_dir='data')
-    result = dm.download('玉山商業銀行', 114, 1)
+    result = dm.download_sync('玉山商業銀行', 114, 1)
     
     rm = ReportManager()
     df = rm.generate_report('data/114Q1', 'output/report.xlsx')
@@ -0,0 +1,70 @@
+"""
+原子寫入工具
+
+PDF 先寫入同目錄下的暫存檔 (.part)，寫完 fsync 後再以 os.replace 改名為正式檔名。
+程式中斷時最多留下 .part 暫存檔，正式路徑不會出現被截斷的 PDF，
+file_exists() 也就不會把不完整的檔案當成已下載。
+"""
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+
+TEMP_SUFFIX = ".part"
+
+
+def temp_path_for(file_path: str) -> str:
+    """取得對應的暫存檔路徑"""
+    return f"{file_path}{TEMP_SUFFIX}"
+
+
+def remove_quietly(path: str):
+    """刪除檔案（不存在或失敗時忽略）"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def commit_temp_file(temp_path: str, file_path: str):
+    """
+    將已寫完的暫存檔 fsync 後改名為正式檔名
+
+    Args:
+        temp_path: 暫存檔路徑
+        file_path: 正式檔案路徑
+    """
+    with open(temp_path, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(temp_path, file_path)
+
+
+@contextmanager
+def atomic_open(file_path: str) -> Iterator[BinaryIO]:
+    """
+    以原子方式寫入檔案
+
+    區塊正常結束時 fsync 並改名為正式檔名；發生例外時刪除暫存檔。
+
+    使用方式:
+        with atomic_open("data/114Q1/xx.pdf") as f:
+            f.write(chunk)
+    """
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    temp_path = temp_path_for(file_path)
+
+    try:
+        with open(temp_path, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        remove_quietly(temp_path)
+        raise
+
+
+def atomic_write_bytes(file_path: str, content: bytes):
+    """以原子方式寫入整段內容"""
+    with atomic_open(file_path) as f:
+        f.write(content)
@@ -16,7 +16,10 @@ class BOTDownloader(BaseBankDownloader):
     async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
         # 前往財報頁面
         await page.goto(self.bank_url, wait_until="networkidle")
-        await page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(page, timeout=3000)
+        
+        # 網站 title 格式: "個體財務報告113年第2季.pdf(另開分頁)"
+        target_title = f"個體財務報告{year}年第{quarter}季"
         
         # 切換到指定年份（下拉選單預設可能不是目標年份）
         try:
@@ -24,18 +27,19 @@ class BOTDownloader(BaseBankDownloader):
             current_year = (await select_button.text_content()).strip().replace("年", "")
             if str(year) != current_year:
                 await select_button.click()
-                await page.wait_for_timeout(1000)
-                await page.locator(f"ul.select-options li:has-text('{year}年')").click()
-                await page.wait_for_timeout(2000)
+                await self.wait_for_text(page, "ul.select-options li", f"{year}年", timeout=1000)
+                option = page.locator(f"ul.select-options li:has-text('{year}年')")
+                # 切換年份會以 XHR 重新載入清單：先等回應，再等目標季度的連結出現（該季未公布時等到上限）
+                await self.wait_for_response_matching(page, "bot.com.tw", action=option.click, timeout=5000)
+                await self.wait_for_text(
+                    page, f"app-document-download a[title*='{target_title}']", timeout=2000, state="attached"
+                )
         except Exception as e:
             return DownloadResult(
                 status=DownloadStatus.ERROR,
                 message=f"切換年份失敗: {e}"
             )
         
-        # 網站 title 格式: "個體財務報告113年第2季.pdf(另開分頁)"
-        target_title = f"個體財務報告{year}年第{quarter}季"
-        
         # 找所有下載連結
         links = await page.query_selector_all("app-document-download a")
         
@@ -7,7 +7,9 @@
 - row[0]: td[0]=114年度, td[1]=第一季標題, td[2]=第二季標題, td[3]=第三季標題, td[4]=全年度標題
 - row[1]: td[0]=財務報告連結, td[1]=財務報告連結, td[2]=財務報告連結, td[3]=財務報告連結
 """
-from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+import re
+from typing import List, Optional, Tuple
+from .base import BaseBankDownloader, DiscoveredReport, DiscoveryError, DownloadResult, DownloadStatus
 from playwright.async_api import Page
 
 
@@ -18,90 +20,76 @@ class LandBankDownloader(BaseBankDownloader):
     bank_code = 2
     bank_url = "https://www.landbank.com.tw/Category/Items/%E8%B2%A1%E5%8B%99%E6%A5%AD%E5%8B%99%E8%B3%87%E8%A8%8A-%E8%B2%A1%E5%A0%B1"
     
-    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
-        quarter_text = self.get_quarter_text(quarter)
-        
+    async def _discover(
+        self, page: Page, year: Optional[int] = None, target: Optional[Tuple[int, int]] = None
+    ) -> List[DiscoveredReport]:
         # 前往財務業務資訊頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)  # 等待頁面完全載入
+        await self.wait_for_dom_stable(page, timeout=2000)  # 等待頁面完全載入
         
         # 步驟1: 點擊「銀行重要財務業務資訊」展開按鈕
         expand_btn = page.locator('[aria-label="按下後展開資訊"][title="銀行重要財務業務資訊"]')
-        
         if await expand_btn.count() == 0:
-            return DownloadResult(
-                status=DownloadStatus.ERROR,
-                message="找不到「銀行重要財務業務資訊」展開按鈕"
-            )
+            raise DiscoveryError("找不到「銀行重要財務業務資訊」展開按鈕")
         
         # 點擊展開
         await expand_btn.click()
-        await page.wait_for_timeout(1500)  # 等待展開動畫
+        await self.wait_for_dom_stable(page, timeout=1500)  # 等待展開動畫
         
-        # 步驟2: 找到包含指定年度的表格列
-        # 表格結構：年度標題在 td[0]，連結在下一行
-        year_str = f"{year}年度"
+        # 步驟2: 找出所有年度列，連結在年度列的下一行
+        # 季度對應欄位: Q1=td[0], Q2=td[1], Q3=td[2], Q4=td[3]
         rows = page.locator('tbody tr')
         row_count = await rows.count()
+        reports = []
+        
+        for i in range(row_count - 1):
+            first_td = rows.nth(i).locator('td').first
+            if await first_td.count() == 0:
+                continue
+            match = re.search(r"(\d+)年度", (await first_td.text_content()) or "")
+            if not match:
+                continue
+            row_year = int(match.group(1))
+            if target and row_year != target[0]:
+                continue
+            
+            tds = rows.nth(i + 1).locator('td')
+            for quarter_td_idx in range(min(await tds.count(), 4)):
+                if target and quarter_td_idx + 1 != target[1]:
+                    continue
+                target_td = tds.nth(quarter_td_idx)
+                quarter_link = target_td.locator('a:has-text("財務報告")')
+                if await quarter_link.count() == 0:
+                    # 嘗試找任何 a 連結
+                    quarter_link = target_td.locator('a')
+                if await quarter_link.count() == 0:
+                    continue
+                
+                href = await quarter_link.first.get_attribute("href")
+                if href:
+                    # 組合完整 URL
+                    pdf_url = href if href.startswith("http") else f"https://www.landbank.com.tw{href}"
+                    reports.append((row_year, quarter_td_idx + 1, pdf_url))
+            if target:
+                break
+        
+        return reports
+    
+    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
+        quarter_text = self.get_quarter_text(quarter)
         
-        target_row_idx = -1
-        for i in range(row_count):
-            row = rows.nth(i)
-            first_td = row.locator('td').first
-            if await first_td.count() > 0:
-                text = (await first_td.text_content()).strip()
-                if year_str in text:
-                    target_row_idx = i
-                    break
-        
-        if target_row_idx == -1:
-            return DownloadResult(
-                status=DownloadStatus.NO_DATA,
-                message=f"找不到 {year} 年度的資料列"
-            )
-        
-        # 步驟3: 取得下一行（連結行）的對應季度連結
-        # 季度對應欄位: Q1=td[0], Q2=td[1], Q3=td[2], Q4=td[3]
-        link_row = rows.nth(target_row_idx + 1)
-        tds = link_row.locator('td')
-        td_count = await tds.count()
-        
-        # 季度對應的 td 索引（第一季=0, 第二季=1, 第三季=2, 第四季/全年度=3）
-        quarter_td_idx = quarter - 1
-        
-        if td_count <= quarter_td_idx:
-            return DownloadResult(
-                status=DownloadStatus.NO_DATA,
-                message=f"找不到 {year}年{quarter_text} 的下載連結"
-            )
-        
-        target_td = tds.nth(quarter_td_idx)
-        quarter_link = target_td.locator('a:has-text("財務報告")')
-        
-        if await quarter_link.count() == 0:
-            # 嘗試找任何 a 連結
-            quarter_link = target_td.locator('a')
+        # 列表頁一次列出所有年度與季度，只取目標季度
+        try:
+            reports = await self._discover(page, target=(year, quarter))
+        except DiscoveryError as e:
+            return DownloadResult(status=DownloadStatus.ERROR, message=str(e))
+        pdf_url = self._pick_discovered(reports, year, quarter)
         
-        if await quarter_link.count() == 0:
+        if not pdf_url:
             return DownloadResult(
                 status=DownloadStatus.NO_DATA,
                 message=f"找不到 {year}年{quarter_text} 的財務報告連結"
             )
         
-        # 取得 PDF URL
-        href = await quarter_link.first.get_attribute("href")
-        
-        if not href:
-            return DownloadResult(
-                status=DownloadStatus.ERROR,
-                message="無法取得 PDF 連結"
-            )
-        
-        # 組合完整 URL
-        if not href.startswith("http"):
-            pdf_url = f"https://www.landbank.com.tw{href}"
-        else:
-            pdf_url = href
-        
         return await self.download_pdf_from_url(page, pdf_url, year, quarter)
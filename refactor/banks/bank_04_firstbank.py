@@ -21,7 +21,7 @@ class FirstBankDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_dom_stable(page, timeout=2000)
         
         # 建立要搜尋的 title 關鍵字
         # 網站格式多變，例如:
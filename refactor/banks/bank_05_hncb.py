@@ -6,8 +6,6 @@
 - 有年份下拉選單 (id=year)，需先切換到對應年份
 - 下載連結 title 格式: "下載 華南銀行2025年第1季合併財務報告.pdf"
 """
-import subprocess
-import os
 from .base import BaseBankDownloader, DownloadResult, DownloadStatus
 from playwright.async_api import Page
 
@@ -19,6 +17,7 @@ class HNCBDownloader(BaseBankDownloader):
     bank_code = 5
     bank_url = "https://www.hnfhc.com.tw/HNFHC/ir/d.do"
     headless = True  # 預設無頭模式，失敗時自動重試有頭模式
+    verify_ssl = False  # 憑證鏈不完整，跳過 SSL 驗證
     
     async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
         quarter_text = self.get_quarter_text(quarter)
@@ -29,14 +28,14 @@ class HNCBDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_dom_stable(page, timeout=2000)
         
         # 步驟1: 切換年份下拉選單
         year_select = page.locator('select#year')
         if await year_select.count() > 0:
             await year_select.select_option(str(western_year))
             await page.wait_for_load_state("networkidle")
-            await page.wait_for_timeout(2000)
+            await self.wait_for_text(page, f'a[title*="華南銀行{western_year}年"]', timeout=2000, state="attached")
         
         # 步驟2: 建立搜尋的 title 關鍵字
         # 格式: "下載 華南銀行2025年第1季合併財務報告.pdf"
@@ -75,32 +74,11 @@ class HNCBDownloader(BaseBankDownloader):
                 message="無法取得 PDF 連結"
             )
         
-        # 使用 wget 下載（比較能處理 SSL 問題）
-        try:
-            self.ensure_dir(year, quarter)
-            file_path = self.get_file_path(year, quarter)
-            
-            # 使用 wget 下載，--no-check-certificate 跳過 SSL 驗證
-            result = subprocess.run(
-                ['wget', '--no-check-certificate', '-q', '-O', file_path, href],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            
-            if result.returncode == 0 and os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                return DownloadResult(
-                    status=DownloadStatus.SUCCESS,
-                    message="下載成功",
-                    file_path=file_path
-                )
-            else:
-                return DownloadResult(
-                    status=DownloadStatus.ERROR,
-                    message=f"wget 下載失敗: {result.stderr}"
-                )
-        except Exception as e:
-            return DownloadResult(
-                status=DownloadStatus.ERROR,
-                message=f"下載失敗: {str(e)}"
-            )
+        # 以 HTTP 串流下載（跳過 SSL 驗證，不阻塞其他銀行）
+        result = await self.stream_download(href, year, quarter)
+        if result.status == DownloadStatus.SUCCESS:
+            return result
+        
+        # 交握或傳輸失敗時改用 Playwright 下載
+        self._cleanup_failed_download(year, quarter)
+        return await self.download_pdf_from_url(page, href, year, quarter)
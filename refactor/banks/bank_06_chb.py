@@ -24,7 +24,7 @@ class CHBDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_dom_stable(page, timeout=2000)
         
         # 建立搜尋關鍵字
         # Q4 對應「年度」，其他季度對應「第X季」
@@ -63,7 +63,7 @@ class CHBDownloader(BaseBankDownloader):
         href = await target_link.get_attribute("href")
         await page.goto(f"https://www.bankchb.com/frontend/{href}")
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(1500)
+        await self.wait_for_dom_stable(page, timeout=1500)
         
         # 找 PDF 連結（法定財務業務資訊）
         pdf_link = page.locator('a.editor_link:has-text("法定財務業務資訊")')
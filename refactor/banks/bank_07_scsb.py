@@ -23,7 +23,7 @@ class SCSBDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_dom_stable(page, timeout=2000)
         
         # 步驟1: 切換年份下拉選單
         year_select = page.locator('select#generalQaList')
@@ -31,7 +31,10 @@ class SCSBDownloader(BaseBankDownloader):
             year_option = f"#year_{year}"
             try:
                 await year_select.select_option(year_option)
-                await page.wait_for_timeout(1500)
+                # 切換年份會重新載入清單，等到目標季度的連結出現（該季未公布時等到上限）
+                await self.wait_for_text(
+                    page, f'a[title*="{quarter_text}"][title*="法定財務業務資訊"]', timeout=1500
+                )
             except:
                 pass  # 如果選項不存在，繼續嘗試
         
@@ -2,7 +2,9 @@
 台北富邦銀行 (8) - Taipei Fubon Commercial Bank
 網址: https://www.fubon.com/banking/about/intro_FBB/Financial_status.htm
 """
+from typing import Optional
 from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+from .http_engine import HttpEngine
 from playwright.async_api import Page
 
 
@@ -13,8 +15,15 @@ class FubonDownloader(BaseBankDownloader):
     bank_code = 8
     bank_url = "https://www.fubon.com/banking/about/intro_FBB/Financial_status.htm"
     
+    def _build_pdf_url(self, year: int, quarter: int) -> str:
+        """固定 URL 格式"""
+        return f"https://www.fubon.com/banking/document/about/intro_FBB/TW/{year}Q{quarter}.pdf"
+    
+    async def _resolve_direct_url(self, http: HttpEngine, year: int, quarter: int) -> Optional[str]:
+        return self._build_pdf_url(year, quarter)
+    
     async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
         # 直接嘗試下載 PDF (固定 URL 格式)
-        pdf_url = f"https://www.fubon.com/banking/document/about/intro_FBB/TW/{year}Q{quarter}.pdf"
+        pdf_url = self._build_pdf_url(year, quarter)
         
         return await self.download_pdf_from_url(page, pdf_url, year, quarter)
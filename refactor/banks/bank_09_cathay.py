@@ -25,7 +25,7 @@ class CathayDownloader(BaseBankDownloader):
         # 前往財報頁面（增加超時時間）
         await page.goto(self.bank_url, timeout=120000)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(5000)
+        await self.wait_for_dom_stable(page, timeout=5000)
         
         # 搜尋關鍵字
         # 格式可能是: "114年度 第一季財務報告" 或 "114年第1季"
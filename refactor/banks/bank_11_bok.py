@@ -20,7 +20,7 @@ class BOKDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_dom_stable(page, timeout=2000)
         
         # 建立搜尋的 title 關鍵字
         # Q1-Q3 格式: "114年度第二季季報.pdf（另開視窗）"
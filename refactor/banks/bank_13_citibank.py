@@ -31,7 +31,7 @@ class CitibankDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url, timeout=120000)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(8000)
+        await self.wait_for_text(page, f'a[href*="{western_year}"]', timeout=8000, state="attached")
         
         # 取得頁面 HTML 並搜尋 PDF
         html = await page.content()
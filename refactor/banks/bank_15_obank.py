@@ -27,7 +27,7 @@ class OBankDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(page, timeout=3000)
         
         # 搜尋目標連結
         # 格式: "2024 Q4 財務業務資訊" 或 "2025 Q1 財務業務資訊"
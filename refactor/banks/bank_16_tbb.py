@@ -2,8 +2,6 @@
 臺灣中小企業銀行 (16) - Taiwan Business Bank
 網址: https://ir.tbb.com.tw/financial/quarterly-results
 """
-import subprocess
-import os
 from .base import BaseBankDownloader, DownloadResult, DownloadStatus
 from playwright.async_api import Page
 
@@ -14,6 +12,7 @@ class TBBDownloader(BaseBankDownloader):
     bank_name = "臺灣中小企業銀行"
     bank_code = 16
     bank_url = "https://ir.tbb.com.tw/financial/quarterly-results"
+    verify_ssl = False  # 憑證鏈不完整，跳過 SSL 驗證
     
     async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
         quarter_text = self.get_quarter_text(quarter)
@@ -24,14 +23,14 @@ class TBBDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_dom_stable(page, timeout=2000)
         
         # 點選年份 (href="?y=2025" 的 a tag)
         year_link = page.locator(f'a[href="?y={western_year}"]')
         if await year_link.count() > 0:
             await year_link.first.click()
             await page.wait_for_load_state("networkidle")
-            await page.wait_for_timeout(1000)
+            await self.wait_for_dom_stable(page, timeout=1000)
         
         # 建立搜尋的報告名稱
         # 格式: "2025年第一季合併財務報告" 或 "2024年度合併財務報告" (第四季)
@@ -78,32 +77,11 @@ class TBBDownloader(BaseBankDownloader):
                 message=f"找不到 {year}年{quarter_text} ({search_text}) 的下載連結"
             )
         
-        # 使用 wget 下載 (類似華南銀行的方式)
-        try:
-            self.ensure_dir(year, quarter)
-            file_path = self.get_file_path(year, quarter)
-            
-            # 使用 wget 下載，--no-check-certificate 跳過 SSL 驗證
-            result = subprocess.run(
-                ['wget', '--no-check-certificate', '-q', '-O', file_path, pdf_url],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            
-            if result.returncode == 0 and os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                return DownloadResult(
-                    status=DownloadStatus.SUCCESS,
-                    message="下載成功",
-                    file_path=file_path
-                )
-            else:
-                return DownloadResult(
-                    status=DownloadStatus.ERROR,
-                    message=f"wget 下載失敗: {result.stderr}"
-                )
-        except Exception as e:
-            return DownloadResult(
-                status=DownloadStatus.ERROR,
-                message=f"下載失敗: {str(e)}"
-            )
+        # 以 HTTP 串流下載 (類似華南銀行的方式，跳過 SSL 驗證)
+        result = await self.stream_download(pdf_url, year, quarter)
+        if result.status == DownloadStatus.SUCCESS:
+            return result
+        
+        # 交握或傳輸失敗時改用 Playwright 下載
+        self._cleanup_failed_download(year, quarter)
+        return await self.download_pdf_from_url(page, pdf_url, year, quarter)
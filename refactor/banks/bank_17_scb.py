@@ -2,7 +2,9 @@
 渣打國際商業銀行 (17) - Standard Chartered Bank (Taiwan)
 網址: https://www.sc.com/tw/about-us/investor-relations/
 """
+from typing import Optional
 from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+from .http_engine import HttpEngine
 from playwright.async_api import Page
 
 
@@ -13,13 +15,20 @@ class SCBDownloader(BaseBankDownloader):
     bank_code = 17
     bank_url = "https://www.sc.com/tw/about-us/investor-relations/"
     
-    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
-        # 直接嘗試固定 URL 格式
+    def _build_pdf_url(self, year: int, quarter: int) -> str:
+        """固定 URL 格式"""
         if quarter == 1 or quarter == 3:
-            pdf_url = f"https://av.sc.com/tw/content/docs/tw-fi-{year}q{quarter}.pdf"
+            return f"https://av.sc.com/tw/content/docs/tw-fi-{year}q{quarter}.pdf"
         else:
             # 第二季和第四季用半年報格式
             half = quarter // 2
-            pdf_url = f"https://av.sc.com/tw/content/docs/tw-earnings-{year}_h{half}.pdf"
+            return f"https://av.sc.com/tw/content/docs/tw-earnings-{year}_h{half}.pdf"
+    
+    async def _resolve_direct_url(self, http: HttpEngine, year: int, quarter: int) -> Optional[str]:
+        return self._build_pdf_url(year, quarter)
+    
+    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
+        # 直接嘗試固定 URL 格式
+        pdf_url = self._build_pdf_url(year, quarter)
         
         return await self.download_pdf_from_url(page, pdf_url, year, quarter)
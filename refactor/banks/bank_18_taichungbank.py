@@ -2,7 +2,8 @@
 台中商業銀行 (18) - Taichung Commercial Bank
 網址: https://www.tcbbank.com.tw/Site/intro/finReport/finReport.aspx
 """
-from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+from typing import List, Optional, Tuple
+from .base import BaseBankDownloader, DiscoveredReport, DownloadResult, DownloadStatus
 from playwright.async_api import Page
 
 
@@ -54,29 +55,23 @@ class TaichungBankDownloader(BaseBankDownloader):
                     result += chinese_digits[one]
                 return result
     
-    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
-        quarter_text = self.get_quarter_text(quarter)
-        
-        # 將民國年轉為中文，例如 114 -> 一百一十四
-        chinese_year = self._number_to_chinese_year(year)
-        year_title = f"{chinese_year}年度"  # 例如：一百一十四年度
-        
-        # 季度對應文字
-        quarter_names = {
-            1: "第一季",
-            2: "第二季",
-            3: "第三季",
-            4: "第四季"
-        }
-        target_quarter = quarter_names[quarter]
-        
+    def _parse_year_title(self, text: str) -> Optional[int]:
+        """將年度標題（例如：一百一十四年度）轉回民國年"""
+        for year in range(200, 79, -1):
+            if f"{self._number_to_chinese_year(year)}年度" in text:
+                return year
+        return None
+    
+    async def _discover(
+        self, page: Page, year: Optional[int] = None, target: Optional[Tuple[int, int]] = None
+    ) -> List[DiscoveredReport]:
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_dom_stable(page, timeout=2000)
         
-        # 在 table tbody 中找到對應年度的 tr
-        pdf_url = None
+        quarter_names = {"第一季": 1, "第二季": 2, "第三季": 3, "第四季": 4}
+        reports = []
         
         # 找所有 tr 元素
         tr_elements = await page.locator("table tbody tr").all()
@@ -96,57 +91,68 @@ class TaichungBankDownloader(BaseBankDownloader):
                 continue
             
             # 第一個 div 中找 year-title
-            first_div = td_divs[0]
-            year_title_div = first_div.locator("div[class*='year-title']")
+            year_title_div = td_divs[0].locator("div[class*='year-title']")
             
             if await year_title_div.count() == 0:
                 continue
             
-            year_text = (await year_title_div.first.inner_text()).strip()
-            
-            if year_title not in year_text:
+            row_year = self._parse_year_title((await year_title_div.first.inner_text()).strip())
+            if row_year is None or (target and row_year != target[0]):
                 continue
             
-            # 找到對應年度，現在找第二個 div（包含季度下載連結）
-            quarters_div = td_divs[1]
-            
-            # 找各季度的 div
-            quarter_divs = await quarters_div.locator("> div").all()
+            # 第二個 div 包含各季度的 div
+            quarter_divs = await td_divs[1].locator("> div").all()
             
             for q_div in quarter_divs:
                 q_text = (await q_div.inner_text()).strip()
+                row_quarter = next((q for name, q in quarter_names.items() if name in q_text), None)
+                if row_quarter is None or (target and row_quarter != target[1]):
+                    continue
                 
-                if target_quarter in q_text:
-                    # 找到目標季度，取得 a 元素
-                    a_elements = await q_div.locator("a").all()
-                    
-                    if len(a_elements) >= 1:
-                        # 如果有多個 a 元素，使用第一個
-                        href = await a_elements[0].get_attribute("href")
-                        if href:
-                            if href.startswith("http"):
-                                pdf_url = href
-                            else:
-                                pdf_url = f"https://www.tcbbank.com.tw{href}"
-                            break
-            
-            if pdf_url:
-                break
+                # 如果有多個 a 元素，使用第一個
+                a_elements = await q_div.locator("a").all()
+                if not a_elements:
+                    continue
+                href = await a_elements[0].get_attribute("href")
+                if href:
+                    pdf_url = href if href.startswith("http") else f"https://www.tcbbank.com.tw{href}"
+                    reports.append((row_year, row_quarter, pdf_url))
+                    if target:
+                        return reports
+        
+        return reports
+    
+    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
+        quarter_text = self.get_quarter_text(quarter)
+        
+        # 將民國年轉為中文，例如 114 -> 一百一十四
+        year_title = f"{self._number_to_chinese_year(year)}年度"  # 例如：一百一十四年度
+        
+        # 列表頁一次列出所有年度與季度，只取目標季度
+        pdf_url = self._pick_discovered(await self._discover(page, target=(year, quarter)), year, quarter)
         
         if not pdf_url:
             return DownloadResult(
                 status=DownloadStatus.NO_DATA,
-                message=f"找不到 {year}年{quarter_text} ({year_title} {target_quarter}) 的下載連結"
+                message=f"找不到 {year}年{quarter_text} ({year_title} {quarter_text}) 的下載連結"
             )
         
-        # 導向 PDF URL 並使用 JavaScript fetch 下載
+        # 以 HTTP 串流直接寫入磁碟（沿用瀏覽器的 cookie）
+        result = await self.download_pdf_from_url(page, pdf_url, year, quarter)
+        # 只檢查不計時：回傳後 _download_uncached 會再驗證一次並記錄 validate
+        if self._validate_file(result, year, quarter):
+            return result
+        self._cleanup_failed_download(year, quarter)
+        
+        # 備用方案：導向 PDF URL 並使用 JavaScript fetch 下載
+        return await self._download_via_js_fetch(page, pdf_url, year, quarter)
+    
+    async def _download_via_js_fetch(self, page: Page, pdf_url: str, year: int, quarter: int) -> DownloadResult:
+        """在頁面內以 JavaScript fetch 取得 PDF（以 base64 傳回，較耗記憶體，僅作備用）"""
         try:
-            self.ensure_dir(year, quarter)
-            file_path = self.get_file_path(year, quarter)
-            
             # 先導向 PDF URL
             await page.goto(pdf_url, wait_until="networkidle")
-            await page.wait_for_timeout(2000)
+            await self.wait_for_dom_stable(page, timeout=2000)
             
             # 使用 JavaScript fetch 取得 PDF 內容 (以 base64 形式)
             import base64
@@ -174,8 +180,8 @@ class TaichungBankDownloader(BaseBankDownloader):
                 
                 # 檢查是否為 PDF
                 if content[:4] == b'%PDF':
-                    with open(file_path, 'wb') as f:
-                        f.write(content)
+                    file_path = self.save_pdf(content, year, quarter)
+                    self._remember_source(pdf_url)
                     
                     return DownloadResult(
                         status=DownloadStatus.SUCCESS,
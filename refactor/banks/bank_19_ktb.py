@@ -7,7 +7,8 @@
 - 114年、113年、112年... 按順序排列
 - 表格第一行是標題，後續行是季度資料
 """
-from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+from typing import List, Optional, Tuple
+from .base import BaseBankDownloader, DiscoveredReport, DownloadResult, DownloadStatus
 from playwright.async_api import Page
 
 
@@ -18,76 +19,66 @@ class KTBDownloader(BaseBankDownloader):
     bank_code = 19
     bank_url = "https://customer.ktb.com.tw/new/about/8d88e237"
     
-    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
-        quarter_text = self.get_quarter_text(quarter)
-        
+    async def _discover(
+        self, page: Page, year: Optional[int] = None, target: Optional[Tuple[int, int]] = None
+    ) -> List[DiscoveredReport]:
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(page, timeout=3000)
         
-        # 找所有年度標題和表格
+        # 年度標題與表格依序對應
         year_titles = page.locator("div.ktbcontent h3")
         tables = page.locator("table.tftable")
+        table_count = await tables.count()
         
-        # 找到目標年度的索引
-        target_index = -1
-        for i in range(await year_titles.count()):
+        # 格式: "第四季", "第三季", "第二季", "第一季"
+        quarter_map = {"第一季": 1, "第二季": 2, "第三季": 3, "第四季": 4}
+        reports = []
+        
+        for i in range(min(await year_titles.count(), table_count)):
             title_text = await year_titles.nth(i).inner_text()
             try:
                 year_on_page = int(title_text.split("年")[0])
-                if year_on_page == year:
-                    target_index = i
-                    break
-            except:
+            except ValueError:
                 continue
+            if target and year_on_page != target[0]:
+                continue
+            
+            rows = tables.nth(i).locator("tr")
+            for j in range(1, await rows.count()):  # 跳過標題行
+                row_text = await rows.nth(j).inner_text()
+                row_quarter = next((q for name, q in quarter_map.items() if name in row_text), None)
+                if row_quarter is None or (target and row_quarter != target[1]):
+                    continue
+                
+                # 找第二個 td 中的連結（母子公司合併報表）
+                tds = rows.nth(j).locator("td")
+                if await tds.count() < 2:
+                    continue
+                link = tds.nth(1).locator("a").first
+                if await link.count() == 0:
+                    continue
+                
+                href = await link.get_attribute("href")
+                if href:
+                    pdf_url = href if href.startswith("http") else f"https://customer.ktb.com.tw{href}"
+                    reports.append((year_on_page, row_quarter, pdf_url))
+                    if target:
+                        return reports
         
-        if target_index < 0:
-            return DownloadResult(
-                status=DownloadStatus.NO_DATA,
-                message=f"找不到 {year}年 的資料"
-            )
-        
-        if target_index >= await tables.count():
-            return DownloadResult(
-                status=DownloadStatus.NO_DATA,
-                message=f"找不到 {year}年 的表格"
-            )
-        
-        # 取得目標表格
-        table = tables.nth(target_index)
-        rows = table.locator("tr")
-        
-        # 搜尋目標季度
-        # 格式: "第四季", "第三季", "第二季", "第一季"
-        quarter_map = {1: "第一季", 2: "第二季", 3: "第三季", 4: "第四季"}
-        target_quarter_text = quarter_map.get(quarter, "")
+        return reports
+    
+    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
+        quarter_text = self.get_quarter_text(quarter)
         
-        target_link = None
-        for i in range(1, await rows.count()):  # 跳過標題行
-            row_text = await rows.nth(i).inner_text()
-            if target_quarter_text in row_text:
-                # 找第二個 td 中的連結（母子公司合併報表）
-                tds = rows.nth(i).locator("td")
-                if await tds.count() >= 2:
-                    link = tds.nth(1).locator("a").first
-                    if await link.count() > 0:
-                        target_link = link
-                        break
+        # 列表頁一次列出所有年度與季度，只取目標季度
+        pdf_url = self._pick_discovered(await self._discover(page, target=(year, quarter)), year, quarter)
         
-        if not target_link:
+        if not pdf_url:
             return DownloadResult(
                 status=DownloadStatus.NO_DATA,
                 message=f"找不到 {year}年{quarter_text} 的下載連結"
             )
         
-        href = await target_link.get_attribute("href")
-        if not href:
-            return DownloadResult(
-                status=DownloadStatus.ERROR,
-                message="無法取得下載連結"
-            )
-        
-        pdf_url = href if href.startswith("http") else f"https://customer.ktb.com.tw{href}"
-        
         return await self.download_pdf_from_url(page, pdf_url, year, quarter)
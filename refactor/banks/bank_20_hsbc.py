@@ -21,7 +21,7 @@ class HSBCDownloader(BaseBankDownloader):
         # 前往財報頁面（增加 timeout）
         await page.goto(self.bank_url, timeout=120000)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(5000)
+        await self.wait_for_dom_stable(page, timeout=5000)
         
         # 搜尋目標連結 - 格式: "2025年第一季重要財務業務資訊"
         target_text = f"{year_ad}年{quarter_text}重要財務業務資訊"
@@ -6,7 +6,10 @@
 - 連結文字使用中文數字（一百一十三年）
 - href 包含 113Q4.pdf 這樣的格式
 """
-from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+import re
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin
+from .base import BaseBankDownloader, DiscoveredReport, DownloadResult, DownloadStatus
 from playwright.async_api import Page
 
 
@@ -17,32 +20,40 @@ class HwataiBankDownloader(BaseBankDownloader):
     bank_code = 22
     bank_url = "https://www.hwataibank.com.tw/public/public02-01/"
     
-    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
-        quarter_text = self.get_quarter_text(quarter)
-        
+    async def _discover(
+        self, page: Page, year: Optional[int] = None, target: Optional[Tuple[int, int]] = None
+    ) -> List[DiscoveredReport]:
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(page, timeout=3000)
         
         # 搜尋 href 包含 113Q4.pdf 這樣格式的連結
-        search_pattern = f"{year}Q{quarter}.pdf"
-        
+        reports = []
         links = page.locator("a")
-        target_link = None
-        
         for i in range(await links.count()):
             href = await links.nth(i).get_attribute("href") or ""
-            if search_pattern in href:
-                target_link = links.nth(i)
-                break
+            match = re.search(r"(?<!\d)(\d{3})Q([1-4])\.pdf", href)
+            if match:
+                report = (int(match.group(1)), int(match.group(2)), urljoin(self.bank_url, href))
+                if target and report[:2] != target:
+                    continue
+                reports.append(report)
+                if target:
+                    break
         
-        if not target_link:
+        return reports
+    
+    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
+        quarter_text = self.get_quarter_text(quarter)
+        
+        # 列表頁一次列出所有年度與季度，只取目標季度
+        pdf_url = self._pick_discovered(await self._discover(page, target=(year, quarter)), year, quarter)
+        
+        if not pdf_url:
             return DownloadResult(
                 status=DownloadStatus.NO_DATA,
                 message=f"找不到 {year}年{quarter_text} 的資料"
             )
         
-        pdf_url = await target_link.get_attribute("href")
-        
         return await self.download_pdf_from_url(page, pdf_url, year, quarter)
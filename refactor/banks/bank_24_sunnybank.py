@@ -58,8 +58,7 @@ class SunnyBankDownloader(BaseBankDownloader):
         download = await download_info.value
         
         # 儲存檔案
-        save_path = self.get_file_path(year, quarter)
-        await download.save_as(save_path)
+        save_path = await self.save_download(download, year, quarter)
         
         return DownloadResult(
             status=DownloadStatus.SUCCESS,
@@ -7,7 +7,9 @@
 - 表頭: 年度, 第一季, 第二季, 第三季, 第四季
 - 連結格式: 113_Q4.pdf
 """
-from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+import re
+from typing import List, Optional, Tuple
+from .base import BaseBankDownloader, DiscoveredReport, DownloadResult, DownloadStatus
 from playwright.async_api import Page
 
 
@@ -18,45 +20,53 @@ class BOPDownloader(BaseBankDownloader):
     bank_code = 25
     bank_url = "https://www.bop.com.tw/Footer/Financial_Report?tni=110&refid=null"
     
-    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
-        quarter_text = self.get_quarter_text(quarter)
-        
+    async def _discover(
+        self, page: Page, year: Optional[int] = None, target: Optional[Tuple[int, int]] = None
+    ) -> List[DiscoveredReport]:
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(3000)
-        
-        # 搜尋連結：格式為 113_Q4.pdf
-        search_text = f"{year}_Q{quarter}.pdf"
+        await self.wait_for_dom_stable(page, timeout=3000)
         
+        # 搜尋連結：文字格式為 113_Q4.pdf
+        reports = []
         links = page.locator("a")
-        target_link = None
-        
         for i in range(await links.count()):
             text = (await links.nth(i).inner_text()).strip()
-            if search_text in text:
-                target_link = links.nth(i)
+            match = re.search(r"(?<!\d)(\d{3})_Q([1-4])\.pdf", text)
+            if not match:
+                continue
+            report_key = (int(match.group(1)), int(match.group(2)))
+            if target and report_key != target:
+                continue
+            
+            href = await links.nth(i).get_attribute("href")
+            if not href:
+                continue
+            
+            # 處理相對路徑
+            if href.startswith("../"):
+                pdf_url = f"https://www.bop.com.tw/{href.replace('../', '')}"
+            elif not href.startswith("http"):
+                pdf_url = f"https://www.bop.com.tw/{href.lstrip('/')}"
+            else:
+                pdf_url = href
+            reports.append((*report_key, pdf_url))
+            if target:
                 break
         
-        if not target_link:
+        return reports
+    
+    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
+        quarter_text = self.get_quarter_text(quarter)
+        
+        # 列表頁一次列出所有年度與季度，只取目標季度
+        pdf_url = self._pick_discovered(await self._discover(page, target=(year, quarter)), year, quarter)
+        
+        if not pdf_url:
             return DownloadResult(
                 status=DownloadStatus.NO_DATA,
                 message=f"找不到 {year}年{quarter_text} 的資料"
             )
         
-        href = await target_link.get_attribute("href")
-        if not href:
-            return DownloadResult(
-                status=DownloadStatus.ERROR,
-                message="無法取得下載連結"
-            )
-        
-        # 處理相對路徑
-        if href.startswith("../"):
-            pdf_url = f"https://www.bop.com.tw/{href.replace('../', '')}"
-        elif not href.startswith("http"):
-            pdf_url = f"https://www.bop.com.tw/{href.lstrip('/')}"
-        else:
-            pdf_url = href
-        
         return await self.download_pdf_from_url(page, pdf_url, year, quarter)
@@ -8,7 +8,11 @@
 - href 格式: /web/wp-content/uploads/files/expose/MNews{年}{月}.pdf
 - 例如: MNews11403.pdf = 114年3月 = Q1
 """
-from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+import re
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin
+from .base import BaseBankDownloader, DiscoveredReport, DownloadResult, DownloadStatus
+from .http_engine import HttpEngine
 from playwright.async_api import Page
 
 
@@ -19,40 +23,54 @@ class CotaBankDownloader(BaseBankDownloader):
     bank_code = 26
     bank_url = "https://www.cotabank.com.tw/web/public/expose/"
     
-    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
-        quarter_text = self.get_quarter_text(quarter)
-        
-        # 季度對應月份（格式為兩位數）
-        quarter_month_map = {1: "03", 2: "06", 3: "09", 4: "12"}
-        target_month = quarter_month_map.get(quarter, "")
-        
-        # 直接組合 PDF URL（MNews 格式）
-        # 格式: MNews{年}{月}.pdf，例如 MNews11403.pdf
-        pdf_filename = f"MNews{year}{target_month}.pdf"
-        pdf_url = f"https://www.cotabank.com.tw/web/wp-content/uploads/files/expose/{pdf_filename}"
+    # 季度對應月份（格式為兩位數）
+    quarter_month_map = {1: "03", 2: "06", 3: "09", 4: "12"}
+    
+    def _build_pdf_url(self, year: int, quarter: int) -> str:
+        """
+        直接組合 PDF URL（MNews 格式）
         
-        # 前往財報頁面確認連結存在
+        格式: MNews{年}{月}.pdf，例如 MNews11403.pdf
+        """
+        target_month = self.quarter_month_map.get(quarter, "")
+        return f"https://www.cotabank.com.tw/web/wp-content/uploads/files/expose/MNews{year}{target_month}.pdf"
+    
+    async def _resolve_direct_url(self, http: HttpEngine, year: int, quarter: int) -> Optional[str]:
+        return self._build_pdf_url(year, quarter)
+    
+    async def _discover(
+        self, page: Page, year: Optional[int] = None, target: Optional[Tuple[int, int]] = None
+    ) -> List[DiscoveredReport]:
+        # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_dom_stable(page, timeout=2000)
         
-        # 確認頁面上有對應的連結
-        links = page.locator(f'a[href*="{pdf_filename}"]')
-        if await links.count() == 0:
-            # 嘗試搜尋文字連結
-            month_text = str(int(target_month))  # "03" -> "3"
-            year_links = page.locator(f'a:has-text("{month_text}月")')
-            found = False
-            for i in range(await year_links.count()):
-                href = await year_links.nth(i).get_attribute("href") or ""
-                if f"MNews{year}" in href:
-                    found = True
+        # href 格式: MNews{年}{月}.pdf，例如 MNews11403.pdf = 114年3月 = Q1
+        month_quarter_map = {month: quarter for quarter, month in self.quarter_month_map.items()}
+        reports = []
+        links = page.locator('a[href*="MNews"]')
+        for i in range(await links.count()):
+            href = await links.nth(i).get_attribute("href") or ""
+            match = re.search(r"MNews(\d{3})(\d{2})\.pdf", href)
+            if match and match.group(2) in month_quarter_map:
+                report_key = (int(match.group(1)), month_quarter_map[match.group(2)])
+                if target and report_key != target:
+                    continue
+                reports.append((*report_key, urljoin(self.bank_url, href)))
+                if target:
                     break
-            
-            if not found:
-                return DownloadResult(
-                    status=DownloadStatus.NO_DATA,
-                    message=f"找不到 {year}年{quarter_text} 的資料"
-                )
         
-        return await self.download_pdf_from_url(page, pdf_url, year, quarter)
+        return reports
+    
+    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
+        quarter_text = self.get_quarter_text(quarter)
+        
+        # 確認列表頁上有對應的連結
+        if not self._pick_discovered(await self._discover(page, target=(year, quarter)), year, quarter):
+            return DownloadResult(
+                status=DownloadStatus.NO_DATA,
+                message=f"找不到 {year}年{quarter_text} 的資料"
+            )
+        
+        return await self.download_pdf_from_url(page, self._build_pdf_url(year, quarter), year, quarter)
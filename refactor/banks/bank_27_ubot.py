@@ -19,7 +19,7 @@ class UBOTDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(5000)
+        await self.wait_for_dom_stable(page, timeout=5000)
         
         # 找到 thead 中有 p 元素且 text 為「財務資訊」的表格（第一個 table）
         table = await page.query_selector("table")
@@ -24,7 +24,7 @@ class FEIBDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(page, timeout=3000)
         
         # 找第二個下拉選單
         selects = page.locator("select")
@@ -33,7 +33,7 @@ class YuantaBankDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(url)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(page, timeout=3000)
         
         # 搜尋連結
         links = page.locator("a")
@@ -19,7 +19,7 @@ class SinoPacDownloader(BaseBankDownloader):
         
         # 前往財報頁面
         await page.goto(self.bank_url, timeout=60000)
-        await page.wait_for_timeout(5000)
+        await self.wait_for_text(page, "div.select-styled", timeout=5000)
         
         # 點擊自定義選擇器打開下拉選單
         styled_div = await page.query_selector("div.select-styled")
@@ -30,7 +30,7 @@ class SinoPacDownloader(BaseBankDownloader):
             )
         
         await styled_div.click()
-        await page.wait_for_timeout(1000)
+        await self.wait_for_text(page, f'li[rel="{year_ad}"]', timeout=1000, state="attached")
         
         # 選擇目標年份
         year_option = await page.query_selector(f'li[rel="{year_ad}"]')
@@ -41,7 +41,7 @@ class SinoPacDownloader(BaseBankDownloader):
             )
         
         await year_option.click()
-        await page.wait_for_timeout(3000)
+        await self.wait_for_text(page, "ul.sheet-list a", str(year_ad), timeout=3000)
         
         # 找列表中的項目
         sheet_list = await page.query_selector("ul.sheet-list")
@@ -91,7 +91,7 @@ class SinoPacDownloader(BaseBankDownloader):
             await target_link.evaluate("el => el.click()")
         
         new_page = await new_page_info.value
-        await new_page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(new_page, timeout=3000)
         
         # 從新分頁下載 PDF
         result = await self.download_pdf_from_url(new_page, pdf_url, year, quarter)
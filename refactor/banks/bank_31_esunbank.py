@@ -2,7 +2,10 @@
 玉山商業銀行 (31) - E.SUN Commercial Bank
 網址: https://doc.twse.com.tw/server-java/t57sb01
 """
-from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+import re
+from typing import List, Optional, Tuple
+from .base import BaseBankDownloader, DiscoveredReport, DownloadResult, DownloadStatus
+from .http_engine import HttpEngine
 from playwright.async_api import Page
 
 
@@ -12,12 +15,95 @@ class ESunBankDownloader(BaseBankDownloader):
     bank_name = "玉山商業銀行"
     bank_code = 31
     bank_url = "https://doc.twse.com.tw/server-java/t57sb01"
+    discover_by_year = True  # 搜尋頁一次只列一個年度
+    
+    def _search_url(self, year: int) -> str:
+        return f"{self.bank_url}?step=1&colorchg=1&co_id=5847&year={year}&seamon=&mtype=A&"
+    
+    def _download_page_url(self, file_name: str) -> str:
+        return f"{self.bank_url}?step=9&colorchg=1&kind=A&co_id=5847&filename={file_name}"
+    
+    def _target_report_type(self, quarter: int) -> str:
+        """根據季度選擇合併或個體財報"""
+        return "IFRSs合併財報" if quarter % 2 == 1 else "IFRSs個體財報"
+    
+    @staticmethod
+    def _strip_tags(html: str) -> str:
+        return re.sub(r"<[^>]+>", "", html).replace("&nbsp;", " ").strip()
+    
+    def _parse_rows(self, html: str) -> List[List[str]]:
+        """將搜尋結果 HTML 拆成每列儲存格文字"""
+        rows = []
+        for row_html in re.findall(r"<tr[^>]*>(.*?)</tr>", html, re.IGNORECASE | re.DOTALL):
+            tds = re.findall(r"<td[^>]*>(.*?)</td>", row_html, re.IGNORECASE | re.DOTALL)
+            rows.append([self._strip_tags(td) for td in tds])
+        return rows
+    
+    async def _resolve_direct_url(self, http: HttpEngine, year: int, quarter: int) -> Optional[str]:
+        quarter_text = self.get_quarter_text(quarter)
+        report_type = self._target_report_type(quarter)
+        
+        status, html = await http.get_text(self._search_url(year))
+        if status != 200:
+            return None
+        
+        file_name = None
+        for tds in self._parse_rows(html):
+            if len(tds) >= 8 and quarter_text in tds[1] and tds[5] == report_type:
+                file_name = tds[7]
+                break
+        
+        if not file_name:
+            return None
+        
+        status, html = await http.get_text(self._download_page_url(file_name))
+        if status != 200:
+            return None
+        
+        match = re.search(r'<a[^>]+href=["\']([^"\']+)["\']', html, re.IGNORECASE)
+        if not match:
+            return None
+        
+        pdf_href = match.group(1)
+        return pdf_href if pdf_href.startswith("http") else f"https://doc.twse.com.tw{pdf_href}"
+    
+    async def _discover(
+        self, page: Page, year: Optional[int] = None, target: Optional[Tuple[int, int]] = None
+    ) -> List[DiscoveredReport]:
+        # 搜尋頁一次只列一個年度（discover_by_year），各季的 PDF 網址在各自的下載頁
+        if year is None:
+            return []
+        
+        await page.goto(self._search_url(year))
+        await page.wait_for_load_state("networkidle")
+        
+        reports = []
+        for tds in self._parse_rows(await page.content()):
+            if len(tds) < 8:
+                continue
+            row_quarter = next((q for q in range(1, 5) if self.get_quarter_text(q) in tds[1]), None)
+            if row_quarter is None or tds[5] != self._target_report_type(row_quarter):
+                continue
+            if target and (year, row_quarter) != target:
+                continue
+            
+            # 下載頁只是一個連結，直接以 page.request 取得，不必渲染
+            response = await page.request.get(self._download_page_url(tds[7]))
+            if response.status != 200:
+                continue
+            match = re.search(r'<a[^>]+href=["\']([^"\']+)["\']', await response.text(), re.IGNORECASE)
+            if match:
+                pdf_href = match.group(1)
+                pdf_url = pdf_href if pdf_href.startswith("http") else f"https://doc.twse.com.tw{pdf_href}"
+                reports.append((year, row_quarter, pdf_url))
+        
+        return reports
     
     async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
         quarter_text = self.get_quarter_text(quarter)
         
         # 前往搜尋頁面
-        search_url = f"{self.bank_url}?step=1&colorchg=1&co_id=5847&year={year}&seamon=&mtype=A&"
+        search_url = self._search_url(year)
         await page.goto(search_url)
         await page.wait_for_load_state("networkidle")
         
@@ -47,14 +133,9 @@ class ESunBankDownloader(BaseBankDownloader):
                 report_type = await tds[5].inner_text()
                 
                 # 根據季度選擇合併或個體財報
-                if quarter % 2 == 1:
-                    if quarter_text in text_quarter and report_type == "IFRSs合併財報":
-                        file_name = await tds[7].inner_text()
-                        break
-                else:
-                    if quarter_text in text_quarter and report_type == "IFRSs個體財報":
-                        file_name = await tds[7].inner_text()
-                        break
+                if quarter_text in text_quarter and report_type == self._target_report_type(quarter):
+                    file_name = await tds[7].inner_text()
+                    break
         
         if not file_name:
             return DownloadResult(
@@ -63,7 +144,7 @@ class ESunBankDownloader(BaseBankDownloader):
             )
         
         # 取得下載頁面
-        download_page_url = f"{self.bank_url}?step=9&colorchg=1&kind=A&co_id=5847&filename={file_name}"
+        download_page_url = self._download_page_url(file_name)
         await page.goto(download_page_url)
         await page.wait_for_load_state("networkidle")
         
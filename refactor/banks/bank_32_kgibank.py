@@ -7,7 +7,9 @@ URL 格式說明：
 - 2023: /2023-financial-report/{year}-q{q}-consolidated-financial-statement.pdf
 - 2024-2025: /{year}/{year}-q{q}-consol-financial.pdf
 """
+from typing import Optional
 from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+from .http_engine import HttpEngine
 from playwright.async_api import Page
 
 
@@ -41,6 +43,9 @@ class KGIBankDownloader(BaseBankDownloader):
             # 2022 年及之前使用舊格式
             return f"{base}/{year_ad}/{year_ad}-q{quarter}-consolidated-financial-statement.pdf"
     
+    async def _resolve_direct_url(self, http: HttpEngine, year: int, quarter: int) -> Optional[str]:
+        return self._build_pdf_url(year + 1911, quarter)
+    
     async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
         quarter_text = self.get_quarter_text(quarter)
         year_ad = year + 1911  # 民國轉西元
@@ -62,11 +67,11 @@ class KGIBankDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
+        await self.wait_for_dom_stable(page, timeout=2000)
         
         # 滾動到財務報告區塊
         await page.evaluate("window.scrollTo(0, 800)")
-        await page.wait_for_timeout(500)
+        await self.wait_for_dom_stable(page, timeout=500)
         
         # 找到年份選擇按鈕
         year_btn = None
@@ -86,7 +91,7 @@ class KGIBankDownloader(BaseBankDownloader):
         
         # 點擊年份按鈕展開下拉選單
         await year_btn.click()
-        await page.wait_for_timeout(800)
+        await self.wait_for_text(page, f'text="{year_ad}"', timeout=800)
         
         # 選擇目標年份
         year_options = await page.query_selector_all("a, li, div")
@@ -95,8 +100,14 @@ class KGIBankDownloader(BaseBankDownloader):
             if await opt.is_visible():
                 text = (await opt.inner_text()).strip()
                 if text == str(year_ad):
-                    await opt.click()
-                    await page.wait_for_timeout(1500)
+                    # 切換年份會以 XHR 重新載入清單：先等回應，再等目標季度的連結出現（該季未公布時等到上限）
+                    await self.wait_for_response_matching(page, "kgibank.com.tw", action=opt.click, timeout=5000)
+                    await self.wait_for_text(
+                        page,
+                        f"a[href*='financial-report'][href*='{year_ad}'][href*='-q{quarter}-']",
+                        timeout=2000,
+                        state="attached",
+                    )
                     year_selected = True
                     break
         
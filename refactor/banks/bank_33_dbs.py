@@ -9,7 +9,9 @@ URL 格式說明：
 - 2018-2023: /iwov-resources/pdf/legal disclaimers and announcements/03_financial information disclosure/01_financial and business information/(SUB)Internet Report_{year}Q{quarter}.pdf
 - 更早年份: 檔名格式不統一，需從網頁動態抓取
 """
+from typing import Optional
 from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+from .http_engine import HttpEngine
 from playwright.async_api import Page
 from urllib.parse import quote
 
@@ -45,6 +47,9 @@ class DBSBankDownloader(BaseBankDownloader):
             # 更早年份格式不統一，返回 None 讓後續從網頁抓取
             return None
     
+    async def _resolve_direct_url(self, http: HttpEngine, year: int, quarter: int) -> Optional[str]:
+        return self._build_pdf_url(year + 1911, quarter)
+    
     async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
         quarter_text = self.get_quarter_text(quarter)
         year_ad = year + 1911  # 民國轉西元
@@ -67,22 +72,22 @@ class DBSBankDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(page, timeout=3000)
         
-        # 點擊財務資訊揭露展開
+        # 點擊財務資訊揭露展開，等到下一層的重要財務業務資訊出現
         fin_link = page.locator("text=財務資訊揭露").first
         if await fin_link.count() > 0:
             await fin_link.click()
-            await page.wait_for_timeout(1000)
+            await self.wait_for_text(page, "text=重要財務業務資訊", timeout=1000)
+        
+        # 搜尋目標連結 - 格式為 "2025年3季" 或 "2025年1季"
+        search_text = f"{year_ad}年{quarter}季"
         
-        # 點擊重要財務業務資訊展開
+        # 點擊重要財務業務資訊展開，等到目標季度的連結出現（該季未公布時等到上限）
         important_fin = page.locator("text=重要財務業務資訊").first
         if await important_fin.count() > 0:
             await important_fin.click()
-            await page.wait_for_timeout(1500)
-        
-        # 搜尋目標連結 - 格式為 "2025年3季" 或 "2025年1季"
-        search_text = f"{year_ad}年{quarter}季"
+            await self.wait_for_text(page, "a[href*='.pdf']", search_text, timeout=1500, state="attached")
         
         # 查找所有 PDF 連結
         links = await page.query_selector_all("a[href*='.pdf']")
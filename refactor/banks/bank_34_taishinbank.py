@@ -29,7 +29,12 @@ class TaishinBankDownloader(BaseBankDownloader):
                 yearSelect.dispatchEvent(new Event('change', {{ bubbles: true }}));
             }}
         }}''')
-        await page.wait_for_timeout(2000)
+        await self.wait_for_text(
+            page,
+            f'div.ts-comp-076.btn-two div.text-block:has-text("{year_ad}"):has-text("Q{quarter}")',
+            timeout=2000,
+            state="attached",
+        )
         
         # 找資料區塊
         table = await page.query_selector("div.ts-comp-076.btn-two")
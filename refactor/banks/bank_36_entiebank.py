@@ -6,7 +6,8 @@
 - 預設顯示「財務業務資訊」tab
 - 表格格式: 年度標題行 (如 "114年度") + 季度資料行 (第一季~第四季)
 """
-from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+from typing import List, Optional, Tuple
+from .base import BaseBankDownloader, DiscoveredReport, DownloadResult, DownloadStatus
 from playwright.async_api import Page
 
 
@@ -17,26 +18,23 @@ class EntieBankDownloader(BaseBankDownloader):
     bank_code = 36
     bank_url = "https://www.entiebank.com.tw/entie/disclosure-financial"
     
-    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
-        quarter_map = {1: "第一季", 2: "第二季", 3: "第三季", 4: "第四季"}
-        quarter_text = quarter_map[quarter]
-        
+    async def _discover(
+        self, page: Page, year: Optional[int] = None, target: Optional[Tuple[int, int]] = None
+    ) -> List[DiscoveredReport]:
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(5000)
+        await self.wait_for_dom_stable(page, timeout=5000)
         
         # 找表格，解析年度與季度結構
         table = await page.query_selector("table")
         if not table:
-            return DownloadResult(
-                status=DownloadStatus.NO_DATA,
-                message="找不到資料表格"
-            )
+            return []
         
+        quarter_map = {"第一季": 1, "第二季": 2, "第三季": 3, "第四季": 4}
         rows = await table.query_selector_all("tr")
         current_year = None
-        pdf_url = None
+        reports = []
         
         for row in rows:
             text = (await row.inner_text()).strip()
@@ -46,17 +44,28 @@ class EntieBankDownloader(BaseBankDownloader):
                 current_year = int(text.replace("年度", ""))
                 continue
             
-            # 如果當前年度匹配，找季度連結
-            if current_year == year:
-                links = await row.query_selector_all("a")
-                for link in links:
-                    link_text = (await link.inner_text()).strip()
-                    if link_text == quarter_text:
-                        href = await link.get_attribute("href")
-                        pdf_url = href if href.startswith("http") else f"https://www.entiebank.com.tw{href}"
-                        break
-                if pdf_url:
-                    break
+            if current_year is None or (target and current_year != target[0]):
+                continue
+            
+            # 季度資料行：連結文字為「第一季」～「第四季」
+            for link in await row.query_selector_all("a"):
+                link_quarter = quarter_map.get((await link.inner_text()).strip())
+                if target and link_quarter != target[1]:
+                    continue
+                href = await link.get_attribute("href")
+                if link_quarter and href:
+                    pdf_url = href if href.startswith("http") else f"https://www.entiebank.com.tw{href}"
+                    reports.append((current_year, link_quarter, pdf_url))
+                    if target:
+                        return reports
+        
+        return reports
+    
+    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
+        quarter_text = self.get_quarter_text(quarter)
+        
+        # 列表頁一次列出所有年度與季度，只取目標季度
+        pdf_url = self._pick_discovered(await self._discover(page, target=(year, quarter)), year, quarter)
         
         if not pdf_url:
             return DownloadResult(
@@ -2,7 +2,9 @@
 中國信託商業銀行 (37) - CTBC Bank
 網址: https://www.ctbcbank.com/content/dam/twrbo/pdf/aboutctbc/
 """
+from typing import Optional
 from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+from .http_engine import HttpEngine
 from playwright.async_api import Page
 
 
@@ -13,8 +15,15 @@ class CTBCBankDownloader(BaseBankDownloader):
     bank_code = 37
     bank_url = "https://www.ctbcbank.com"
     
+    def _build_pdf_url(self, year: int, quarter: int) -> str:
+        """固定 URL 格式"""
+        return f"{self.bank_url}/content/dam/twrbo/pdf/aboutctbc/{year}Q{quarter}_CTBC.pdf"
+    
+    async def _resolve_direct_url(self, http: HttpEngine, year: int, quarter: int) -> Optional[str]:
+        return self._build_pdf_url(year, quarter)
+    
     async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
         # 直接嘗試固定 URL 格式
-        pdf_url = f"{self.bank_url}/content/dam/twrbo/pdf/aboutctbc/{year}Q{quarter}_CTBC.pdf"
+        pdf_url = self._build_pdf_url(year, quarter)
         
         return await self.download_pdf_from_url(page, pdf_url, year, quarter)
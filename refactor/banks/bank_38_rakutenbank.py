@@ -10,7 +10,9 @@
 3. GraphQL API 返回的 PDF URL 格式為 cmspv.rakuten-bank.com.tw:9443/file/xxx.pdf
    但實際可下載的 URL 是 www.rakuten-bank.com.tw/cms-upload/file/xxx.pdf
 """
+from typing import Optional
 from .base import BaseBankDownloader, DownloadResult, DownloadStatus
+from .http_engine import HttpEngine
 from playwright.async_api import Page, BrowserContext
 import json
 import re
@@ -26,6 +28,11 @@ class RakutenBankDownloader(BaseBankDownloader):
     # 樂天銀行需要使用 Firefox 繞過 Incapsula 防護
     browser_type = "firefox"
     
+    # Incapsula 驗證請求（含追蹤像素）不可攔截
+    route_allow = ("/_Incapsula_Resource",)
+    
+    graphql_url = "https://www.rakuten-bank.com.tw/graphql"
+    
     def _convert_pdf_url(self, api_url: str) -> str:
         """
         將 GraphQL API 返回的 PDF URL 轉換為實際可下載的 URL
@@ -40,6 +47,61 @@ class RakutenBankDownloader(BaseBankDownloader):
             )
         return api_url
     
+    def _graphql_payload(self) -> dict:
+        """財務資訊分類的 GraphQL 查詢內容"""
+        query = """query ddisclosurecat($categoryId: JSON) {
+          ddisclosurecats(where: $categoryId) {
+            ddisclosures(sort: "order:asc") {
+              id
+              title
+              description
+              file {
+                url
+                __typename
+              }
+              __typename
+            }
+            __typename
+          }
+        }"""
+        
+        variables = {"categoryId": {"categoryId": "finance"}}
+        
+        return {
+            "operationName": "ddisclosurecat",
+            "variables": json.dumps(variables),
+            "query": query
+        }
+    
+    def _find_pdf_url(self, data: Optional[dict], search_title: str) -> Optional[str]:
+        """從 GraphQL 回應中搜尋目標季度報告的 PDF URL"""
+        if not data:
+            return None
+        
+        categories = (data.get("data") or {}).get("ddisclosurecats") or [{}]
+        disclosures = categories[0].get("ddisclosures", [])
+        
+        for item in disclosures:
+            title = item.get("title", "")
+            if title == search_title:
+                file_info = item.get("file") or {}
+                pdf_url = file_info.get("url")
+                if pdf_url:
+                    return pdf_url
+        
+        return None
+    
+    async def _resolve_direct_url(self, http: HttpEngine, year: int, quarter: int) -> Optional[str]:
+        search_title = f"{year}年{self.get_quarter_text(quarter)}重要財務業務資訊"
+        headers = {"User-Agent": self._get_user_agent(), "Referer": self.bank_url}
+        
+        status, data = await http.post_json(self.graphql_url, self._graphql_payload(), headers=headers)
+        if status != 200:
+            return None
+        
+        pdf_url = self._find_pdf_url(data, search_title)
+        return self._convert_pdf_url(pdf_url) if pdf_url else None
+    
     async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
         quarter_text = self.get_quarter_text(quarter)
         
@@ -52,7 +114,8 @@ class RakutenBankDownloader(BaseBankDownloader):
         if pdf_url:
             # 轉換 URL 為實際可下載格式
             download_url = self._convert_pdf_url(pdf_url)
-            return await self._download_pdf(page, download_url, year, quarter)
+            # 以 HTTP 串流寫入磁碟（帶上瀏覽器通過 Incapsula 驗證後的 cookie）
+            return await self.download_pdf_from_url(page, download_url, year, quarter)
         
         # 如果 API 失敗，使用網頁動態抓取
         return await self._download_from_webpage(page, year, quarter, search_title)
@@ -63,55 +126,19 @@ class RakutenBankDownloader(BaseBankDownloader):
         # 先訪問頁面取得必要的 cookie
         await page.goto(self.bank_url, timeout=60000)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(2000)
-        
-        graphql_url = "https://www.rakuten-bank.com.tw/graphql"
-        query = """query ddisclosurecat($categoryId: JSON) {
-          ddisclosurecats(where: $categoryId) {
-            ddisclosures(sort: "order:asc") {
-              id
-              title
-              description
-              file {
-                url
-                __typename
-              }
-              __typename
-            }
-            __typename
-          }
-        }"""
-        
-        variables = {"categoryId": {"categoryId": "finance"}}
+        await self.wait_for_dom_stable(page, timeout=2000)
         
         try:
-            response = await page.request.post(
-                graphql_url,
-                data={
-                    "operationName": "ddisclosurecat",
-                    "variables": json.dumps(variables),
-                    "query": query
-                }
-            )
+            response = await page.request.post(self.graphql_url, data=self._graphql_payload())
             
             if not response.ok:
                 return None
             
             data = await response.json()
-            disclosures = data.get("data", {}).get("ddisclosurecats", [{}])[0].get("ddisclosures", [])
             
             # 搜尋目標季度的報告
             search_title = f"{year}年{quarter_text}重要財務業務資訊"
-            
-            for item in disclosures:
-                title = item.get("title", "")
-                if title == search_title:
-                    file_info = item.get("file", {})
-                    pdf_url = file_info.get("url")
-                    if pdf_url:
-                        return pdf_url
-            
-            return None
+            return self._find_pdf_url(data, search_title)
             
         except Exception as e:
             return None
@@ -124,13 +151,13 @@ class RakutenBankDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url, timeout=60000)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(page, timeout=3000)
         
         # 點擊財務資訊 tab
         finance_tab = page.locator('text=財務資訊').first
         if finance_tab:
             await finance_tab.click()
-            await page.wait_for_timeout(2000)
+            await self.wait_for_text(page, "div.collapse-block-head", search_title, timeout=2000)
         
         # 找到目標季度的下載按鈕
         q_head = page.locator(f'div.collapse-block-head:has(div:has-text("{search_title}"))').first
@@ -157,9 +184,7 @@ class RakutenBankDownloader(BaseBankDownloader):
             download = await download_info.value
             
             # 儲存 PDF
-            file_path = self.get_file_path(year, quarter)
-            self.ensure_dir(year, quarter)
-            await download.save_as(file_path)
+            file_path = await self.save_download(download, year, quarter)
             
             return DownloadResult(
                 status=DownloadStatus.SUCCESS,
@@ -172,38 +197,3 @@ class RakutenBankDownloader(BaseBankDownloader):
                 status=DownloadStatus.ERROR,
                 message=f"下載失敗: {str(e)}"
             )
-    
-    async def _download_pdf(self, page: Page, pdf_url: str, year: int, quarter: int) -> DownloadResult:
-        """下載 PDF 檔案"""
-        try:
-            response = await page.request.get(pdf_url)
-            
-            if not response.ok:
-                return DownloadResult(
-                    status=DownloadStatus.ERROR,
-                    message=f"下載失敗: HTTP {response.status}"
-                )
-            
-            content = await response.body()
-            
-            # 驗證是否為 PDF
-            if not content.startswith(b'%PDF'):
-                return DownloadResult(
-                    status=DownloadStatus.ERROR,
-                    message="下載的檔案不是有效的 PDF"
-                )
-            
-            # 儲存 PDF
-            file_path = self.save_pdf(content, year, quarter)
-            
-            return DownloadResult(
-                status=DownloadStatus.SUCCESS,
-                message="下載成功",
-                file_path=file_path
-            )
-            
-        except Exception as e:
-            return DownloadResult(
-                status=DownloadStatus.ERROR,
-                message=f"下載失敗: {str(e)}"
-            )
@@ -19,7 +19,7 @@ class LineBankDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url)
         await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(3000)
+        await self.wait_for_dom_stable(page, timeout=3000)
         
         # 找 tabs 內容
         tab_contents = await page.query_selector_all("div.el-tabs__content")
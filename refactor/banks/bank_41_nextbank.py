@@ -26,10 +26,10 @@ class NextBankDownloader(BaseBankDownloader):
         # 前往財報頁面
         await page.goto(self.bank_url, timeout=120000)
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(8000)
         
         # 搜尋目標季度: "113年度第四季" 或 "114年度第一季"
         search_text = f"{year}年度{quarter_text}"
+        await self.wait_for_text(page, "b", search_text, timeout=8000, state="attached")
         
         # 找所有 b 標籤（季度標題）
         b_tags = page.locator("b")
@@ -1,12 +1,41 @@
 """
 銀行財報下載基礎類別（非同步版本）
 """
+import asyncio
 import os
+import re
+import shutil
+import time
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
-from playwright.async_api import async_playwright, Page, Browser
+from fnmatch import fnmatch
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Pattern, Tuple, Type, Union
+
+from .atomic_file import atomic_write_bytes, commit_temp_file, remove_quietly, temp_path_for
+from .browser_pool import BrowserPool
+from .headed_lane import HeadedLane
+from .http_engine import HttpEngine, ProgressCallback
+from .link_cache import LinkCache
+from .replay import HarArchive
+from .rate_limit import AdaptiveLimiter, HostThrottle
+from .retry import (
+    CircuitBreaker,
+    FailureKind,
+    RetryPolicy,
+    classify_exception,
+    classify_message,
+    failure_for_status,
+)
+from .route_policy import RoutePolicy, RouteStats
+from .timing import SpanRecorder
+from .tracing import FailureTracer
+from .waits import DOM_STABLE_JS, WaitStats
+
+if TYPE_CHECKING:
+    # 只供型別標註；Playwright 在實際開啟瀏覽器時才載入（見 browser_pool）
+    from playwright.async_api import Page
 
 
 class DownloadStatus(Enum):
@@ -17,12 +46,24 @@ class DownloadStatus(Enum):
     ERROR = -2
 
 
+# 保存 Playwright trace 的結果（其餘結果丟棄 trace）
+TRACE_STATUSES = (DownloadStatus.ERROR, DownloadStatus.NO_DATA)
+
+# 多季度模式找到的報表: (民國年, 季度, PDF 網址)
+DiscoveredReport = Tuple[int, int, str]
+
+
+class DiscoveryError(Exception):
+    """列表頁結構不符（例如找不到展開按鈕），單季下載時回報 ERROR 而不是查無資料"""
+
+
 @dataclass
 class DownloadResult:
     """下載結果"""
     status: DownloadStatus
     message: str = ""
     file_path: str = ""
+    error_kind: Optional[FailureKind] = None  # 失敗原因分類（決定是否重試）
 
 
 class BaseBankDownloader(ABC):
@@ -36,10 +77,88 @@ class BaseBankDownloader(ABC):
     force_headless: bool = False  # 強制使用無頭模式（不自動重試有頭模式）
     retry_with_head: bool = True  # 無頭模式失敗時是否自動重試有頭模式
     browser_type: str = "chromium"  # 瀏覽器類型: chromium, firefox, webkit
+    http_fast_path: bool = True  # 是否先嘗試不開瀏覽器的 HTTP 快速路徑（需實作 _resolve_direct_url）
+    verify_ssl: bool = True  # HTTP 串流下載是否驗證 SSL 憑證（憑證鏈不完整的網站設為 False）
+    block_resources: bool = False  # 是否攔截圖片、字型、影音與追蹤請求
+    route_allow: Tuple[str, ...] = ()  # 攔截模式下一律放行的網址樣式（子字串或萬用字元）
+    route_deny: Tuple[str, ...] = ()  # 攔截模式下一律攔截的網址樣式
+    discover_by_year: bool = False  # _discover 是否需要依年度查詢（列表頁一次只列一年）
+    
+    # 已定義的銀行下載器 {銀行名稱: 類別}，由 __init_subclass__ 自動登錄
+    _registry: Dict[str, Type["BaseBankDownloader"]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        """定義子類別時自動登錄（自行設定 bank_name 與 bank_code 的類別才算一家銀行）"""
+        super().__init_subclass__(**kwargs)
+        if "bank_name" in cls.__dict__ and "bank_code" in cls.__dict__ and cls.bank_name:
+            BaseBankDownloader._registry[cls.bank_name] = cls
     
-    def __init__(self, data_dir: str = "data"):
+    @classmethod
+    def registered(cls) -> Dict[str, Type["BaseBankDownloader"]]:
+        """取得已登錄的銀行下載器（依銀行代碼排序）"""
+        return dict(sorted(BaseBankDownloader._registry.items(), key=lambda item: item[1].bank_code))
+    
+    def __init__(
+        self,
+        data_dir: str = "data",
+        browser_pool: Optional[BrowserPool] = None,
+        http_engine: Optional[HttpEngine] = None,
+        block_resources: Optional[bool] = None,
+        link_cache: Optional[LinkCache] = None,
+        browser_limiter: Optional[Union[asyncio.Semaphore, AdaptiveLimiter]] = None,
+        headed_lane: Optional[HeadedLane] = None,
+        throttle: Optional[HostThrottle] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        har: Optional[HarArchive] = None,
+        tracer: Optional[FailureTracer] = None,
+    ):
+        """
+        Args:
+            data_dir: 資料存放目錄
+            browser_pool: 共用瀏覽器池，未指定時每次下載自行啟動（結束即關閉）
+            http_engine: 共用 HTTP 引擎，未指定時每次下載自行建立（結束即關閉）
+            block_resources: 是否攔截非必要資源，True 時覆寫類別設定
+            link_cache: 共用的 PDF 網址快取，未指定時使用 {data_dir}/.link_cache.json
+            browser_limiter: 瀏覽器工作的並行名額（由排程器共用），None 表示不限制
+            headed_lane: 有頭瀏覽器專用通道，有頭工作改佔用此通道的名額與虛擬顯示器
+            throttle: 主機節流器（每個主機的請求速率，並回報壅塞訊號給 AIMD 並行控制）
+            retry_policy: 暫時性失敗的重試策略，未指定時使用預設（最多 3 次）
+            circuit_breaker: 此銀行的斷路器（由排程器跨季度共用），None 表示不使用
+            har: HAR 錄製/重播（離線計時與回歸測試用），None 表示正常連網
+            tracer: 失敗時保存 Playwright trace，None 表示不錄製
+        """
         self.data_dir = data_dir
-        
+        self.browser_pool = browser_pool
+        self.http_engine = http_engine
+        if block_resources:
+            self.block_resources = True
+        self.route_stats = RouteStats()
+        self.wait_stats = WaitStats()
+        self.timings = SpanRecorder(self.bank_code, self.bank_name)
+        self._link_cache = link_cache
+        self.browser_limiter = browser_limiter
+        self.headed_lane = headed_lane
+        self.throttle = throttle
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.har = har
+        self.tracer = tracer
+        self.traces: List[str] = []  # 最後失敗的下載所保存的 trace
+        self._page_failed = False    # 目前頁面的工作是否失敗（決定是否保存 trace）
+        self._source: Optional[Tuple[str, str, str]] = None  # 本次下載的 (網址, ETag, Last-Modified)
+    
+    @property
+    def link_cache(self) -> LinkCache:
+        """PDF 網址快取（延遲載入）"""
+        if self._link_cache is None:
+            self._link_cache = LinkCache.for_data_dir(self.data_dir)
+        return self._link_cache
+    
+    def _remember_source(self, url: str, etag: str = "", last_modified: str = ""):
+        """記錄本次下載的 PDF 來源網址，下載成功後寫入網址快取"""
+        self._source = (url, etag or "", last_modified or "")
+    
     def get_quarter_text(self, quarter: int) -> str:
         """取得季度文字"""
         quarter_map = {1: "第一季", 2: "第二季", 3: "第三季", 4: "第四季"}
@@ -60,21 +179,39 @@ class BaseBankDownloader(ABC):
         return os.path.isfile(self.get_file_path(year, quarter))
     
     def save_pdf(self, content: bytes, year: int, quarter: int) -> str:
-        """儲存 PDF 檔案"""
+        """儲存 PDF 檔案（原子寫入）"""
         self.ensure_dir(year, quarter)
         file_path = self.get_file_path(year, quarter)
-        with open(file_path, 'wb') as f:
-            f.write(content)
+        atomic_write_bytes(file_path, content)
         return file_path
     
-    def _get_browser(self, playwright):
-        """根據 browser_type 取得對應的瀏覽器"""
-        if self.browser_type == "firefox":
-            return playwright.firefox
-        elif self.browser_type == "webkit":
-            return playwright.webkit
-        else:
-            return playwright.chromium
+    async def save_download(self, download, year: int, quarter: int) -> str:
+        """
+        儲存 Playwright Download 物件（先存成暫存檔，fsync 後再改名）
+        
+        Args:
+            download: page.expect_download() 取得的 Download 物件
+            year: 民國年
+            quarter: 季度
+            
+        Returns:
+            儲存後的檔案路徑
+        """
+        self.ensure_dir(year, quarter)
+        file_path = self.get_file_path(year, quarter)
+        temp_path = temp_path_for(file_path)
+        try:
+            # 點擊後 Download 事件在開始傳輸時就觸發，save_as 等待傳輸完成
+            with self.timings.span("transfer") as span:
+                await download.save_as(temp_path)
+                commit_temp_file(temp_path, file_path)
+                span.bytes = os.path.getsize(file_path)
+        except BaseException:
+            remove_quietly(temp_path)
+            raise
+        if download.url and download.url.startswith("http"):
+            self._remember_source(download.url)
+        return file_path
     
     def _get_user_agent(self) -> str:
         """根據瀏覽器類型取得對應的 User-Agent"""
@@ -83,78 +220,585 @@ class BaseBankDownloader(ABC):
         else:
             return "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     
-    async def download(self, year: int, quarter: int) -> DownloadResult:
+    async def download(self, year: int, quarter: int, revalidate: bool = False) -> DownloadResult:
         """
         下載財報（非同步）
         
         Args:
             year: 民國年
             quarter: 季度 (1-4)
+            revalidate: 檔案已存在時，是否以條件式請求檢查來源是否更新
             
         Returns:
             DownloadResult: 下載結果
         """
         # 檢查檔案是否已存在
         if self.file_exists(year, quarter):
+            if revalidate:
+                return await self._revalidate(year, quarter)
             return DownloadResult(
                 status=DownloadStatus.ALREADY_EXISTS,
                 message="檔案已存在",
                 file_path=self.get_file_path(year, quarter)
             )
         
+        self.timings.labels = {"year": year, "quarter": quarter, "attempt": 1}
+        with self.timings.span("total"):
+            # 先嘗試上次成功的網址，成功就不必開瀏覽器找連結
+            self._source = None
+            result = await self._try_cached_link(year, quarter)
+            if result:
+                return result
+            
+            first_trace = len(self.traces)
+            result = await self._download_with_retry(year, quarter)
+            if self._source and self._validate_file(result, year, quarter):
+                url, etag, last_modified = self._source
+                self.link_cache.put(self.bank_code, year, quarter, url, etag, last_modified)
+            self._settle_traces(result, first_trace)
+            return result
+    
+    def _settle_traces(self, result: DownloadResult, first: int):
+        """
+        依最終結果處理本次下載保存的 trace：最後仍失敗時保留並列出路徑，
+        最後成功時刪除先前失敗嘗試的 trace
+        
+        Args:
+            result: 最終下載結果
+            first: 本次下載開始時 self.traces 的長度
+        """
+        paths = self.traces[first:]
+        if not paths:
+            return
+        if result.status in TRACE_STATUSES:
+            for path in paths:
+                print(f"  [{self.bank_name}] 已保存 trace: {path}")
+            return
+        for path in paths:
+            remove_quietly(path)
+        del self.traces[first:]
+    
+    async def _revalidate(self, year: int, quarter: int) -> DownloadResult:
+        """
+        檢查已下載的檔案在來源端是否有更新，只有確定變更時才重新下載
+        
+        Returns:
+            未變更或無法判斷時為 ALREADY_EXISTS，已更新為 SUCCESS
+        """
+        file_path = self.get_file_path(year, quarter)
+        entry = self.link_cache.get(self.bank_code, year, quarter)
+        if entry is None:
+            return DownloadResult(
+                status=DownloadStatus.ALREADY_EXISTS,
+                message="檔案已存在（無來源網址，略過重新驗證）",
+                file_path=file_path
+            )
+        
+        async with self._http_session() as http:
+            if not http.available:
+                return DownloadResult(
+                    status=DownloadStatus.ALREADY_EXISTS,
+                    message="檔案已存在（未安裝 httpx，略過重新驗證）",
+                    file_path=file_path
+                )
+            
+            try:
+                check = await http.revalidate(
+                    entry.url,
+                    etag=entry.etag,
+                    last_modified=entry.last_modified,
+                    local_size=os.path.getsize(file_path),
+                    verify=self.verify_ssl,
+                )
+            except Exception as e:
+                return DownloadResult(
+                    status=DownloadStatus.ALREADY_EXISTS,
+                    message=f"檔案已存在（重新驗證失敗: {str(e)}）",
+                    file_path=file_path
+                )
+            
+            if not check.changed:
+                # 補上第一次下載時沒有取得的驗證標頭
+                if check.changed is False and (check.etag or check.last_modified) and not (entry.etag or entry.last_modified):
+                    self.link_cache.put(
+                        self.bank_code, year, quarter, entry.url, check.etag, check.last_modified
+                    )
+                state = "未變更" if check.changed is False else "無法判斷是否變更"
+                return DownloadResult(
+                    status=DownloadStatus.ALREADY_EXISTS,
+                    message=f"檔案{state} ({check.reason})",
+                    file_path=file_path
+                )
+            
+            # 已變更：串流至暫存檔，成功才取代原檔
+            self._source = None
+            result = await self.stream_download(entry.url, year, quarter)
+        
+        if result.status == DownloadStatus.SUCCESS:
+            url, etag, last_modified = self._source or (entry.url, check.etag, check.last_modified)
+            self.link_cache.put(self.bank_code, year, quarter, url, etag, last_modified)
+            result.message = f"檔案已更新 ({check.reason})"
+        else:
+            result.message = f"來源已更新但重新下載失敗，保留原檔: {result.message}"
+        return result
+    
+    async def _try_cached_link(self, year: int, quarter: int) -> Optional[DownloadResult]:
+        """以快取的網址直接下載，失敗時清除快取並回傳 None"""
+        entry = self.link_cache.get(self.bank_code, year, quarter)
+        if entry is None:
+            return None
+        
+        result = await self.stream_download(entry.url, year, quarter)
+        if self._is_download_successful(result, year, quarter):
+            result.message = f"{result.message} (網址快取)"
+            url, etag, last_modified = self._source or (entry.url, "", "")
+            if (etag, last_modified) != (entry.etag, entry.last_modified):
+                self.link_cache.put(self.bank_code, year, quarter, url, etag, last_modified)
+            return result
+        
+        self._cleanup_failed_download(year, quarter)
+        self.link_cache.invalidate(self.bank_code, year, quarter)
+        self._source = None
+        return None
+    
+    async def _download_with_retry(self, year: int, quarter: int) -> DownloadResult:
+        """
+        依重試策略執行下載：只有暫時性失敗（逾時、5xx、連線中斷）才退避重試。
+        每一段暫時性失敗都在 _download_uncached 中計入斷路器，斷路器開啟後不再重試
+        """
+        breaker = self.circuit_breaker
+        attempt = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                return DownloadResult(
+                    status=DownloadStatus.ERROR,
+                    message=f"網站連續失敗，暫停嘗試（{breaker.retry_after:.0f} 秒後再試）",
+                    error_kind=FailureKind.CIRCUIT_OPEN
+                )
+            
+            attempt += 1
+            self.timings.labels["attempt"] = attempt
+            result = await self._download_uncached(year, quarter)
+            # _download_uncached 已驗證並計時過，這裡只重新檢查、不再記錄 validate
+            if self._validate_file(result, year, quarter):
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+            
+            kind = result.error_kind
+            transient = kind is not None and kind.transient
+            if breaker is not None and not transient:
+                # 非暫時性失敗（查無資料、找不到元素）代表網站仍有回應
+                breaker.record_success()
+            
+            breaker_open = breaker is not None and breaker.state == CircuitBreaker.OPEN
+            if breaker_open or not self.retry_policy.should_retry(kind, attempt):
+                if attempt > 1:
+                    result.message = f"{result.message} (已嘗試 {attempt} 次)"
+                return result
+            
+            self._cleanup_failed_download(year, quarter)
+            delay = self.retry_policy.delay(attempt)
+            print(f"  [{self.bank_name}] {kind.value}，{delay:.1f} 秒後重試 ({attempt}/{self.retry_policy.max_attempts})")
+            with self.timings.span("retry"):
+                await asyncio.sleep(delay)
+    
+    async def _download_uncached(self, year: int, quarter: int) -> DownloadResult:
+        """
+        不使用網址快取的下載流程：HTTP 快速路徑 → 無頭瀏覽器 → 有頭瀏覽器
+        
+        無頭模式逾時、5xx 或連線中斷時網站本身有問題，不再以有頭模式重試（交給重試策略退避）；
+        有頭模式只用來對付找不到元素、不是 PDF 這類可能是擋無頭瀏覽器的失敗。
+        """
+        # 快速路徑：網址可預先推算時，不開瀏覽器直接下載
+        if self.http_fast_path:
+            result = await self._try_http_download(year, quarter)
+            if result and self._is_download_successful(result, year, quarter):
+                return result
+            self._cleanup_failed_download(year, quarter)
+            if result and self._count_failure(result):
+                return result
+        
         # 第一次嘗試：使用預設的 headless 設定
         result = await self._try_download(year, quarter, headless=self.headless)
         
         # 驗證下載結果
         if self._is_download_successful(result, year, quarter):
             return result
+        if self._count_failure(result):
+            return result
+        transient = result.error_kind is not None and result.error_kind.transient
         
-        # 如果無頭模式失敗且允許重試有頭模式
-        if self.headless and self.retry_with_head and not self.force_headless:
+        # 如果無頭模式失敗（非暫時性失敗）且允許重試有頭模式
+        if self.headless and self.retry_with_head and not self.force_headless and not transient:
             # 清理可能產生的不完整檔案
             self._cleanup_failed_download(year, quarter)
             
             # 第二次嘗試：使用有頭模式
-            result = await self._try_download(year, quarter, headless=False)
+            with self.timings.span("retry", headless=False):
+                result = await self._try_download(year, quarter, headless=False)
             
             # 再次驗證
             if self._is_download_successful(result, year, quarter):
                 result.message = f"{result.message} (使用有頭模式)"
                 return result
+            self._count_failure(result)
         
         return result
     
-    async def _try_download(self, year: int, quarter: int, headless: bool) -> DownloadResult:
-        """嘗試下載（內部方法，非同步）"""
+    def _count_failure(self, result: DownloadResult) -> bool:
+        """
+        暫時性失敗計入斷路器
+        
+        Returns:
+            斷路器是否已開啟（開啟後不必再嘗試後續步驟）
+        """
+        breaker = self.circuit_breaker
+        kind = result.error_kind
+        if breaker is None or kind is None or not kind.transient:
+            return False
+        breaker.record_failure()
+        return breaker.state == CircuitBreaker.OPEN
+    
+    @asynccontextmanager
+    async def _browser_slot(self, headless: bool) -> AsyncIterator[Optional[str]]:
+        """
+        取得瀏覽器名額：有頭工作走有頭通道，其餘佔用 browser_limiter
+        
+        Yields:
+            有頭模式使用的顯示器，None 表示沿用目前環境
+        """
+        if not headless and self.headed_lane is not None:
+            async with self.headed_lane.slot() as display:
+                yield display
+        elif self.browser_limiter is not None:
+            async with self.browser_limiter:
+                yield None
+        else:
+            yield None
+    
+    @asynccontextmanager
+    async def _browser_page(self, headless: bool, har_name: str = "") -> AsyncIterator["Page"]:
+        """
+        取得已設定好的頁面（名額、節流、請求攔截、逾時），結束時歸還瀏覽器
+        
+        Args:
+            headless: 是否使用無頭模式
+            har_name: HAR 錄製/重播的檔名（不含副檔名），預設為銀行代碼
+        
+        Yields:
+            Page: 新開啟的頁面
+        """
+        # 沒有共用瀏覽器池時，建立只供本次使用的瀏覽器池
+        pool = self.browser_pool or BrowserPool()
+        owns_pool = self.browser_pool is None
+        previous_headless = self.timings.labels.get("headless")
+        self.timings.labels["headless"] = headless
+        
         try:
-            async with async_playwright() as p:
-                browser_launcher = self._get_browser(p)
-                browser = await browser_launcher.launch(headless=headless)
-                context = await browser.new_context(
+            queued = time.perf_counter()
+            async with self._browser_slot(headless) as display:
+                self.timings.record("queue", (time.perf_counter() - queued) * 1000)
+                async with pool.lease(
+                    self.browser_type,
+                    headless=headless,
+                    display=display,
+                    on_timing=self.timings.record,
                     user_agent=self._get_user_agent(),
                     viewport={"width": 1920, "height": 1080}
-                )
-                page = await context.new_page()
-                page.set_default_timeout(60000)  # 60 秒超時
-                page.set_default_navigation_timeout(60000)
-                
-                result = await self._download(page, year, quarter)
-                
-                await browser.close()
+                ) as context:
+                    page = await self._open_page(context, har_name)
+                    trace_name = har_name or f"{self.bank_code:02d}"
+                    if self.tracer is not None:
+                        await self.tracer.arm(context, trace_name)
+                    # 呼叫端依結果設定 _page_failed；發生例外一律視為失敗
+                    self._page_failed = False
+                    try:
+                        yield page
+                    except BaseException:
+                        self._page_failed = True
+                        raise
+                    finally:
+                        if self.tracer is not None:
+                            await self._save_trace(context, trace_name, headless)
+        finally:
+            self.timings.labels["headless"] = previous_headless
+            if owns_pool:
+                await pool.close()
+    
+    async def _save_trace(self, context, name: str, headless: bool):
+        """停止 trace 錄製，頁面上的工作失敗時才保存"""
+        attempt = self.timings.labels.get("attempt", 1)
+        mode = "headless" if headless else "headed"
+        path = await self.tracer.disarm(context, f"{name}_a{attempt}_{mode}", keep=self._page_failed)
+        if path:
+            self.traces.append(path)
+    
+    async def _open_page(self, context, har_name: str) -> "Page":
+        """在 context 上安裝 HAR、節流與攔截規則並開啟頁面（計入 context 階段）"""
+        with self.timings.span("context"):
+            # HAR 最先安裝：節流與攔截規則 fallback 之後才由 HAR 回應
+            if self.har is not None:
+                await self.har.install(context, har_name or f"{self.bank_code:02d}")
+            # 節流需先安裝：後安裝的攔截規則先執行，被攔截的資源不會佔用主機 token
+            if self.throttle is not None:
+                await self.throttle.install(context)
+            if self.block_resources:
+                policy = RoutePolicy(self.route_allow, self.route_deny, stats=self.route_stats)
+                await policy.install(context)
+            
+            page = await context.new_page()
+            page.set_default_timeout(60000)  # 60 秒超時
+            page.set_default_navigation_timeout(60000)
+        
+        # page.goto 計入 navigation 階段（各銀行模組不需修改）
+        goto = page.goto
+        
+        async def timed_goto(*args, **kwargs):
+            with self.timings.span("navigation"):
+                return await goto(*args, **kwargs)
+        
+        page.goto = timed_goto
+        return page
+    
+    async def _try_download(self, year: int, quarter: int, headless: bool) -> DownloadResult:
+        """嘗試下載（內部方法，非同步）"""
+        try:
+            async with self._browser_page(headless, f"{self.bank_code:02d}_{year}Q{quarter}") as page:
+                # resolve：_download 扣除導覽、等待、傳輸等已分別記錄的時間
+                mark = self.timings.mark()
+                start = time.perf_counter()
+                try:
+                    result = await self._download(page, year, quarter)
+                finally:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    self.timings.record("resolve", max(0.0, elapsed_ms - self.timings.excluded_ms_since(mark)))
+                self._page_failed = result.status in TRACE_STATUSES
+                if result.status == DownloadStatus.ERROR and result.error_kind is None:
+                    result.error_kind = classify_message(result.message)
                 return result
                 
         except Exception as e:
+            kind = classify_exception(e)
+            if kind == FailureKind.TIMEOUT and self.throttle is not None:
+                self.throttle.record_timeout(self.bank_url)
             return DownloadResult(
                 status=DownloadStatus.ERROR,
-                message=f"下載錯誤: {str(e)}"
+                message=f"下載錯誤: {str(e)}",
+                error_kind=kind
             )
     
+    @asynccontextmanager
+    async def _http_session(self) -> AsyncIterator[HttpEngine]:
+        """取得 HTTP 引擎（沒有共用引擎時建立臨時引擎，巢狀呼叫沿用，結束即關閉）"""
+        if self.http_engine is not None:
+            yield self.http_engine
+            return
+        
+        self.http_engine = HttpEngine(
+            user_agent=self._get_user_agent(),
+            throttle=self.throttle,
+            transport_factory=self.har.http_transport if self.har else None,
+        )
+        try:
+            yield self.http_engine
+        finally:
+            engine, self.http_engine = self.http_engine, None
+            await engine.close()
+    
+    async def _resolve_direct_url(self, http: HttpEngine, year: int, quarter: int) -> Optional[str]:
+        """
+        快速路徑：不開瀏覽器取得 PDF 網址，子類別可覆寫
+        
+        Args:
+            http: HTTP 引擎（可用於查詢 API 或列表頁）
+            year: 民國年
+            quarter: 季度
+            
+        Returns:
+            PDF 網址，無法推算時回傳 None（直接改用瀏覽器）
+        """
+        return None
+    
+    async def _try_http_download(self, year: int, quarter: int) -> Optional[DownloadResult]:
+        """嘗試 HTTP 快速路徑，未實作或未安裝 httpx 時回傳 None"""
+        if type(self)._resolve_direct_url is BaseBankDownloader._resolve_direct_url:
+            return None
+        
+        async with self._http_session() as http:
+            if not http.available:
+                return None
+            try:
+                with self.timings.span("resolve"):
+                    pdf_url = await self._resolve_direct_url(http, year, quarter)
+            except Exception as e:
+                return DownloadResult(
+                    status=DownloadStatus.ERROR,
+                    message=f"快速路徑解析失敗: {str(e)}"
+                )
+            if not pdf_url:
+                return None
+            
+            result = await self.stream_download(pdf_url, year, quarter)
+            if result.status == DownloadStatus.SUCCESS:
+                result.message = f"{result.message} (HTTP 快速路徑)"
+            return result
+    
+    async def stream_download(
+        self,
+        url: str,
+        year: int,
+        quarter: int,
+        verify: Optional[bool] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        headers: Optional[dict] = None,
+        cookies: Optional[dict] = None,
+    ) -> DownloadResult:
+        """
+        以 HTTP 串流下載 PDF（非同步，不佔用瀏覽器也不阻塞事件迴圈）
+        
+        未安裝 httpx 時改以非同步子程序呼叫 wget。
+        
+        Args:
+            url: PDF 網址
+            year: 民國年
+            quarter: 季度
+            verify: 是否驗證 SSL 憑證，未指定時使用 verify_ssl 類別屬性
+            progress_callback: 進度回調函數 (已下載位元組, 總位元組)
+            headers: 額外的請求標頭
+            cookies: 請求要帶的 cookie
+            
+        Returns:
+            DownloadResult: 下載結果
+        """
+        if verify is None:
+            verify = self.verify_ssl
+        
+        try:
+            async with self._http_session() as http:
+                with self.timings.span("transfer") as span:
+                    self.ensure_dir(year, quarter)
+                    file_path = self.get_file_path(year, quarter)
+                    if not http.available:
+                        if self._replaying:
+                            return self._replay_miss(url)
+                        result = await self._wget_download(url, file_path, verify, progress_callback)
+                        if result.status == DownloadStatus.SUCCESS:
+                            span.bytes = os.path.getsize(file_path)
+                        return result
+                    fetch = await http.stream_to_file(
+                        url,
+                        file_path,
+                        verify=verify,
+                        headers=headers,
+                        cookies=cookies,
+                        progress_callback=progress_callback,
+                    )
+                    span.bytes = fetch.bytes_written
+            
+            if fetch.ok:
+                self._remember_source(url, fetch.etag, fetch.last_modified)
+                return DownloadResult(
+                    status=DownloadStatus.SUCCESS,
+                    message="下載成功",
+                    file_path=file_path
+                )
+            elif fetch.status_code != 200:
+                return DownloadResult(
+                    status=DownloadStatus.NO_DATA,
+                    message=f"HTTP {fetch.status_code}",
+                    error_kind=failure_for_status(fetch.status_code)
+                )
+            else:
+                return DownloadResult(
+                    status=DownloadStatus.ERROR,
+                    message=f"非 PDF 格式: {fetch.content_type}",
+                    error_kind=FailureKind.NOT_PDF
+                )
+        except Exception as e:
+            return DownloadResult(
+                status=DownloadStatus.ERROR,
+                message=f"下載失敗: {str(e)}",
+                error_kind=classify_exception(e)
+            )
+    
+    async def _wget_download(
+        self,
+        url: str,
+        file_path: str,
+        verify: bool,
+        progress_callback: Optional[ProgressCallback] = None,
+        timeout: float = 120,
+    ) -> DownloadResult:
+        """以非同步子程序呼叫 wget 下載（未安裝 httpx 時的備用方案）"""
+        if shutil.which("wget") is None:
+            return DownloadResult(
+                status=DownloadStatus.ERROR,
+                message="需要安裝 httpx 或 wget"
+            )
+        
+        temp_path = temp_path_for(file_path)
+        args = ["wget", "-q", "-O", temp_path, url]
+        if not verify:
+            args.insert(1, "--no-check-certificate")
+        
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            remove_quietly(temp_path)
+            return DownloadResult(
+                status=DownloadStatus.ERROR,
+                message=f"wget 下載逾時 ({timeout} 秒)",
+                error_kind=FailureKind.TIMEOUT
+            )
+        
+        if process.returncode == 0 and os.path.exists(temp_path) and os.path.getsize(temp_path) > 0:
+            commit_temp_file(temp_path, file_path)
+            self._remember_source(url)
+            if progress_callback:
+                size = os.path.getsize(file_path)
+                progress_callback(size, size)
+            return DownloadResult(
+                status=DownloadStatus.SUCCESS,
+                message="下載成功",
+                file_path=file_path
+            )
+        
+        remove_quietly(temp_path)
+        return DownloadResult(
+            status=DownloadStatus.ERROR,
+            message=f"wget 下載失敗: {stderr.decode(errors='replace').strip()}"
+        )
+    
     def _is_download_successful(self, result: DownloadResult, year: int, quarter: int) -> bool:
-        """驗證下載是否成功"""
+        """
+        驗證下載是否成功（記錄 validate 階段）
+        
+        每個下載結果只在第一次驗證時呼叫；之後再檢查同一個結果請用 _validate_file，
+        以免同一次下載記錄多個 validate 區段
+        """
         # 狀態不是成功，直接返回 False
         if result.status != DownloadStatus.SUCCESS:
             return False
         
+        with self.timings.span("validate") as span:
+            valid = self._validate_file(result, year, quarter)
+            if valid:
+                span.bytes = os.path.getsize(result.file_path or self.get_file_path(year, quarter))
+        return valid
+    
+    def _validate_file(self, result: DownloadResult, year: int, quarter: int) -> bool:
+        """檢查下載結果為成功，且檔案存在、大小合理、為 PDF 格式（不記錄計時）"""
+        if result.status != DownloadStatus.SUCCESS:
+            return False
+        
         # 檢查檔案是否存在
         file_path = result.file_path or self.get_file_path(year, quarter)
         if not os.path.isfile(file_path):
@@ -177,16 +821,13 @@ class BaseBankDownloader(ABC):
         return True
     
     def _cleanup_failed_download(self, year: int, quarter: int):
-        """清理失敗的下載檔案"""
+        """清理失敗的下載檔案（含殘留的暫存檔）"""
         file_path = self.get_file_path(year, quarter)
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception:
-                pass
+        remove_quietly(file_path)
+        remove_quietly(temp_path_for(file_path))
     
     @abstractmethod
-    async def _download(self, page: Page, year: int, quarter: int) -> DownloadResult:
+    async def _download(self, page: "Page", year: int, quarter: int) -> DownloadResult:
         """
         實際下載邏輯，子類別需實作（非同步）
         
@@ -200,15 +841,158 @@ class BaseBankDownloader(ABC):
         """
         pass
     
-    async def download_pdf_from_url(self, page: Page, url: str, year: int, quarter: int) -> DownloadResult:
-        """從 URL 下載 PDF（非同步）"""
+    async def _discover(
+        self, page: "Page", year: Optional[int] = None, target: Optional[Tuple[int, int]] = None
+    ) -> List[DiscoveredReport]:
+        """
+        多季度模式：一次瀏覽列表頁，回傳頁面上所有季度的 PDF 網址，子類別可覆寫
+        
+        單季下載也共用這段解析，傳入 target 時略過其他年度、找到目標季度即停止。
+        
+        Args:
+            page: Playwright Page 物件
+            year: 民國年，僅 discover_by_year = True 的網站會傳入
+            target: 單季下載的 (民國年, 季度)，None 表示列出全部
+            
+        Returns:
+            (民國年, 季度, PDF 網址) 列表，不支援時為空列表
+            
+        Raises:
+            DiscoveryError: 列表頁結構不符
+        """
+        return []
+    
+    @classmethod
+    def supports_discovery(cls) -> bool:
+        """是否實作多季度模式"""
+        return cls._discover is not BaseBankDownloader._discover
+    
+    @staticmethod
+    def _pick_discovered(reports: List[DiscoveredReport], year: int, quarter: int) -> Optional[str]:
+        """從多季度結果中取出指定季度的網址"""
+        for report_year, report_quarter, url in reports:
+            if (report_year, report_quarter) == (year, quarter):
+                return url
+        return None
+    
+    async def harvest(self, years: Optional[Iterable[int]] = None) -> Dict[Tuple[int, int], DownloadResult]:
+        """
+        多季度下載：只瀏覽一次列表頁，下載所有尚未下載的季度
+        
+        已存在的檔案不重新下載，但會補上網址快取（供 --revalidate 使用）。
+        
+        Args:
+            years: 只下載這些年度；discover_by_year = True 的網站逐年查詢，未指定時查詢今年
+            
+        Returns:
+            Dict: {(民國年, 季度): 下載結果}，只包含實際嘗試下載的季度
+        """
+        if not self.supports_discovery():
+            return {}
+        
+        years = sorted(set(years), reverse=True) if years is not None else None
+        results: Dict[Tuple[int, int], DownloadResult] = {}
+        
+        self.timings.labels = {"attempt": 1}
+        first_trace = len(self.traces)
+        async with self._browser_page(self.headless, f"{self.bank_code:02d}_harvest") as page:
+            try:
+                if self.discover_by_year:
+                    reports = []
+                    for year in years or [time.localtime().tm_year - 1911]:
+                        reports.extend(await self._discover(page, year))
+                else:
+                    reports = await self._discover(page)
+            except DiscoveryError as e:
+                print(f"  [{self.bank_name}] {e}")
+                reports = []
+            
+            # 同一季度有多個連結時取第一個，由新到舊下載
+            found: Dict[Tuple[int, int], str] = {}
+            for year, quarter, url in reports:
+                if years is None or year in years:
+                    found.setdefault((year, quarter), url)
+            
+            for (year, quarter), url in sorted(found.items(), reverse=True):
+                if self.file_exists(year, quarter):
+                    if self.link_cache.get(self.bank_code, year, quarter) is None:
+                        self.link_cache.put(self.bank_code, year, quarter, url)
+                    continue
+                
+                self._source = None
+                self.timings.labels.update(year=year, quarter=quarter)
+                result = await self.download_pdf_from_url(page, url, year, quarter)
+                if self._is_download_successful(result, year, quarter):
+                    source_url, etag, last_modified = self._source or (url, "", "")
+                    self.link_cache.put(self.bank_code, year, quarter, source_url, etag, last_modified)
+                else:
+                    self._cleanup_failed_download(year, quarter)
+                results[(year, quarter)] = result
+            
+            # 列表頁找不到報表或有季度下載失敗時保存 trace
+            self._page_failed = not reports or any(r.status in TRACE_STATUSES for r in results.values())
+        
+        for path in self.traces[first_trace:]:
+            print(f"  [{self.bank_name}] 已保存 trace: {path}")
+        return results
+    
+    @property
+    def _replaying(self) -> bool:
+        """是否為 HAR 重播（離線）模式"""
+        return self.har is not None and not self.har.recording
+    
+    @staticmethod
+    def _replay_miss(url: str, result: Optional[DownloadResult] = None) -> DownloadResult:
+        """
+        重播時 HAR 沒有此網址的回應：直接回報失敗，不退回會連網的 page.request / wget
+        
+        Args:
+            url: PDF 網址
+            result: HTTP 串流的結果（HAR 中找不到時為 HTTP 404），None 表示無法以 httpx 重播
+        """
+        reason = result.message if result is not None else "未安裝 httpx"
+        return DownloadResult(
+            status=DownloadStatus.ERROR,
+            message=f"重播時 HAR 中找不到回應（{reason}）: {url}",
+            error_kind=result.error_kind if result is not None else None,
+        )
+    
+    async def download_pdf_from_url(self, page: "Page", url: str, year: int, quarter: int) -> DownloadResult:
+        """
+        從 URL 下載 PDF（非同步）
+        
+        優先以 HTTP 串流寫入磁碟（帶上瀏覽器的 cookie、User-Agent 與 Referer），
+        串流失敗（例如被防火牆擋下）時才退回 page.request 整份讀入記憶體的方式。
+        HAR 重播時不退回：page.request 不經過 context 路由，會直接連到銀行網站。
+        """
+        async with self._http_session() as http:
+            if http.available:
+                result = await self.stream_download(
+                    url, year, quarter, headers=await self._browser_headers(page, url)
+                )
+                if result.status == DownloadStatus.SUCCESS:
+                    return result
+                self._cleanup_failed_download(year, quarter)
+                if self._replaying:
+                    return self._replay_miss(url, result)
+            elif self._replaying:
+                return self._replay_miss(url)
+        
         try:
-            response = await page.request.get(url)
+            with self.timings.span("transfer") as span:
+                response = await page.request.get(url)
+                body = await response.body() if response.status == 200 else b""
+                span.bytes = len(body)
             
             if response.status == 200:
                 content_type = response.headers.get('content-type', '')
                 if 'pdf' in content_type.lower() or url.endswith('.pdf'):
-                    file_path = self.save_pdf(await response.body(), year, quarter)
+                    file_path = self.save_pdf(body, year, quarter)
+                    self._remember_source(
+                        url,
+                        response.headers.get('etag', ''),
+                        response.headers.get('last-modified', ''),
+                    )
                     return DownloadResult(
                         status=DownloadStatus.SUCCESS,
                         message="下載成功",
@@ -217,26 +1001,164 @@ class BaseBankDownloader(ABC):
                 else:
                     return DownloadResult(
                         status=DownloadStatus.ERROR,
-                        message=f"非 PDF 格式: {content_type}"
+                        message=f"非 PDF 格式: {content_type}",
+                        error_kind=FailureKind.NOT_PDF
                     )
             else:
                 return DownloadResult(
                     status=DownloadStatus.NO_DATA,
-                    message=f"HTTP {response.status}"
+                    message=f"HTTP {response.status}",
+                    error_kind=failure_for_status(response.status)
                 )
         except Exception as e:
             return DownloadResult(
                 status=DownloadStatus.ERROR,
-                message=f"下載失敗: {str(e)}"
+                message=f"下載失敗: {str(e)}",
+                error_kind=classify_exception(e)
             )
     
-    async def download_pdf_by_click(self, page: Page, locator, year: int, quarter: int) -> DownloadResult:
-        """透過點擊連結下載 PDF（非同步，適用於需要 JavaScript 處理的下載連結）"""
+    # ------------------------------------------------------------
+    # 等待工具：以條件式等待取代固定秒數，timeout 沿用原本的秒數當上限
+    # ------------------------------------------------------------
+    
+    async def pause(self, page: "Page", ms: int):
+        """固定等待（計入統計；能改用條件式等待時請優先使用下列方法）"""
+        with self.timings.span("wait"):
+            start = time.perf_counter()
+            await page.wait_for_timeout(ms)
+            self.wait_stats.record_fixed((time.perf_counter() - start) * 1000)
+    
+    async def wait_for_text(
+        self,
+        page: "Page",
+        selector: str,
+        text: Optional[str] = None,
+        timeout: int = 5000,
+        state: str = "visible",
+    ) -> bool:
+        """
+        等待符合選擇器（且包含指定文字）的元素出現
+        
+        Args:
+            page: Playwright Page 物件
+            selector: CSS 選擇器
+            text: 元素需包含的文字，None 表示不限
+            timeout: 最長等待毫秒數
+            state: 等待狀態: visible, attached
+            
+        Returns:
+            是否在時限內出現（逾時不拋出例外）
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
+        locator = page.locator(selector)
+        if text:
+            locator = locator.filter(has_text=text)
+        
+        start = time.perf_counter()
         try:
-            # 確保目錄存在
-            self.ensure_dir(year, quarter)
-            file_path = self.get_file_path(year, quarter)
+            await locator.first.wait_for(state=state, timeout=timeout)
+            found = True
+        except PlaywrightTimeoutError:
+            found = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.wait_stats.record_condition("text", elapsed_ms, found)
+        self.timings.record("wait", elapsed_ms)
+        return found
+    
+    async def wait_for_response_matching(
+        self,
+        page: "Page",
+        pattern: Union[str, Pattern],
+        action: Optional[Callable[[], Awaitable]] = None,
+        timeout: int = 10000,
+        resource_types: Optional[Iterable[str]] = ("xhr", "fetch"),
+    ):
+        """
+        等待網址符合樣式的回應（例如點擊後觸發的 API 請求）
+        
+        Args:
+            page: Playwright Page 物件
+            pattern: 網址子字串、萬用字元樣式或已編譯的正規表示式
+            action: 觸發請求的動作，會在開始監聽後執行
+            timeout: 最長等待毫秒數
+            resource_types: 只比對這些請求類型（預設 XHR / fetch，不會被圖片等子資源提早滿足），
+                None 表示不限
             
+        Returns:
+            Response 物件，逾時回傳 None
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
+        allowed = frozenset(resource_types) if resource_types is not None else None
+        
+        def matches(response) -> bool:
+            if allowed is not None and response.request.resource_type not in allowed:
+                return False
+            url = response.url
+            if isinstance(pattern, re.Pattern):
+                return pattern.search(url) is not None
+            return pattern in url or fnmatch(url, pattern)
+        
+        start = time.perf_counter()
+        response = None
+        try:
+            if action is None:
+                response = await page.wait_for_response(matches, timeout=timeout)
+            else:
+                async with page.expect_response(matches, timeout=timeout) as response_info:
+                    await action()
+                response = await response_info.value
+        except PlaywrightTimeoutError:
+            pass
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.wait_stats.record_condition("response", elapsed_ms, response is not None)
+        self.timings.record("wait", elapsed_ms)
+        return response
+    
+    async def wait_for_dom_stable(self, page: "Page", timeout: int = 3000, quiet_ms: int = 300) -> bool:
+        """
+        等待 DOM 在 quiet_ms 毫秒內沒有變動（適合點擊展開、切換年份後的重繪）
+        
+        Args:
+            page: Playwright Page 物件
+            timeout: 最長等待毫秒數（取代固定等待時沿用原本的秒數）
+            quiet_ms: 視為穩定所需的無變動時間
+            
+        Returns:
+            是否在時限內達到穩定
+        """
+        start = time.perf_counter()
+        try:
+            stable = bool(await page.evaluate(DOM_STABLE_JS, [quiet_ms, timeout]))
+        except Exception:
+            # 等待期間頁面導覽會讓執行環境失效，改等新頁面載入
+            stable = False
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+            except Exception:
+                pass
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.wait_stats.record_condition("dom", elapsed_ms, stable)
+        self.timings.record("wait", elapsed_ms)
+        return stable
+    
+    async def _browser_headers(self, page: "Page", url: str) -> dict:
+        """取得瀏覽器目前的 cookie、User-Agent 與 Referer，讓 HTTP 串流沿用瀏覽器的身分"""
+        headers = {"User-Agent": self._get_user_agent()}
+        if page.url and page.url.startswith("http"):
+            headers["Referer"] = page.url
+        try:
+            cookies = await page.context.cookies(url)
+        except Exception:
+            cookies = []
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
+        return headers
+    
+    async def download_pdf_by_click(self, page: "Page", locator, year: int, quarter: int) -> DownloadResult:
+        """透過點擊連結下載 PDF（非同步，適用於需要 JavaScript 處理的下載連結）"""
+        try:
             # 啟動下載監聽
             async with page.expect_download(timeout=30000) as download_info:
                 await locator.click()
@@ -244,7 +1166,7 @@ class BaseBankDownloader(ABC):
             download = await download_info.value
             
             # 儲存檔案
-            await download.save_as(file_path)
+            file_path = await self.save_download(download, year, quarter)
             
             return DownloadResult(
                 status=DownloadStatus.SUCCESS,
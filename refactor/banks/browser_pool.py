@@ -0,0 +1,193 @@
+"""
+共用瀏覽器池（非同步版本）
+
+一次執行只啟動一個 Playwright driver，並依 (browser_type, headless, display)
+保留暖機中的瀏覽器。每家銀行從池中租用全新的 BrowserContext，
+用完即關閉；瀏覽器被租用指定次數後退役，待最後一個 context 歸還後關閉，
+下一次租用會重新啟動一個乾淨的瀏覽器。
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Playwright
+
+
+BrowserKey = Tuple[str, bool, Optional[str]]
+
+
+@dataclass
+class _PooledBrowser:
+    """池中的瀏覽器與其使用狀況"""
+    key: BrowserKey
+    browser: "Browser"
+    uses: int = 0          # 累計租用次數
+    active: int = 0        # 目前租用中的 context 數量
+    retired: bool = False  # 已退役，歸還後即關閉
+
+
+class BrowserPool:
+    """
+    共用瀏覽器池
+
+    使用方式:
+        async with BrowserPool() as pool:
+            async with pool.lease("chromium", headless=True) as context:
+                page = await context.new_page()
+    """
+
+    def __init__(self, max_uses: int = 20):
+        """
+        初始化瀏覽器池
+
+        Args:
+            max_uses: 每個瀏覽器最多被租用的次數，達到後回收重啟
+        """
+        self.max_uses = max(1, max_uses)
+        self._playwright: Optional["Playwright"] = None
+        self._browsers: Dict[BrowserKey, _PooledBrowser] = {}
+        self._retiring: List[_PooledBrowser] = []
+        # driver 只啟動一次；同一種瀏覽器一次只啟動一個，不同種類可同時啟動
+        self._start_lock = asyncio.Lock()
+        self._key_locks: Dict[BrowserKey, asyncio.Lock] = {}
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """啟動 Playwright driver（只會啟動一次，同時呼叫時等待同一次啟動）"""
+        async with self._start_lock:
+            if self._playwright is None:
+                # 需要瀏覽器時才載入 Playwright
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+
+    async def close(self):
+        """關閉所有瀏覽器與 Playwright driver"""
+        entries = list(self._browsers.values()) + self._retiring
+        self._browsers.clear()
+        self._retiring.clear()
+
+        for entry in entries:
+            await self._close_browser(entry)
+
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def _get_launcher(self, browser_type: str):
+        """根據 browser_type 取得對應的瀏覽器啟動器"""
+        if browser_type == "firefox":
+            return self._playwright.firefox
+        elif browser_type == "webkit":
+            return self._playwright.webkit
+        else:
+            return self._playwright.chromium
+
+    async def _close_browser(self, entry: _PooledBrowser):
+        """關閉瀏覽器（忽略已斷線的錯誤）"""
+        try:
+            await entry.browser.close()
+        except Exception:
+            pass
+
+    def _retire(self, entry: _PooledBrowser):
+        """將瀏覽器移出可租用清單"""
+        entry.retired = True
+        if self._browsers.get(entry.key) is entry:
+            del self._browsers[entry.key]
+        if entry.active > 0:
+            self._retiring.append(entry)
+
+    async def _acquire(
+        self, browser_type: str, headless: bool, display: Optional[str] = None
+    ) -> _PooledBrowser:
+        """取得可用的瀏覽器，必要時啟動新的瀏覽器"""
+        await self.start()
+        key = (browser_type, headless, display)
+
+        async with self._key_locks.setdefault(key, asyncio.Lock()):
+            entry = self._browsers.get(key)
+
+            # 已斷線（當機或被關閉）的瀏覽器直接汰換
+            if entry and not entry.browser.is_connected():
+                self._retire(entry)
+                if entry.active == 0:
+                    await self._close_browser(entry)
+                entry = None
+
+            if entry is None:
+                launch_options = {"headless": headless}
+                if display:
+                    # 有頭瀏覽器開在指定的虛擬顯示器上
+                    launch_options["env"] = {**os.environ, "DISPLAY": display}
+                browser = await self._get_launcher(browser_type).launch(**launch_options)
+                entry = _PooledBrowser(key=key, browser=browser)
+                self._browsers[key] = entry
+
+            entry.uses += 1
+            entry.active += 1
+            if entry.uses >= self.max_uses:
+                self._retire(entry)
+
+            return entry
+
+    async def _release(self, entry: _PooledBrowser):
+        """歸還瀏覽器，已退役且無人使用時關閉"""
+        entry.active -= 1
+        if entry.retired and entry.active <= 0:
+            if entry in self._retiring:
+                self._retiring.remove(entry)
+            await self._close_browser(entry)
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        browser_type: str = "chromium",
+        headless: bool = True,
+        display: Optional[str] = None,
+        on_timing: Optional[Callable[[str, float], None]] = None,
+        **context_options,
+    ) -> AsyncIterator["BrowserContext"]:
+        """
+        租用全新的 BrowserContext
+
+        Args:
+            browser_type: 瀏覽器類型: chromium, firefox, webkit
+            headless: 是否使用無頭模式
+            display: 有頭模式使用的顯示器（例如 ":99"），None 表示沿用目前環境
+            on_timing: 計時回調 (階段, 毫秒)，階段為 launch（取得或啟動瀏覽器）與 context
+            **context_options: 傳給 browser.new_context() 的參數
+
+        Yields:
+            BrowserContext: 離開時自動關閉
+        """
+        start = time.perf_counter()
+        entry = await self._acquire(browser_type, headless, display)
+        if on_timing is not None:
+            on_timing("launch", (time.perf_counter() - start) * 1000)
+        context = None
+        try:
+            start = time.perf_counter()
+            context = await entry.browser.new_context(**context_options)
+            if on_timing is not None:
+                on_timing("context", (time.perf_counter() - start) * 1000)
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            await self._release(entry)
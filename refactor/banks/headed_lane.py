@@ -0,0 +1,184 @@
+"""
+有頭瀏覽器專用通道（非同步版本）
+
+有頭模式的 Chromium 吃的記憶體比無頭模式多很多，在 Linux 伺服器上還需要顯示器。
+有頭工作（headless = False 的銀行、無頭失敗後的有頭重試）改走這條通道：
+擁有自己的並行上限，不佔用無頭工作的名額；沒有 DISPLAY 的 Linux 環境
+會為每個名額啟動一個 Xvfb 虛擬顯示器。
+"""
+import asyncio
+import os
+import shutil
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+
+class HeadedLane:
+    """
+    有頭瀏覽器通道
+
+    使用方式:
+        lane = HeadedLane(max_concurrent=2)
+        async with lane.slot() as display:
+            # display 為 ":99" 之類的顯示器名稱，None 表示沿用目前環境
+            ...
+        await lane.close()
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        use_xvfb: Optional[bool] = None,
+        display_base: int = 99,
+        screen: str = "1920x1080x24",
+    ):
+        """
+        初始化有頭通道
+
+        Args:
+            max_concurrent: 同時執行的有頭瀏覽器數量上限
+            use_xvfb: 是否啟動 Xvfb，None 表示自動判斷（Linux、沒有 DISPLAY 且已安裝 Xvfb）
+            display_base: 第一個虛擬顯示器編號（只用於不支援 -displayfd 的舊版 Xvfb）
+            screen: 虛擬螢幕解析度與色深
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        if use_xvfb is None:
+            use_xvfb = (
+                sys.platform.startswith("linux")
+                and not os.environ.get("DISPLAY")
+                and shutil.which("Xvfb") is not None
+            )
+        self.use_xvfb = use_xvfb
+        self.display_base = display_base
+        self.screen = screen
+        self._slots: Optional[asyncio.Queue] = None
+        self._processes: List[asyncio.subprocess.Process] = []
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _start(self):
+        """建立名額（必要時啟動 Xvfb，只會執行一次）"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._slots is not None:
+                return
+
+            slots: asyncio.Queue = asyncio.Queue()
+            for i in range(self.max_concurrent):
+                display = None
+                if self.use_xvfb:
+                    display = await self._start_xvfb(self.display_base + i)
+                slots.put_nowait(display)
+            self._slots = slots
+
+    async def _start_xvfb(self, number: int) -> Optional[str]:
+        """
+        啟動一個 Xvfb 顯示器，失敗時回傳 None（沿用目前環境）
+
+        以 -displayfd 讓 Xvfb 自行挑選未使用的顯示器編號，不會拿到其他 X server 的顯示器；
+        不支援 -displayfd 的舊版 Xvfb 才改用指定編號。
+
+        Args:
+            number: 舊版 Xvfb 使用的顯示器編號
+        """
+        display = await self._start_xvfb_displayfd()
+        if display is None:
+            display = await self._start_xvfb_numbered(number)
+        return display
+
+    async def _start_xvfb_displayfd(self) -> Optional[str]:
+        """以 -displayfd 啟動 Xvfb（就緒時把顯示器編號寫到 stdout）"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "Xvfb", "-displayfd", "1", "-screen", "0", self.screen, "-nolisten", "tcp",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            return None
+
+        # 等待 Xvfb 回報顯示器編號（最多 5 秒）；不支援此參數時會直接結束
+        try:
+            line = await asyncio.wait_for(process.stdout.readline(), timeout=5)
+        except asyncio.TimeoutError:
+            line = b""
+        number = line.strip()
+        if number.isdigit() and process.returncode is None:
+            self._processes.append(process)
+            return f":{int(number)}"
+
+        await self._stop(process)
+        return None
+
+    async def _start_xvfb_numbered(self, number: int) -> Optional[str]:
+        """以指定編號啟動 Xvfb，確認鎖定檔屬於這個行程才使用"""
+        display = f":{number}"
+        lock_path = f"/tmp/.X{number}-lock"
+        if os.path.exists(lock_path):
+            # 已有其他 X server 使用這個編號
+            return None
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "Xvfb", display, "-screen", "0", self.screen, "-nolisten", "tcp",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            return None
+
+        # 等待 X socket 出現（最多 5 秒）；行程已結束時 socket 可能屬於其他 X server
+        socket_path = f"/tmp/.X11-unix/X{number}"
+        for _ in range(50):
+            if process.returncode is not None:
+                return None
+            if os.path.exists(socket_path) and _lock_owner(lock_path) == process.pid:
+                self._processes.append(process)
+                return display
+            await asyncio.sleep(0.1)
+
+        await self._stop(process)
+        return None
+
+    @staticmethod
+    async def _stop(process: asyncio.subprocess.Process):
+        """結束 Xvfb 行程"""
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await process.wait()
+        except ProcessLookupError:
+            pass
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Optional[str]]:
+        """
+        取得一個有頭名額
+
+        Yields:
+            顯示器名稱（例如 ":99"），None 表示沿用目前的 DISPLAY
+        """
+        await self._start()
+        display = await self._slots.get()
+        try:
+            yield display
+        finally:
+            self._slots.put_nowait(display)
+
+    async def close(self):
+        """關閉所有 Xvfb 顯示器"""
+        processes, self._processes = self._processes, []
+        self._slots = None
+        for process in processes:
+            await self._stop(process)
+
+
+def _lock_owner(lock_path: str) -> Optional[int]:
+    """X server 鎖定檔記錄的行程編號，讀取失敗時回傳 None"""
+    try:
+        with open(lock_path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
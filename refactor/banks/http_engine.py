@@ -0,0 +1,354 @@
+"""
+純 HTTP 下載引擎（非同步版本）
+
+以共用連線池的 httpx.AsyncClient 取代瀏覽器，用於 PDF 網址可預先推算的銀行：
+直接以串流方式將 PDF 寫入磁碟，不需要啟動 Playwright。
+
+需要安裝：
+- httpx: pip install httpx
+"""
+import asyncio
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Callable, Dict, Optional, Tuple
+
+from .atomic_file import commit_temp_file, remove_quietly, temp_path_for
+from .rate_limit import HostThrottle
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    httpx = None
+    HAS_HTTPX = False
+
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 進度回調: (已下載位元組, 總位元組或 None)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+def _open_temp(temp_path: str) -> BinaryIO:
+    """建立資料夾並開啟暫存檔"""
+    os.makedirs(os.path.dirname(temp_path) or ".", exist_ok=True)
+    return open(temp_path, "wb")
+
+
+@dataclass
+class HttpFetchResult:
+    """HTTP 下載結果"""
+    status_code: int
+    url: str = ""                    # 最終網址（跟隨轉址後）
+    content_type: str = ""
+    bytes_written: int = 0
+    is_pdf: bool = False             # 內容開頭是否為 %PDF
+    etag: str = ""
+    last_modified: str = ""
+
+    @property
+    def ok(self) -> bool:
+        """HTTP 200 且內容為 PDF"""
+        return self.status_code == 200 and self.is_pdf
+
+
+@dataclass
+class RevalidationResult:
+    """條件式請求的比對結果"""
+    changed: Optional[bool]          # True: 已變更, False: 未變更, None: 無法判斷
+    status_code: int = 0
+    reason: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    content_length: Optional[int] = None
+
+
+class HttpEngine:
+    """
+    純 HTTP 下載引擎
+
+    依憑證驗證設定各保留一個 httpx.AsyncClient，同一次執行的所有銀行共用連線池。
+
+    使用方式:
+        engine = HttpEngine()
+        result = await engine.stream_to_file(url, "data/114Q1/xx.pdf")
+        await engine.close()
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        timeout: float = 60.0,
+        user_agent: str = DEFAULT_USER_AGENT,
+        throttle: Optional[HostThrottle] = None,
+        transport_factory: Optional[Callable[..., "httpx.AsyncBaseTransport"]] = None,
+    ):
+        """
+        初始化 HTTP 引擎
+
+        Args:
+            max_connections: 連線池最大連線數
+            timeout: 單次請求逾時秒數
+            user_agent: 預設 User-Agent
+            throttle: 主機節流器（每次請求前取得 token，並回報回應狀態）
+            transport_factory: 自訂 transport 的建立函式 (verify, limits)，例如 HAR 錄製/重播
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.throttle = throttle
+        self.transport_factory = transport_factory
+        self._clients: Dict[bool, "httpx.AsyncClient"] = {}
+
+    @property
+    def available(self) -> bool:
+        """是否可使用（已安裝 httpx）"""
+        return HAS_HTTPX
+
+    def _get_client(self, verify: bool = True) -> "httpx.AsyncClient":
+        """取得（必要時建立）共用的 AsyncClient"""
+        if not HAS_HTTPX:
+            raise ImportError("需要安裝 httpx: pip install httpx")
+
+        client = self._clients.get(verify)
+        if client is None:
+            limits = httpx.Limits(max_connections=self.max_connections)
+            transport = self.transport_factory(verify, limits) if self.transport_factory else None
+            client = httpx.AsyncClient(
+                verify=verify,
+                follow_redirects=True,
+                timeout=self.timeout,
+                limits=limits,
+                headers={"User-Agent": self.user_agent},
+                transport=transport,
+            )
+            self._clients[verify] = client
+        return client
+
+    async def close(self):
+        """關閉所有連線"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+    @asynccontextmanager
+    async def _throttled(self, url: str) -> AsyncIterator[Callable[[int], None]]:
+        """
+        依主機節流並回報結果
+
+        Yields:
+            回報 HTTP 狀態碼的函數（取得回應標頭後呼叫）
+        """
+        throttle = self.throttle
+        if throttle is None:
+            yield lambda status: None
+            return
+
+        await throttle.wait(url)
+        start = time.perf_counter()
+        try:
+            yield lambda status: throttle.record(url, status, time.perf_counter() - start)
+        except Exception as e:
+            if HAS_HTTPX and isinstance(e, httpx.TimeoutException):
+                throttle.record_timeout(url)
+            raise
+
+    @staticmethod
+    def _decode(content: bytes, content_type: str) -> str:
+        """依 Content-Type 或 <meta charset> 解碼 HTML（常見於 Big5 網頁）"""
+        match = re.search(r'charset=["\']?([\w-]+)', content_type, re.IGNORECASE)
+        if not match:
+            match = re.search(rb'charset=["\']?([\w-]+)', content[:2048], re.IGNORECASE)
+        encoding = match.group(1) if match else "utf-8"
+        if isinstance(encoding, bytes):
+            encoding = encoding.decode("ascii", "ignore")
+        try:
+            return content.decode(encoding, errors="replace")
+        except LookupError:
+            return content.decode("utf-8", errors="replace")
+
+    async def get_text(
+        self,
+        url: str,
+        verify: bool = True,
+        headers: Optional[dict] = None,
+    ) -> Tuple[int, str]:
+        """
+        取得網頁文字
+
+        Returns:
+            (HTTP 狀態碼, 解碼後的內容)
+        """
+        async with self._throttled(url) as record:
+            response = await self._get_client(verify).get(url, headers=headers)
+            record(response.status_code)
+        return response.status_code, self._decode(
+            response.content, response.headers.get("content-type", "")
+        )
+
+    async def post_json(
+        self,
+        url: str,
+        payload: dict,
+        verify: bool = True,
+        headers: Optional[dict] = None,
+    ) -> Tuple[int, Optional[dict]]:
+        """
+        送出 JSON POST 請求
+
+        Returns:
+            (HTTP 狀態碼, 解析後的 JSON，失敗時為 None)
+        """
+        async with self._throttled(url) as record:
+            response = await self._get_client(verify).post(url, json=payload, headers=headers)
+            record(response.status_code)
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+    async def revalidate(
+        self,
+        url: str,
+        etag: str = "",
+        last_modified: str = "",
+        local_size: Optional[int] = None,
+        verify: bool = True,
+        headers: Optional[dict] = None,
+    ) -> RevalidationResult:
+        """
+        以條件式 GET 檢查遠端檔案是否變更（只讀取回應標頭，不下載內容）
+
+        比對順序：304 回應 > ETag > Last-Modified > Content-Length 與本機檔案大小
+
+        Args:
+            url: PDF 網址
+            etag: 上次下載時的 ETag
+            last_modified: 上次下載時的 Last-Modified
+            local_size: 本機檔案大小
+            verify: 是否驗證 SSL 憑證
+            headers: 額外的請求標頭
+
+        Returns:
+            RevalidationResult: 比對結果
+        """
+        request_headers = dict(headers or {})
+        if etag:
+            request_headers["If-None-Match"] = etag
+        if last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+
+        client = self._get_client(verify)
+        async with self._throttled(url) as record, \
+                client.stream("GET", url, headers=request_headers) as response:
+            record(response.status_code)
+            length = response.headers.get("content-length")
+            result = RevalidationResult(
+                changed=None,
+                status_code=response.status_code,
+                etag=response.headers.get("etag", ""),
+                last_modified=response.headers.get("last-modified", ""),
+                content_length=int(length) if length and length.isdigit() else None,
+            )
+
+        if result.status_code == 304:
+            result.changed = False
+            result.reason = "304 Not Modified"
+        elif result.status_code != 200:
+            result.reason = f"HTTP {result.status_code}"
+        elif etag and result.etag:
+            result.changed = result.etag != etag
+            result.reason = "ETag"
+        elif last_modified and result.last_modified:
+            result.changed = result.last_modified != last_modified
+            result.reason = "Last-Modified"
+        elif local_size is not None and result.content_length is not None:
+            result.changed = result.content_length != local_size
+            result.reason = "Content-Length"
+        else:
+            result.reason = "伺服器未提供可比對的標頭"
+
+        return result
+
+    async def stream_to_file(
+        self,
+        url: str,
+        file_path: str,
+        verify: bool = True,
+        headers: Optional[dict] = None,
+        cookies: Optional[dict] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        chunk_size: int = 64 * 1024,
+    ) -> HttpFetchResult:
+        """
+        以串流方式下載 PDF 至檔案
+
+        只有在回應為 200 且內容開頭為 %PDF 時才會寫入檔案；
+        內容先寫入 .part 暫存檔，完成後 fsync 並改名為正式檔名，
+        下載中斷時只會刪除暫存檔，不會留下被截斷的 PDF。
+
+        Args:
+            url: PDF 網址
+            file_path: 儲存路徑
+            verify: 是否驗證 SSL 憑證
+            headers: 額外的請求標頭
+            cookies: 請求要帶的 cookie
+            progress_callback: 進度回調函數 (已下載位元組, 總位元組)
+            chunk_size: 每次寫入的區塊大小
+
+        Returns:
+            HttpFetchResult: 下載結果
+        """
+        client = self._get_client(verify)
+
+        async with self._throttled(url) as record, \
+                client.stream("GET", url, headers=headers, cookies=cookies) as response:
+            record(response.status_code)
+            result = HttpFetchResult(
+                status_code=response.status_code,
+                url=str(response.url),
+                content_type=response.headers.get("content-type", ""),
+                etag=response.headers.get("etag", ""),
+                last_modified=response.headers.get("last-modified", ""),
+            )
+            if response.status_code != 200:
+                return result
+
+            total = response.headers.get("content-length")
+            total = int(total) if total and total.isdigit() else None
+
+            # 檔案 I/O（開檔、寫入、fsync、改名）都在執行緒中進行，不阻塞其他銀行的下載
+            temp_path = temp_path_for(file_path)
+            f = None
+            try:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    if f is None:
+                        # 第一個區塊決定是否為 PDF，非 PDF 不落地
+                        if not chunk.startswith(b"%PDF"):
+                            return result
+                        result.is_pdf = True
+                        f = await asyncio.to_thread(_open_temp, temp_path)
+                    await asyncio.to_thread(f.write, chunk)
+                    result.bytes_written += len(chunk)
+                    if progress_callback:
+                        progress_callback(result.bytes_written, total)
+
+                if f is not None:
+                    await asyncio.to_thread(f.close)
+                    f = None
+                    await asyncio.to_thread(commit_temp_file, temp_path, file_path)
+            except BaseException:
+                if f is not None:
+                    f.close()
+                    f = None
+                remove_quietly(temp_path)
+                raise
+
+        return result
@@ -0,0 +1,118 @@
+"""
+PDF 網址快取
+
+記錄每家銀行每一季最後成功下載的 PDF 網址（以及 ETag / Last-Modified），
+存放於 {data_dir}/.link_cache.json。之後重新下載（例如刪除損毀檔案、換一台電腦執行）
+時先直接請求快取的網址，成功就不必再開瀏覽器逐頁尋找連結。
+"""
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from .atomic_file import atomic_write_bytes
+
+
+CACHE_FILENAME = ".link_cache.json"
+
+
+@dataclass
+class LinkCacheEntry:
+    """快取項目"""
+    url: str
+    etag: str = ""
+    last_modified: str = ""
+    resolved_at: str = ""
+
+
+class LinkCache:
+    """
+    PDF 網址快取（JSON 檔）
+
+    使用方式:
+        cache = LinkCache("data/.link_cache.json")
+        cache.put(31, 114, 1, "https://...pdf", etag='"abc"')
+        entry = cache.get(31, 114, 1)
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化快取
+
+        Args:
+            path: 快取檔案路徑
+        """
+        self.path = path
+        self._entries: Dict[str, LinkCacheEntry] = {}
+        self._load()
+
+    @classmethod
+    def for_data_dir(cls, data_dir: str) -> "LinkCache":
+        """取得資料目錄下的預設快取"""
+        return cls(os.path.join(data_dir, CACHE_FILENAME))
+
+    @staticmethod
+    def _key(bank_code: int, year: int, quarter: int) -> str:
+        return f"{bank_code}_{year}Q{quarter}"
+
+    def _load(self):
+        """讀取快取檔（不存在或格式錯誤時視為空快取）"""
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            for key, value in raw.items():
+                if isinstance(value, dict) and value.get("url"):
+                    self._entries[key] = LinkCacheEntry(**{
+                        k: value.get(k, "") for k in LinkCacheEntry.__dataclass_fields__
+                    })
+        except (OSError, ValueError, TypeError):
+            self._entries = {}
+
+    def save(self):
+        """寫回快取檔（原子寫入）"""
+        data = {key: asdict(entry) for key, entry in sorted(self._entries.items())}
+        content = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        atomic_write_bytes(self.path, content)
+
+    def get(self, bank_code: int, year: int, quarter: int) -> Optional[LinkCacheEntry]:
+        """取得快取項目"""
+        return self._entries.get(self._key(bank_code, year, quarter))
+
+    def put(
+        self,
+        bank_code: int,
+        year: int,
+        quarter: int,
+        url: str,
+        etag: str = "",
+        last_modified: str = "",
+    ):
+        """
+        新增或更新快取項目並寫回檔案
+
+        Args:
+            bank_code: 銀行代碼
+            year: 民國年
+            quarter: 季度
+            url: PDF 網址
+            etag: 回應的 ETag
+            last_modified: 回應的 Last-Modified
+        """
+        self._entries[self._key(bank_code, year, quarter)] = LinkCacheEntry(
+            url=url,
+            etag=etag or "",
+            last_modified=last_modified or "",
+            resolved_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        self.save()
+
+    def invalidate(self, bank_code: int, year: int, quarter: int):
+        """移除失效的快取項目"""
+        if self._entries.pop(self._key(bank_code, year, quarter), None) is not None:
+            self.save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
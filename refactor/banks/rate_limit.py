@@ -0,0 +1,311 @@
+"""
+流量控制（非同步版本）
+
+1. 每個主機一個 token bucket：同一主機的請求（例如玉山走的 doc.twse.com.tw）
+   不論來自哪家銀行都共用同一個速率上限，遇到 429/503 時該主機降速，之後逐步恢復。
+2. AIMD 並行控制：取代固定的 asyncio.Semaphore，回應快就逐步加開名額，
+   遇到 429/5xx 或逾時就把名額減半，讓 --parallel 可以放心調高。
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# 預設每個主機每秒請求數與突發量
+DEFAULT_HOST_RATE: Tuple[float, int] = (4.0, 8)
+
+# 特定主機的速率（共用主機或有防護的網站）
+HOST_RATE_OVERRIDES: Dict[str, Tuple[float, int]] = {
+    "doc.twse.com.tw": (1.0, 2),            # 公開資訊觀測站
+    "www.rakuten-bank.com.tw": (1.0, 2),    # Incapsula 防護
+}
+
+# 視為壅塞的 HTTP 狀態碼
+THROTTLE_STATUS = frozenset({429, 503})
+
+# 瀏覽器中需要節流的請求類型（子資源不計）
+THROTTLED_RESOURCE_TYPES = frozenset({"document", "xhr", "fetch"})
+
+
+class TokenBucket:
+    """
+    Token bucket 速率限制
+
+    rate 會因壅塞而暫時調降，之後每次成功回應逐步恢復到 base_rate。
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: 每秒補充的 token 數
+            burst: bucket 容量（允許的突發請求數）
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """取得一個 token，不足時等待"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def slow_down(self):
+        """壅塞時速率減半（最低為原速率的 1/8）"""
+        self.rate = max(self.base_rate / 8, self.rate / 2)
+
+    def recover(self):
+        """成功回應時逐步恢復速率"""
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 並行控制（可取代 asyncio.Semaphore 使用 async with）
+
+    - 加法增加：連續 limit 次快速回應後名額 +1，直到 max_limit
+    - 乘法減少：遇到壅塞訊號時名額減半（cooldown 秒內只減一次）
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial: Optional[int] = None,
+        fast_threshold: float = 3.0,
+        cooldown: float = 5.0,
+    ):
+        """
+        Args:
+            max_limit: 名額上限（通常為 --parallel）
+            min_limit: 名額下限
+            initial: 初始名額，預設為上限的一半
+            fast_threshold: 回應時間低於此秒數才算快速回應
+            cooldown: 兩次減半之間的最短間隔秒數
+        """
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = initial or max(self.min_limit, self.max_limit // 2)
+        self.fast_threshold = fast_threshold
+        self.cooldown = cooldown
+        self.peak = self.limit
+        self.decreases = 0
+        self._active = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    async def acquire(self):
+        """取得名額"""
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            raise
+
+    def release(self):
+        """歸還名額"""
+        self._active -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._active < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._active += 1
+                future.set_result(None)
+
+    def on_success(self, latency: float):
+        """回應成功（latency 秒）"""
+        if latency > self.fast_threshold:
+            return
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self.peak = max(self.peak, self.limit)
+            self._successes = 0
+            self._wake()
+
+    def on_congestion(self):
+        """收到 429/5xx 或逾時"""
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._successes = 0
+        new_limit = max(self.min_limit, self.limit // 2)
+        if new_limit < self.limit:
+            self.limit = new_limit
+            self.decreases += 1
+
+    def summary(self) -> str:
+        """統計摘要文字"""
+        return f"並行名額 {self.limit}/{self.max_limit}（最高 {self.peak}，減半 {self.decreases} 次）"
+
+
+@dataclass
+class HostStats:
+    """單一主機的統計"""
+    requests: int = 0
+    throttled: int = 0      # 429/503
+    server_errors: int = 0  # 其他 5xx
+    timeouts: int = 0
+
+
+class HostThrottle:
+    """
+    主機節流器：每個主機一個 token bucket，並把壅塞訊號回報給 AIMD 並行控制
+
+    HTTP 引擎在每次請求前呼叫 wait()、取得回應後呼叫 record()；
+    瀏覽器則以 install(context) 攔截 document/xhr/fetch 請求。
+    """
+
+    def __init__(
+        self,
+        limiter: Optional[AdaptiveLimiter] = None,
+        default_rate: Tuple[float, int] = DEFAULT_HOST_RATE,
+        overrides: Optional[Dict[str, Tuple[float, int]]] = None,
+    ):
+        """
+        Args:
+            limiter: 要回報壅塞訊號的 AIMD 並行控制（可稍後設定）
+            default_rate: 預設 (每秒請求數, 突發量)
+            overrides: 特定主機的速率，預設使用 HOST_RATE_OVERRIDES
+        """
+        self.limiter = limiter
+        self.default_rate = default_rate
+        self.overrides = dict(HOST_RATE_OVERRIDES if overrides is None else overrides)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.stats: Dict[str, HostStats] = {}
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.overrides.get(host, self.default_rate)
+            bucket = TokenBucket(rate, burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def wait(self, url: str):
+        """請求前取得該主機的 token"""
+        host = self._host(url)
+        if not host:
+            return
+        self.stats.setdefault(host, HostStats()).requests += 1
+        await self._bucket(host).acquire()
+
+    def record(self, url: str, status: int, latency: float):
+        """
+        回報回應結果
+
+        Args:
+            url: 請求網址
+            status: HTTP 狀態碼
+            latency: 回應時間（秒）
+        """
+        host = self._host(url)
+        if not host:
+            return
+        stats = self.stats.setdefault(host, HostStats())
+
+        if status in THROTTLE_STATUS or status >= 500:
+            if status in THROTTLE_STATUS:
+                stats.throttled += 1
+                self._bucket(host).slow_down()
+            else:
+                stats.server_errors += 1
+            if self.limiter:
+                self.limiter.on_congestion()
+        else:
+            self._bucket(host).recover()
+            if self.limiter:
+                self.limiter.on_success(latency)
+
+    def record_timeout(self, url: str):
+        """回報逾時"""
+        host = self._host(url)
+        if host:
+            self.stats.setdefault(host, HostStats()).timeouts += 1
+            self._bucket(host).slow_down()
+        if self.limiter:
+            self.limiter.on_congestion()
+
+    async def install(self, context):
+        """
+        在 BrowserContext 上安裝節流：document/xhr/fetch 請求先取得主機 token，
+        並以回應狀態與耗時回報 AIMD 並行控制
+        """
+        async def handle(route):
+            request = route.request
+            if request.resource_type in THROTTLED_RESOURCE_TYPES:
+                await self.wait(request.url)
+            try:
+                await route.fallback()
+            except Exception:
+                pass
+
+        def on_response(response):
+            request = response.request
+            if request.resource_type not in THROTTLED_RESOURCE_TYPES:
+                return
+            # timing 的時間以 startTime 為基準（毫秒），-1 表示無資料
+            start = (request.timing or {}).get("responseStart", -1)
+            latency = start / 1000 if start is not None and start >= 0 else 0.0
+            self.record(response.url, response.status, latency)
+
+        def on_failed(request):
+            failure = (request.failure or "").lower()
+            if request.resource_type in THROTTLED_RESOURCE_TYPES and "timed_out" in failure.replace(" ", "_"):
+                self.record_timeout(request.url)
+
+        await context.route("**/*", handle)
+        context.on("response", on_response)
+        context.on("requestfailed", on_failed)
+
+    def summary(self) -> str:
+        """有發生壅塞的主機摘要"""
+        parts = [
+            f"{host}: 429/503 {s.throttled}, 5xx {s.server_errors}, 逾時 {s.timeouts}"
+            for host, s in sorted(self.stats.items())
+            if s.throttled or s.server_errors or s.timeouts
+        ]
+        return "; ".join(parts) or "無壅塞"
@@ -0,0 +1,147 @@
+"""
+銀行下載器登錄表（延遲載入）
+
+登錄資料由 banks/bank_XX_xxx.py 的原始碼掃描而來（以 ast 解析，不匯入模組與 Playwright）：
+代碼取自檔名，名稱與類別取自設定了 bank_name 的類別，有定義 _discover 的視為支援多季度模式。
+第一次取得某家銀行的下載器類別時才匯入該模組；列出銀行、產生報表等
+不需要下載的流程因此不會載入 Playwright。
+
+新增銀行只要建立 banks/bank_XX_xxx.py；檔名代碼與類別的 bank_code 不一致時匯入本模組即報錯。
+"""
+import ast
+import importlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, Optional, Type
+
+if TYPE_CHECKING:
+    from .base import BaseBankDownloader
+
+
+# 銀行模組檔名：bank_{代碼}_{英文簡稱}.py
+MODULE_PATTERN = re.compile(r"^bank_(\d+)_\w+$")
+
+
+@dataclass(frozen=True)
+class BankSpec:
+    """銀行下載器的登錄資料"""
+    code: int
+    name: str
+    module: str              # banks 套件內的模組名稱
+    class_name: str
+    discovery: bool = False  # 是否實作 _discover（支援多季度模式）
+
+
+def _class_constants(node: ast.ClassDef) -> Dict[str, object]:
+    """類別本體中以常數指定的屬性（例如 bank_name = "臺灣銀行"）"""
+    constants = {}
+    for statement in node.body:
+        if (
+            isinstance(statement, ast.Assign)
+            and len(statement.targets) == 1
+            and isinstance(statement.targets[0], ast.Name)
+            and isinstance(statement.value, ast.Constant)
+        ):
+            constants[statement.targets[0].id] = statement.value.value
+    return constants
+
+
+def spec_from_source(module: str, source: str) -> BankSpec:
+    """
+    由銀行模組原始碼取得登錄資料
+
+    Args:
+        module: 模組名稱（bank_XX_xxx）
+        source: 模組原始碼
+
+    Raises:
+        ValueError: 檔名格式不符、找不到下載器類別，或 bank_code 與檔名代碼不一致
+    """
+    match = MODULE_PATTERN.match(module)
+    if match is None:
+        raise ValueError(f"{module}: 檔名需為 bank_XX_xxx")
+    code = int(match.group(1))
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        constants = _class_constants(node)
+        if not isinstance(constants.get("bank_name"), str):
+            continue
+        if constants.get("bank_code") != code:
+            raise ValueError(
+                f"{module}: {node.name}.bank_code = {constants.get('bank_code')!r} 與檔名代碼 {code} 不一致"
+            )
+        discovery = any(
+            isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name == "_discover"
+            for item in node.body
+        )
+        return BankSpec(code, constants["bank_name"], module, node.name, discovery=discovery)
+    raise ValueError(f"{module}: 找不到設定 bank_name 的下載器類別")
+
+
+def scan_specs(package_dir: Optional[Path] = None) -> List[BankSpec]:
+    """
+    掃描 banks 目錄下所有 bank_XX_xxx.py（依代碼排序）
+
+    Args:
+        package_dir: 銀行模組所在目錄，None 表示本套件目錄
+    """
+    package_dir = package_dir or Path(__file__).resolve().parent
+    specs = [
+        spec_from_source(path.stem, path.read_text(encoding="utf-8"))
+        for path in package_dir.glob("bank_*.py")
+        if MODULE_PATTERN.match(path.stem)
+    ]
+    return sorted(specs, key=lambda spec: spec.code)
+
+
+BANK_SPECS: List[BankSpec] = scan_specs()
+
+SPECS_BY_NAME: Dict[str, BankSpec] = {spec.name: spec for spec in BANK_SPECS}
+SPECS_BY_CODE: Dict[int, BankSpec] = {spec.code: spec for spec in BANK_SPECS}
+
+
+def load_downloader_class(bank_name: str) -> Optional[Type["BaseBankDownloader"]]:
+    """
+    取得銀行下載器類別（第一次呼叫時才匯入該銀行模組）
+
+    Args:
+        bank_name: 銀行名稱
+
+    Returns:
+        下載器類別，不支援的銀行回傳 None
+    """
+    spec = SPECS_BY_NAME.get(bank_name)
+    if spec is None:
+        return None
+    module = importlib.import_module(f".{spec.module}", __package__)
+    return getattr(module, spec.class_name)
+
+
+def load_all() -> Dict[str, Type["BaseBankDownloader"]]:
+    """匯入所有銀行模組，回傳 {銀行名稱: 類別}"""
+    return {spec.name: load_downloader_class(spec.name) for spec in BANK_SPECS}
+
+
+class LazyDownloaderMap(Mapping):
+    """
+    {銀行名稱: 下載器類別} 的唯讀對照表
+
+    keys()、len()、in 只使用登錄資料；取值時才匯入對應的銀行模組。
+    """
+
+    def __getitem__(self, bank_name: str) -> Type["BaseBankDownloader"]:
+        downloader_class = load_downloader_class(bank_name)
+        if downloader_class is None:
+            raise KeyError(bank_name)
+        return downloader_class
+
+    def __contains__(self, bank_name: object) -> bool:
+        return bank_name in SPECS_BY_NAME
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(SPECS_BY_NAME)
+
+    def __len__(self) -> int:
+        return len(SPECS_BY_NAME)
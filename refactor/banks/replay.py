@@ -0,0 +1,217 @@
+"""
+離線錄製與重播（HAR）
+
+錄製模式將每家銀行的瀏覽過程存成 HAR（PDF 內容另存為附檔），HTTP 快速路徑的
+請求也另存一份 HAR；重播模式改由這些檔案回應，完全不連網。同一套下載流程
+（並行控制、節流、重試）因此可以在離線環境重複計時與回歸測試。
+
+目錄結構:
+    {har_dir}/browser/{bank_code}_{name}.har   # Playwright route_from_har（update_content="attach"）
+    {har_dir}/browser/*.pdf ...                 # HAR 引用的回應內容
+    {har_dir}/http.har                          # httpx 請求（回應內容以 base64 內嵌）
+
+限制: page.request（APIRequestContext）不經過 context 路由，重播時無法攔截；
+未安裝 httpx 時的 wget 備用路徑也不在錄製範圍內。因此重播時 BaseBankDownloader 不使用
+這兩條備用路徑，HAR 中找不到的 PDF 直接回報失敗，不會連網。
+
+需要安裝：
+- playwright: pip install playwright
+- httpx: pip install httpx（HTTP 快速路徑）
+"""
+import base64
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    httpx = None
+    HAS_HTTPX = False
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext
+
+
+RECORD = "record"
+REPLAY = "replay"
+
+# 重播時 HAR 中找不到的請求回應此狀態碼（讓快速路徑改走瀏覽器，而不是觸發重試）
+REPLAY_MISS_STATUS = 404
+
+
+class HarArchive:
+    """
+    一次錄製的 HAR 目錄
+
+    使用方式:
+        archive = HarArchive("tests/har/114Q1", RECORD)
+        await archive.install(context, "31_114Q1")     # 瀏覽器
+        engine = HttpEngine(transport_factory=archive.http_transport)
+        ...
+        archive.save()                                 # 寫出 http.har
+    """
+
+    def __init__(self, har_dir: str, mode: str = REPLAY):
+        """
+        Args:
+            har_dir: HAR 目錄
+            mode: record（錄製，連網）或 replay（重播，離線）
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"無效的 HAR 模式: {mode}")
+        self.har_dir = Path(har_dir)
+        self.mode = mode
+        self.browser_dir = self.har_dir / "browser"
+        self.http_path = self.har_dir / "http.har"
+        self.misses = 0  # 重播時 HAR 中找不到的 HTTP 請求數
+        self._http_entries: List[dict] = []
+        self._http_index: Dict[Tuple[str, str], dict] = {}
+        if mode == RECORD:
+            self.browser_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            self._load_http()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    def browser_har_path(self, name: str) -> Path:
+        """瀏覽器 HAR 檔案路徑"""
+        return self.browser_dir / f"{name}.har"
+
+    async def install(self, context: "BrowserContext", name: str):
+        """
+        在 BrowserContext 上安裝錄製或重播
+
+        需在其他路由規則之前安裝：後安裝的規則先執行，節流與攔截規則 fallback 後才由 HAR 回應。
+
+        Args:
+            context: 瀏覽器 context
+            name: HAR 名稱（例如 31_114Q1）
+        """
+        path = self.browser_har_path(name)
+        if self.recording:
+            # context 關閉時寫出 HAR；同名檔案以最後一次嘗試為準
+            await context.route_from_har(
+                str(path), update=True, update_content="attach", update_mode="minimal"
+            )
+        elif path.exists():
+            await context.route_from_har(str(path), not_found="abort")
+        else:
+            # 沒有錄製過：一律中止，確保重播時不會連網
+            await context.route("**/*", lambda route: route.abort())
+
+    # ------------------------------------------------------------
+    # HTTP（httpx）
+    # ------------------------------------------------------------
+
+    def http_transport(self, verify: bool = True, limits: Optional["httpx.Limits"] = None):
+        """
+        建立 httpx transport（供 HttpEngine 使用）
+
+        Args:
+            verify: 是否驗證 SSL 憑證（只影響錄製時的實際連線）
+            limits: 連線池上限（只影響錄製時的實際連線）
+        """
+        if self.recording:
+            inner = httpx.AsyncHTTPTransport(verify=verify, limits=limits or httpx.Limits())
+            return _RecordingTransport(self, inner)
+        return _ReplayTransport(self)
+
+    def _load_http(self):
+        if not self.http_path.is_file():
+            return
+        try:
+            log = json.loads(self.http_path.read_text(encoding="utf-8"))["log"]
+        except (OSError, ValueError, KeyError):
+            return
+        for entry in log.get("entries", []):
+            request = entry.get("request", {})
+            # 同一網址有多筆時以最後一筆為準
+            self._http_index[(request.get("method", "GET"), request.get("url", ""))] = entry
+
+    def _record_http(self, request: "httpx.Request", response: "httpx.Response", body: bytes):
+        self._http_entries.append({
+            "request": {
+                "method": request.method,
+                "url": str(request.url),
+                "headers": [{"name": k, "value": v} for k, v in request.headers.items()],
+            },
+            "response": {
+                "status": response.status_code,
+                "headers": [{"name": k, "value": v} for k, v in response.headers.items()],
+                "content": {
+                    "size": len(body),
+                    "mimeType": response.headers.get("content-type", ""),
+                    "encoding": "base64",
+                    "text": base64.b64encode(body).decode("ascii"),
+                },
+            },
+        })
+
+    def _replay_http(self, request: "httpx.Request") -> "httpx.Response":
+        entry = self._http_index.get((request.method, str(request.url)))
+        if entry is None:
+            self.misses += 1
+            return httpx.Response(
+                REPLAY_MISS_STATUS, headers={"x-replay-miss": "1"}, content=b"", request=request
+            )
+        response = entry["response"]
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = [(h["name"], h["value"]) for h in response.get("headers", [])]
+        return httpx.Response(response["status"], headers=headers, content=body, request=request)
+
+    def save(self):
+        """寫出錄製的 HTTP 請求（重播模式不做事）"""
+        if not self.recording or not self._http_entries:
+            return
+        self.har_dir.mkdir(parents=True, exist_ok=True)
+        har = {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "bank-report-downloader", "version": "1"},
+                "entries": self._http_entries,
+            }
+        }
+        temp_path = self.http_path.with_name(self.http_path.name + ".part")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(har, f, ensure_ascii=False)
+        os.replace(temp_path, self.http_path)
+
+
+if HAS_HTTPX:
+
+    class _RecordingTransport(httpx.AsyncBaseTransport):
+        """實際連線，並將完整回應記錄到 HarArchive"""
+
+        def __init__(self, archive: HarArchive, inner: "httpx.AsyncBaseTransport"):
+            self.archive = archive
+            self.inner = inner
+
+        async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+            response = await self.inner.handle_async_request(request)
+            try:
+                body = b"".join([chunk async for chunk in response.stream])
+            finally:
+                await response.aclose()
+            self.archive._record_http(request, response, body)
+            return httpx.Response(
+                response.status_code, headers=response.headers, content=body, request=request
+            )
+
+        async def aclose(self):
+            await self.inner.aclose()
+
+    class _ReplayTransport(httpx.AsyncBaseTransport):
+        """由 HarArchive 回應，不連網"""
+
+        def __init__(self, archive: HarArchive):
+            self.archive = archive
+
+        async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+            return self.archive._replay_http(request)
@@ -0,0 +1,169 @@
+"""
+重試策略與斷路器（非同步版本）
+
+下載失敗先依原因分類，只有暫時性的失敗（逾時、5xx、連線中斷）才以
+帶隨機抖動的指數退避重試；選擇器找不到、內容不是 PDF 這類重試也不會好的失敗直接回報。
+每家銀行另有一個斷路器：網站連續暫時性失敗達門檻後暫停一段時間，
+避免整批下載在掛掉的網站上一再耗掉 60 秒逾時。
+"""
+import random
+import time
+from enum import Enum
+from typing import Optional
+
+
+class FailureKind(Enum):
+    """失敗原因分類"""
+    TIMEOUT = "timeout"                    # 導覽或請求逾時
+    SERVER_ERROR = "server_error"          # HTTP 5xx / 429
+    NETWORK = "network"                    # 連線失敗、連線中斷
+    NOT_PDF = "not_pdf"                    # 回應內容不是 PDF
+    SELECTOR_MISSING = "selector_missing"  # 等不到頁面元素（網站改版）
+    CIRCUIT_OPEN = "circuit_open"          # 斷路器開啟，未實際嘗試
+    UNKNOWN = "unknown"
+
+    @property
+    def transient(self) -> bool:
+        """是否為暫時性失敗（值得重試）"""
+        return self in (FailureKind.TIMEOUT, FailureKind.SERVER_ERROR, FailureKind.NETWORK)
+
+
+# 連線層錯誤的例外類別名稱（httpx / asyncio / 內建）
+_NETWORK_EXCEPTIONS = frozenset({
+    "NetworkError", "ConnectError", "ReadError", "WriteError",
+    "RemoteProtocolError", "ConnectionError", "IncompleteReadError",
+})
+
+# 等待元素逾時時 Playwright 錯誤訊息會包含的字樣
+_SELECTOR_HINTS = ("waiting for locator", "waiting for selector", "wait_for_selector")
+
+
+def failure_for_status(status_code: int) -> Optional[FailureKind]:
+    """依 HTTP 狀態碼分類，非錯誤狀態回傳 None"""
+    if status_code == 429 or status_code >= 500:
+        return FailureKind.SERVER_ERROR
+    return None
+
+
+def classify_message(message: str) -> FailureKind:
+    """依錯誤訊息分類（銀行模組自行攔截例外、只留下訊息時使用）"""
+    lowered = message.lower()
+    if any(hint in lowered for hint in _SELECTOR_HINTS):
+        return FailureKind.SELECTOR_MISSING
+    if "timeout" in lowered or "timed out" in lowered:
+        return FailureKind.TIMEOUT
+    if "net::err_" in lowered or "connection" in lowered:
+        return FailureKind.NETWORK
+    return FailureKind.UNKNOWN
+
+
+def classify_exception(exc: BaseException) -> FailureKind:
+    """
+    依例外分類失敗原因
+
+    以類別名稱判斷，不需要匯入 Playwright / httpx。
+    """
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    if names & {"TimeoutError", "TimeoutException"}:
+        # Playwright 的等待元素逾時與導覽逾時是同一個例外，以訊息區分
+        if any(hint in str(exc).lower() for hint in _SELECTOR_HINTS):
+            return FailureKind.SELECTOR_MISSING
+        return FailureKind.TIMEOUT
+    if names & _NETWORK_EXCEPTIONS:
+        return FailureKind.NETWORK
+    return classify_message(str(exc))
+
+
+class RetryPolicy:
+    """
+    指數退避重試策略（full jitter）
+
+    第 n 次重試前等待 random(0, min(max_delay, base_delay * 2^(n-1))) 秒。
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2.0, max_delay: float = 30.0):
+        """
+        Args:
+            max_attempts: 最多嘗試次數（含第一次）
+            base_delay: 第一次重試的退避上限秒數
+            max_delay: 退避秒數上限
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, kind: Optional[FailureKind], attempt: int) -> bool:
+        """
+        是否重試
+
+        Args:
+            kind: 失敗原因，None 表示未分類
+            attempt: 已嘗試次數（從 1 起算）
+        """
+        return kind is not None and kind.transient and attempt < self.max_attempts
+
+    def delay(self, attempt: int) -> float:
+        """第 attempt 次失敗後的等待秒數"""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    斷路器
+
+    - closed: 正常，連續 failure_threshold 次暫時性失敗後轉為 open
+    - open: 直接拒絕，reset_timeout 秒後轉為 half-open
+    - half-open: 放行一次試探，成功回到 closed，失敗重新 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300.0):
+        """
+        Args:
+            failure_threshold: 連續失敗幾次後開啟
+            reset_timeout: 開啟後多少秒允許試探
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """是否允許嘗試"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self):
+        """網站有正常回應（包含查無資料）"""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        """暫時性失敗"""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+    @property
+    def retry_after(self) -> float:
+        """距離允許試探的秒數"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
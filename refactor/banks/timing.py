@@ -0,0 +1,236 @@
+"""
+下載階段計時
+
+每次下載拆成以下階段，記錄耗時與傳輸量，用來找出一次執行的時間花在哪裡：
+
+    queue       等待瀏覽器名額（AIMD 並行控制或有頭通道）
+    launch      從瀏覽器池取得瀏覽器（需要時啟動新的瀏覽器）
+    context     建立 BrowserContext、安裝路由規則與開啟頁面
+    navigation  page.goto
+    resolve     找出 PDF 連結（瀏覽器內為 _download 扣除其他階段的時間；HTTP 快速路徑為 _resolve_direct_url）
+    wait        固定等待與條件式等待（pause、wait_for_*）
+    transfer    PDF 傳輸（HTTP 串流、page.request、瀏覽器下載存檔）
+    validate    檢查下載的檔案（大小、PDF 檔頭）
+    retry       重試的代價：退避等待與有頭模式重試的總時間（與上列階段重疊）
+    total       單次下載（BaseBankDownloader.download）的總時間
+
+輸出:
+    JSONL 執行紀錄: 每個階段一行，欄位同 Span
+    Prometheus textfile: 依銀行與階段彙總，供 node_exporter 的 textfile collector 讀取
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+PHASES = (
+    "queue", "launch", "context", "navigation", "resolve",
+    "wait", "transfer", "validate", "retry", "total",
+)
+
+# resolve 以 _download 總時間扣除這些階段推算（retry 與 total 不在 _download 內）
+_RESOLVE_EXCLUDES = frozenset(("launch", "context", "navigation", "wait", "transfer", "validate"))
+
+
+@dataclass
+class Span:
+    """一個階段的計時紀錄"""
+    bank_code: int
+    bank_name: str
+    phase: str
+    duration_ms: float
+    bytes: int = 0
+    year: int = 0
+    quarter: int = 0
+    attempt: int = 1                  # 第幾次嘗試（暫時性失敗重試時遞增）
+    headless: Optional[bool] = None   # 瀏覽器模式，不使用瀏覽器的階段為 None
+    ok: bool = True                   # 階段內是否發生例外
+    started_at: float = 0.0           # 開始時間（epoch 秒）
+
+
+@dataclass
+class SpanHandle:
+    """span() 產生的可寫入欄位（階段結束前設定傳輸量）"""
+    bytes: int = 0
+    ok: bool = True
+
+
+@dataclass
+class SpanRecorder:
+    """
+    階段計時紀錄
+
+    每個銀行下載器有自己的一份（labels 為目前下載的季度與嘗試次數），
+    BankDownloader 在下載結束後合併成整次執行的紀錄。
+
+    使用方式:
+        with recorder.span("transfer") as span:
+            ...
+            span.bytes = os.path.getsize(file_path)
+    """
+    bank_code: int = 0
+    bank_name: str = ""
+    spans: List[Span] = field(default_factory=list)
+    labels: Dict[str, object] = field(default_factory=dict)  # year, quarter, attempt, headless
+
+    @contextmanager
+    def span(self, phase: str, **labels) -> Iterator[SpanHandle]:
+        """
+        記錄一個階段（例外照常拋出，紀錄標記為失敗）
+
+        Args:
+            phase: 階段名稱（見 PHASES）
+            **labels: 覆寫本次紀錄的標籤，例如 headless=False
+        """
+        handle = SpanHandle()
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield handle
+        except BaseException:
+            handle.ok = False
+            raise
+        finally:
+            self.record(
+                phase, (time.perf_counter() - start) * 1000, handle.bytes,
+                ok=handle.ok, started_at=started_at, **labels,
+            )
+
+    def record(
+        self,
+        phase: str,
+        duration_ms: float,
+        bytes: int = 0,
+        ok: bool = True,
+        started_at: Optional[float] = None,
+        **labels,
+    ):
+        """直接加入一筆已量測好的紀錄"""
+        values = {**self.labels, **labels}
+        self.spans.append(Span(
+            bank_code=self.bank_code,
+            bank_name=self.bank_name,
+            phase=phase,
+            duration_ms=round(duration_ms, 3),
+            bytes=bytes,
+            year=values.get("year", 0),
+            quarter=values.get("quarter", 0),
+            attempt=values.get("attempt", 1),
+            headless=values.get("headless"),
+            ok=ok,
+            started_at=started_at if started_at is not None else time.time() - duration_ms / 1000,
+        ))
+
+    def mark(self) -> int:
+        """目前的紀錄位置（供 excluded_ms_since 計算區間內其他階段的時間）"""
+        return len(self.spans)
+
+    def excluded_ms_since(self, mark: int) -> float:
+        """mark 之後記錄的導覽、等待、傳輸等階段的總時間（推算 resolve 用）"""
+        return sum(s.duration_ms for s in self.spans[mark:] if s.phase in _RESOLVE_EXCLUDES)
+
+    def merge(self, other: "SpanRecorder"):
+        """合併另一份紀錄"""
+        self.spans.extend(other.spans)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    # ------------------------------------------------------------
+    # 彙總與輸出
+    # ------------------------------------------------------------
+
+    def totals(self) -> Dict[Tuple[int, str], Dict[str, Tuple[float, int, int]]]:
+        """
+        依銀行與階段彙總
+
+        Returns:
+            {(銀行代碼, 銀行名稱): {階段: (總毫秒, 次數, 總位元組)}}
+        """
+        result: Dict[Tuple[int, str], Dict[str, Tuple[float, int, int]]] = {}
+        for s in self.spans:
+            phases = result.setdefault((s.bank_code, s.bank_name), {})
+            ms, count, size = phases.get(s.phase, (0.0, 0, 0))
+            phases[s.phase] = (ms + s.duration_ms, count + 1, size + s.bytes)
+        return result
+
+    def format_table(self, limit: Optional[int] = None) -> str:
+        """
+        各銀行各階段的秒數表（依總時間排序，最慢的在前）
+
+        Args:
+            limit: 只列出最慢的幾家銀行，None 表示全部
+        """
+        totals = self.totals()
+        if not totals:
+            return ""
+
+        def seconds(phases: Dict[str, Tuple[float, int, int]], phase: str) -> float:
+            return phases.get(phase, (0.0, 0, 0))[0] / 1000
+
+        def bank_total(phases) -> float:
+            # 沒有 total 紀錄（例如多季度模式）時以各階段加總代替
+            if "total" in phases:
+                return seconds(phases, "total")
+            return sum(seconds(phases, p) for p in PHASES if p != "retry")
+
+        rows = sorted(totals.items(), key=lambda item: bank_total(item[1]), reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+
+        # 銀行名稱放在最後一欄，避免中文字寬度影響數字對齊
+        columns = [p for p in PHASES if p != "total"]
+        header = f"{'代碼':>4}{'total':>9}" + "".join(f"{p:>11}" for p in columns) + f"{'MB':>8}  銀行"
+        lines = [header]
+        for (code, name), phases in rows:
+            size = phases.get("transfer", (0.0, 0, 0))[2]
+            line = f"{code:>6}{bank_total(phases):>9.1f}"
+            line += "".join(f"{seconds(phases, p):>11.1f}" for p in columns)
+            lines.append(line + f"{size / 1024 / 1024:>8.1f}  {name}")
+        return "\n".join(lines)
+
+    def write_jsonl(self, path: str):
+        """將所有紀錄附加到 JSONL 檔案（每個階段一行）"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for s in self.spans:
+                f.write(json.dumps(asdict(s), ensure_ascii=False) + "\n")
+
+    def write_prometheus(self, path: str):
+        """
+        寫出 Prometheus textfile（原子改名，避免 collector 讀到寫一半的檔案）
+
+        指標為最近一次執行的彙總（gauge），標籤為 bank_code、bank、phase。
+        """
+        metrics = (
+            ("bank_download_phase_seconds", "各階段耗時合計（秒）", lambda ms, count, size: ms / 1000),
+            ("bank_download_phase_spans", "各階段紀錄次數", lambda ms, count, size: count),
+            ("bank_download_phase_bytes", "各階段傳輸位元組", lambda ms, count, size: size),
+        )
+        totals = self.totals()
+        lines: List[str] = []
+        for name, help_text, value in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for (code, bank), phases in sorted(totals.items()):
+                for phase, stats in phases.items():
+                    labels = f'bank_code="{code}",bank="{_escape_label(bank)}",phase="{phase}"'
+                    lines.append(f"{name}{{{labels}}} {value(*stats):g}")
+        lines.append("# HELP bank_download_last_run_timestamp_seconds 最近一次執行的結束時間")
+        lines.append("# TYPE bank_download_last_run_timestamp_seconds gauge")
+        lines.append(f"bank_download_last_run_timestamp_seconds {time.time():.0f}")
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        temp_path = f"{path}.part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
+
+
+def _escape_label(value: str) -> str:
+    """Prometheus 標籤值跳脫（反斜線、雙引號、換行）"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
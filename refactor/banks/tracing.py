@@ -0,0 +1,80 @@
+"""
+失敗時才保存的 Playwright trace
+
+每個瀏覽器 context 開啟時就開始錄製 trace（DOM 快照、網路請求、console），
+下載成功時直接丟棄；只有結果為 ERROR 或 NO_DATA 時才寫出 zip，
+失敗當下的頁面狀態不必重新開瀏覽器重現。
+
+每次嘗試都是新的 context，trace 只涵蓋該次嘗試；同一次下載的多次嘗試中，
+最後成功時先前失敗嘗試的 trace 也一併刪除。
+
+檢視:
+    playwright show-trace logs/traces/20250101/31_114Q1_a1_headless_093000.zip
+"""
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext
+
+
+class FailureTracer:
+    """
+    失敗時才保存的 trace
+
+    使用方式:
+        tracer = FailureTracer("logs/traces")
+        await tracer.arm(context, "31_114Q1")
+        ...
+        path = await tracer.disarm(context, "31_114Q1_a1_headless", keep=failed)
+    """
+
+    def __init__(self, trace_dir: str, screenshots: bool = False):
+        """
+        Args:
+            trace_dir: trace 存放目錄（依日期分資料夾）
+            screenshots: 是否連同畫面截圖一起錄製（較耗資源；DOM 快照已足以重現多數問題）
+        """
+        self.trace_dir = Path(trace_dir)
+        self.screenshots = screenshots
+        self.saved = 0
+
+    async def arm(self, context: "BrowserContext", title: str = ""):
+        """開始錄製（失敗不影響下載）"""
+        try:
+            await context.tracing.start(
+                name=title or None,
+                title=title or None,
+                screenshots=self.screenshots,
+                snapshots=True,
+                sources=False,
+            )
+        except Exception:
+            pass
+
+    async def disarm(self, context: "BrowserContext", name: str, keep: bool) -> Optional[str]:
+        """
+        停止錄製
+
+        Args:
+            context: 開始錄製的 context（需在關閉前呼叫）
+            name: 檔名（不含副檔名與時間）
+            keep: 是否保存；False 時直接丟棄
+
+        Returns:
+            保存的 zip 路徑，未保存時為 None
+        """
+        path = None
+        if keep:
+            day_dir = self.trace_dir / time.strftime("%Y%m%d")
+            day_dir.mkdir(parents=True, exist_ok=True)
+            path = day_dir / f"{name}_{time.strftime('%H%M%S')}.zip"
+        try:
+            await context.tracing.stop(path=str(path) if path else None)
+        except Exception:
+            return None
+        if path is None:
+            return None
+        self.saved += 1
+        return str(path)
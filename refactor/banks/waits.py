@@ -0,0 +1,78 @@
+"""
+等待時間統計與條件式等待工具
+
+取代固定秒數的 wait_for_timeout：條件成立就繼續，逾時上限沿用原本的秒數，
+因此最差情況與原本相同，多數情況會提早結束。
+每家銀行記錄固定等待與條件等待各花了多少時間，方便找出還能優化的地方。
+"""
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+# 在頁面內以 MutationObserver 等待 DOM 在 quiet_ms 內沒有變動；
+# 最多等待 timeout_ms，回傳是否真的達到穩定
+DOM_STABLE_JS = """
+([quietMs, timeoutMs]) => new Promise((resolve) => {
+    let quietTimer = null;
+    const finish = (stable) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        resolve(stable);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    observer.observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true,
+    });
+    quietTimer = setTimeout(() => finish(true), quietMs);
+    const hardTimer = setTimeout(() => finish(false), timeoutMs);
+})
+"""
+
+
+@dataclass
+class WaitStats:
+    """等待時間統計（毫秒）"""
+    fixed_ms: float = 0.0          # 固定秒數等待
+    condition_ms: float = 0.0      # 條件式等待
+    fixed_count: int = 0
+    condition_count: int = 0
+    timeouts: int = 0              # 條件未成立、等到上限的次數
+    by_kind: Dict[str, float] = field(default_factory=dict)
+
+    def record_fixed(self, elapsed_ms: float):
+        """記錄一次固定等待"""
+        self.fixed_ms += elapsed_ms
+        self.fixed_count += 1
+
+    def record_condition(self, kind: str, elapsed_ms: float, satisfied: bool):
+        """記錄一次條件式等待"""
+        self.condition_ms += elapsed_ms
+        self.condition_count += 1
+        self.by_kind[kind] = self.by_kind.get(kind, 0.0) + elapsed_ms
+        if not satisfied:
+            self.timeouts += 1
+
+    def merge(self, other: "WaitStats"):
+        """合併另一份統計"""
+        self.fixed_ms += other.fixed_ms
+        self.condition_ms += other.condition_ms
+        self.fixed_count += other.fixed_count
+        self.condition_count += other.condition_count
+        self.timeouts += other.timeouts
+        for kind, ms in other.by_kind.items():
+            self.by_kind[kind] = self.by_kind.get(kind, 0.0) + ms
+
+    @property
+    def total_ms(self) -> float:
+        return self.fixed_ms + self.condition_ms
+
+    def summary(self) -> str:
+        """統計摘要文字"""
+        return (
+            f"固定等待 {self.fixed_ms / 1000:.1f}s ({self.fixed_count} 次), "
+            f"條件等待 {self.condition_ms / 1000:.1f}s ({self.condition_count} 次, 逾時 {self.timeouts})"
+        )
@@ -23,7 +23,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from downloader import BankDownloader, BANK_CODES, BANK_DOWNLOADERS
 from banks.base import DownloadStatus
-from report_generator import generate_report
+from utils.ledger import Ledger
 
 
 # ============================================================
@@ -256,8 +256,16 @@ def download_single_bank(year: int, quarter: int) -> bool:
     logger.info(f"開始下載: {bank_name} {year}Q{quarter}")
     
     try:
-        downloader = BankDownloader(data_dir=str(get_data_dir()))
+        ledger = Ledger.for_data_dir(str(get_data_dir()))
+        downloader = BankDownloader(data_dir=str(get_data_dir()), ledger=ledger)
+        run_id = ledger.start_run("cli", {
+            "mode": "quarter", "quarters": [[year, quarter]],
+            "bank_codes": [code for code, name in BANK_CODES.items() if name == bank_name],
+            "download": True, "report": False,
+        })
+        downloader.use_run(run_id)
         result = asyncio.run(downloader.download(bank_name, year, quarter))
+        ledger.finish_run(run_id)
         
         if result.status == DownloadStatus.SUCCESS:
             print_success(f"下載成功: {result.file_path}")
@@ -332,9 +340,10 @@ async def _download_all_banks_async(
                     fail_count += 1
                     failed_banks.append(bank_name)
     
-    # 建立所有下載任務並並行執行
-    tasks = [download_one(bank_name) for bank_name in BANK_DOWNLOADERS.keys()]
-    await asyncio.gather(*tasks)
+    # 建立所有下載任務並並行執行（共用同一個瀏覽器池）
+    async with downloader.session():
+        tasks = [download_one(bank_name) for bank_name in BANK_DOWNLOADERS.keys()]
+        await asyncio.gather(*tasks)
     
     return success_count, fail_count, failed_banks
 
@@ -355,12 +364,32 @@ def download_all_banks(year: int, quarter: int, max_concurrent: int = 5) -> Tupl
     logger.info(f"開始批次下載: {year}Q{quarter}, 並行數: {max_concurrent}")
     print("-" * 50)
     
-    downloader = BankDownloader(data_dir=str(get_data_dir()))
+    ledger = Ledger.for_data_dir(str(get_data_dir()))
+    downloader = BankDownloader(data_dir=str(get_data_dir()), ledger=ledger)
+    
+    # 同一季度的全部下載上次中斷時，可略過已完成的銀行繼續
+    run = ledger.last_unfinished_run()
+    if (
+        run is not None
+        and run.scope.get("quarters") == [[year, quarter]]
+        and run.scope.get("bank_codes") is None
+        and get_input(f"上一次下載（{run.started_at}）未完成，是否繼續？(Y/n)：").lower() != "n"
+    ):
+        run_id = run.id
+        downloader.use_run(run_id, resume=True)
+        logger.info(f"繼續執行: #{run_id}")
+    else:
+        run_id = ledger.start_run("cli", {
+            "mode": "quarter", "quarters": [[year, quarter]], "bank_codes": None,
+            "download": True, "report": False,
+        })
+        downloader.use_run(run_id)
     
     # 使用非同步函數執行並行下載
     success_count, fail_count, failed_banks = asyncio.run(
         _download_all_banks_async(downloader, year, quarter, max_concurrent)
     )
+    ledger.finish_run(run_id)
     
     print("-" * 50)
     print_info(f"下載完成！成功: {success_count}, 失敗: {fail_count}")
@@ -371,6 +400,7 @@ def download_all_banks(year: int, quarter: int, max_concurrent: int = 5) -> Tupl
         for bank in failed_banks:
             print(f"  - {bank}")
         logger.warning(f"下載失敗的銀行: {failed_banks}")
+        print_info(f"需要失敗當下的頁面狀態時，以 python main.py {year}Q{quarter} --trace 重新下載")
     
     return success_count, fail_count
 
@@ -448,7 +478,10 @@ def handle_report():
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / f"{year_quarter_str}_資產品質報表.xlsx"
     
-    df = generate_report(str(source_dir), str(output_path), year_quarter_str)
+    # 延遲匯入：pandas / pdfplumber 只在產生報表時載入
+    from report_generator import generate_report
+    
+    df = generate_report(str(source_dir), str(output_path), year_quarter_str, use_processes=True)
     
     if df is not None and not df.empty:
         print("-" * 50)
@@ -2,9 +2,12 @@
 核心模組
 
 包含下載器和報表生成器的核心邏輯。
+
+資料模型直接匯入；管理器與 OCR 解析器在第一次存取時才載入
+（ReportManager 需要 pandas / pdfplumber，OCR 需要 pytesseract 等可選套件）。
 """
-from .download_manager import DownloadManager
-from .report_manager import ReportManager
+import importlib
+
 from .models import (
     DownloadStatus,
     DownloadResult,
@@ -14,14 +17,37 @@ from .models import (
     ParseStatus,
 )
 
-# OCR 解析器（可選）
-try:
-    from .ocr_parser import OCRParser, is_scanned_pdf
-    HAS_OCR = True
-except ImportError:
-    HAS_OCR = False
-    OCRParser = None
-    is_scanned_pdf = None
+# 延遲載入的名稱: (模組, 屬性)
+_LAZY_ATTRS = {
+    'DownloadManager': ('.download_manager', 'DownloadManager'),
+    'ReportManager': ('.report_manager', 'ReportManager'),
+}
+
+
+def _load_ocr():
+    """載入 OCR 解析器（可選），回傳是否可用"""
+    try:
+        module = importlib.import_module('.ocr_parser', __name__)
+    except ImportError:
+        globals().update(OCRParser=None, is_scanned_pdf=None, HAS_OCR=False)
+        return False
+    globals().update(
+        OCRParser=module.OCRParser, is_scanned_pdf=module.is_scanned_pdf, HAS_OCR=True
+    )
+    return True
+
+
+def __getattr__(name: str):
+    if name in ('HAS_OCR', 'OCRParser', 'is_scanned_pdf'):
+        _load_ocr()
+        return globals()[name]
+    if name in _LAZY_ATTRS:
+        module_name, attr = _LAZY_ATTRS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'DownloadManager',
@@ -1,49 +1,76 @@
 """
-下載管理器
+下載管理器（非同步版本）
 
 統一管理所有銀行財報的下載邏輯。
+實際下載交給 downloader.BankDownloader，與命令列共用瀏覽器池、HTTP 連線池、
+主機速率限制、重試與斷路器；非同步程式直接 await，一般程式使用 *_sync 包裝。
 """
-import os
+import asyncio
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Type, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, Callable, Dict, List, Optional, Type
 
 from .models import DownloadStatus, DownloadResult, BankInfo
 
 
+_REFACTOR_DIR = Path(__file__).resolve().parent.parent
+
+
+def _load_bank_downloader():
+    """
+    載入 downloader 模組（銀行模組由 banks.registry 延遲匯入）
+    
+    與 main.py / cli.py 使用相同的匯入路徑（banks.*），確保登錄表只有一份。
+    """
+    if str(_REFACTOR_DIR) not in sys.path:
+        sys.path.insert(0, str(_REFACTOR_DIR))
+    import downloader
+    return downloader
+
+
 class DownloadManager:
     """
     下載管理器
     
     負責：
-    1. 管理所有銀行下載器的註冊與調用
-    2. 提供單一/批次下載功能
+    1. 管理所有銀行下載器的註冊與調用（BaseBankDownloader 子類別定義時自動登錄）
+    2. 提供單一/批次下載功能（非同步，批次下載依完成順序逐一產出結果）
     3. 管理下載結果與統計
     
     使用方式:
         manager = DownloadManager(data_dir='data')
         
-        # 下載單一銀行
-        result = manager.download('玉山商業銀行', 114, 1)
+        # 非同步
+        result = await manager.download('玉山商業銀行', 114, 1)
+        async for result in manager.download_all(114, 1):
+            print(result.bank_name, result.status)
         
-        # 下載所有銀行
-        results = manager.download_all(114, 1)
+        # 同步
+        result = manager.download_sync('玉山商業銀行', 114, 1)
+        results = manager.download_all_sync(114, 1)
     """
     
     # 類別變數：儲存已註冊的下載器
     _downloaders: Dict[str, Type] = {}
     _bank_codes: Dict[int, str] = {}
     _bank_info: Dict[str, BankInfo] = {}
+    _autoloaded: bool = False
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", max_concurrent: int = 5, **downloader_options):
         """
         初始化下載管理器
         
         Args:
             data_dir: 資料存放目錄
+            max_concurrent: 批次下載時無頭瀏覽器的並行上限
+            **downloader_options: 傳給 BankDownloader 的其他參數
+                （block_resources、headed_concurrent、max_attempts、ledger 等）
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.max_concurrent = max_concurrent
+        self.downloader_options = downloader_options
+        self._bank_downloader = None
     
     @classmethod
     def register(cls, bank_name: str, bank_code: int, downloader_class: Type):
@@ -63,24 +90,43 @@ class DownloadManager:
             url=getattr(downloader_class, 'bank_url', ''),
         )
     
+    @classmethod
+    def _ensure_registered(cls):
+        """第一次使用時匯入所有銀行模組，並註冊自動登錄的下載器（含登錄表以外的子類別）"""
+        if DownloadManager._autoloaded:
+            return
+        _load_bank_downloader()
+        from banks.base import BaseBankDownloader
+        from banks.registry import load_all
+        load_all()
+        for bank_name, downloader_class in BaseBankDownloader.registered().items():
+            if bank_name not in cls._downloaders:  # 手動註冊的優先
+                cls.register(bank_name, downloader_class.bank_code, downloader_class)
+        # 匯入失敗時不設旗標，下次使用時重新載入
+        DownloadManager._autoloaded = True
+    
     @classmethod
     def get_supported_banks(cls) -> List[str]:
         """取得所有支援的銀行名稱"""
+        cls._ensure_registered()
         return list(cls._downloaders.keys())
     
     @classmethod
     def get_bank_codes(cls) -> Dict[int, str]:
         """取得銀行代碼對照表"""
+        cls._ensure_registered()
         return cls._bank_codes.copy()
     
     @classmethod
     def get_bank_info(cls, bank_name: str) -> Optional[BankInfo]:
         """取得銀行資訊"""
+        cls._ensure_registered()
         return cls._bank_info.get(bank_name)
     
     @classmethod
     def get_bank_by_code(cls, code: int) -> Optional[str]:
         """依代碼取得銀行名稱"""
+        cls._ensure_registered()
         return cls._bank_codes.get(code)
     
     def get_file_path(self, bank_code: int, bank_name: str, year: int, quarter: int) -> Path:
@@ -91,59 +137,47 @@ class DownloadManager:
         """檢查檔案是否存在"""
         return self.get_file_path(bank_code, bank_name, year, quarter).exists()
     
-    def download(self, bank_name: str, year: int, quarter: int) -> DownloadResult:
-        """
-        下載指定銀行的財報
-        
-        Args:
-            bank_name: 銀行名稱
-            year: 民國年
-            quarter: 季度 (1-4)
-            
-        Returns:
-            DownloadResult: 下載結果
-        """
-        # 檢查是否支援
-        if bank_name not in self._downloaders:
-            return DownloadResult(
-                status=DownloadStatus.NOT_SUPPORTED,
-                message=f"不支援的銀行: {bank_name}",
-                bank_name=bank_name,
-                year=year,
-                quarter=quarter,
+    @property
+    def bank_downloader(self):
+        """共用的 BankDownloader（延遲建立，跨多次下載共用斷路器與網址快取）"""
+        if self._bank_downloader is None:
+            module = _load_bank_downloader()
+            self._bank_downloader = module.BankDownloader(
+                data_dir=str(self.data_dir), **self.downloader_options
             )
-        
-        # 取得銀行資訊
+        return self._bank_downloader
+    
+    def _not_supported(self, bank_name: str, year: int, quarter: int) -> DownloadResult:
+        return DownloadResult(
+            status=DownloadStatus.NOT_SUPPORTED,
+            message=f"不支援的銀行: {bank_name}",
+            bank_name=bank_name,
+            year=year,
+            quarter=quarter,
+        )
+    
+    async def _download_one(
+        self, bank_name: str, year: int, quarter: int, revalidate: bool = False
+    ) -> DownloadResult:
+        """下載並轉換為 core.models.DownloadResult（例外轉為 ERROR 結果）"""
         bank_info = self._bank_info.get(bank_name)
         bank_code = bank_info.code if bank_info else 0
-        
-        # 檢查檔案是否已存在
-        file_path = self.get_file_path(bank_code, bank_name, year, quarter)
-        if file_path.exists():
+        try:
+            # 傳入註冊的類別：手動註冊或登錄表以外的子類別也以此類別下載
+            result = await self.bank_downloader.download(
+                bank_name, year, quarter,
+                revalidate=revalidate,
+                downloader_class=self._downloaders.get(bank_name),
+            )
             return DownloadResult(
-                status=DownloadStatus.ALREADY_EXISTS,
-                message="檔案已存在",
-                file_path=str(file_path),
+                status=DownloadStatus[result.status.name],
+                message=result.message,
+                file_path=result.file_path,
                 bank_code=bank_code,
                 bank_name=bank_name,
                 year=year,
                 quarter=quarter,
             )
-        
-        # 建立下載器並執行下載
-        try:
-            downloader_class = self._downloaders[bank_name]
-            downloader = downloader_class(data_dir=str(self.data_dir))
-            result = downloader.download(year, quarter)
-            
-            # 補充銀行資訊
-            result.bank_code = bank_code
-            result.bank_name = bank_name
-            result.year = year
-            result.quarter = quarter
-            
-            return result
-            
         except Exception as e:
             return DownloadResult(
                 status=DownloadStatus.ERROR,
@@ -154,9 +188,29 @@ class DownloadManager:
                 quarter=quarter,
             )
     
-    def download_by_code(self, bank_code: int, year: int, quarter: int) -> DownloadResult:
-        """依銀行代碼下載"""
-        bank_name = self._bank_codes.get(bank_code)
+    async def download(self, bank_name: str, year: int, quarter: int, revalidate: bool = False) -> DownloadResult:
+        """
+        下載指定銀行的財報（非同步）
+        
+        Args:
+            bank_name: 銀行名稱
+            year: 民國年
+            quarter: 季度 (1-4)
+            revalidate: 檔案已存在時，是否以條件式請求檢查來源是否更新
+            
+        Returns:
+            DownloadResult: 下載結果
+        """
+        self._ensure_registered()
+        if bank_name not in self._downloaders:
+            return self._not_supported(bank_name, year, quarter)
+        
+        async with self.bank_downloader.session():
+            return await self._download_one(bank_name, year, quarter, revalidate)
+    
+    async def download_by_code(self, bank_code: int, year: int, quarter: int) -> DownloadResult:
+        """依銀行代碼下載（非同步）"""
+        bank_name = self.get_bank_by_code(bank_code)
         if not bank_name:
             return DownloadResult(
                 status=DownloadStatus.NOT_SUPPORTED,
@@ -165,52 +219,109 @@ class DownloadManager:
                 year=year,
                 quarter=quarter,
             )
-        return self.download(bank_name, year, quarter)
+        return await self.download(bank_name, year, quarter)
+    
+    async def download_all(
+        self,
+        year: int,
+        quarter: int,
+        bank_names: Optional[List[str]] = None,
+        max_concurrent: Optional[int] = None,
+        revalidate: bool = False,
+    ) -> AsyncIterator[DownloadResult]:
+        """
+        並行下載多家銀行的財報，依完成順序逐一產出結果
+        
+        所有下載共用同一個 session（瀏覽器池、HTTP 連線池、主機速率限制），
+        並行數由 AIMD 控制在 max_concurrent 以內。提前結束迭代時會取消尚未完成的下載。
+        
+        Args:
+            year: 民國年
+            quarter: 季度 (1-4)
+            bank_names: 銀行名稱列表，None 表示所有銀行
+            max_concurrent: 無頭瀏覽器的並行上限，None 表示使用建構時的設定
+            revalidate: 檔案已存在時，是否檢查來源是否更新
+            
+        Yields:
+            DownloadResult: 下載結果
+        """
+        self._ensure_registered()
+        if bank_names is None:
+            bank_names = list(self._downloaders.keys())
+        
+        for bank_name in bank_names:
+            if bank_name not in self._downloaders:
+                yield self._not_supported(bank_name, year, quarter)
+        bank_names = [name for name in bank_names if name in self._downloaders]
+        
+        from banks.rate_limit import AdaptiveLimiter
+        
+        downloader = self.bank_downloader
+        owns_limiter = downloader.browser_limiter is None
+        if owns_limiter:
+            downloader.browser_limiter = AdaptiveLimiter(max_limit=max_concurrent or self.max_concurrent)
+        try:
+            async with downloader.session():
+                downloader.throttle.limiter = downloader.browser_limiter
+                tasks = [
+                    asyncio.ensure_future(self._download_one(name, year, quarter, revalidate))
+                    for name in bank_names
+                ]
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        yield await next_done
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            if owns_limiter:
+                downloader.browser_limiter = None
     
-    def download_all(
+    def download_sync(self, bank_name: str, year: int, quarter: int, revalidate: bool = False) -> DownloadResult:
+        """
+        下載指定銀行的財報（同步包裝，不可在執行中的事件迴圈內呼叫）
+        """
+        return asyncio.run(self.download(bank_name, year, quarter, revalidate=revalidate))
+    
+    def download_by_code_sync(self, bank_code: int, year: int, quarter: int) -> DownloadResult:
+        """依銀行代碼下載（同步包裝）"""
+        return asyncio.run(self.download_by_code(bank_code, year, quarter))
+    
+    def download_all_sync(
         self,
         year: int,
         quarter: int,
         progress_callback: Callable[[str, DownloadResult], None] = None,
-        max_workers: int = 1,
+        max_concurrent: Optional[int] = None,
+        bank_names: Optional[List[str]] = None,
+        revalidate: bool = False,
     ) -> Dict[str, DownloadResult]:
         """
-        下載所有銀行的財報
+        下載所有銀行的財報（同步包裝，不可在執行中的事件迴圈內呼叫）
         
         Args:
             year: 民國年
             quarter: 季度 (1-4)
-            progress_callback: 進度回調函數 (bank_name, result)
-            max_workers: 並行下載數（預設 1，即循序下載）
+            progress_callback: 進度回調函數 (bank_name, result)，依完成順序呼叫
+            max_concurrent: 無頭瀏覽器的並行上限，None 表示使用建構時的設定
+            bank_names: 銀行名稱列表，None 表示所有銀行
+            revalidate: 檔案已存在時，是否檢查來源是否更新
             
         Returns:
             Dict: 各銀行的下載結果
         """
-        results = {}
-        banks = list(self._downloaders.keys())
-        
-        if max_workers <= 1:
-            # 循序下載
-            for bank_name in banks:
-                result = self.download(bank_name, year, quarter)
-                results[bank_name] = result
+        async def collect() -> Dict[str, DownloadResult]:
+            results = {}
+            async for result in self.download_all(
+                year, quarter, bank_names=bank_names, max_concurrent=max_concurrent, revalidate=revalidate
+            ):
+                results[result.bank_name] = result
                 if progress_callback:
-                    progress_callback(bank_name, result)
-        else:
-            # 並行下載
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {
-                    executor.submit(self.download, bank_name, year, quarter): bank_name
-                    for bank_name in banks
-                }
-                for future in as_completed(futures):
-                    bank_name = futures[future]
-                    result = future.result()
-                    results[bank_name] = result
-                    if progress_callback:
-                        progress_callback(bank_name, result)
-        
-        return results
+                    progress_callback(result.bank_name, result)
+            return results
+        
+        return asyncio.run(collect())
     
     def get_download_summary(self, results: Dict[str, DownloadResult]) -> dict:
         """
@@ -2,8 +2,11 @@
 報表管理器
 
 統一管理 PDF 解析與報表生成邏輯。
+安裝 PyMuPDF 時先以關鍵字預篩頁面，pdfplumber 只分析候選頁面。
 """
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Callable
 import warnings
@@ -11,6 +14,7 @@ import warnings
 import pandas as pd
 import pdfplumber
 
+from ..utils.pdf_text import candidate_pages
 from .models import (
     ParseStatus,
     ParseResult,
@@ -86,16 +90,25 @@ class ReportManager:
         except ValueError:
             return 0.0
     
-    def find_asset_quality_pages(self, pdf: pdfplumber.PDF) -> List[tuple]:
+    def find_asset_quality_pages(
+        self, pdf: pdfplumber.PDF, page_numbers: Optional[List[int]] = None
+    ) -> List[tuple]:
         """
         找出包含「資產品質」的頁面
         
+        Args:
+            pdf: pdfplumber PDF 物件
+            page_numbers: 只檢查這些頁面（預篩結果，從 0 開始），None 表示逐頁檢查
+        
         Returns:
             List of (page, has_table) tuples
         """
         candidates = []
+        if page_numbers is None:
+            page_numbers = range(len(pdf.pages))
         
-        for i, page in enumerate(pdf.pages):
+        for i in page_numbers:
+            page = pdf.pages[i]
             text = page.extract_text() or ""
             
             # 檢查是否包含資產品質相關關鍵字
@@ -215,10 +228,15 @@ class ReportManager:
         
         year, quarter = self.extract_year_quarter_from_filename(path.name)
         
+        # 預篩候選頁面，無法預篩或沒有候選頁時逐頁掃描
+        page_numbers = candidate_pages(pdf_path) or None
+        
         try:
             with pdfplumber.open(pdf_path) as pdf:
                 # 找到資產品質頁面
-                pages_info = self.find_asset_quality_pages(pdf)
+                pages_info = self.find_asset_quality_pages(pdf, page_numbers)
+                if not pages_info and page_numbers is not None:
+                    pages_info = self.find_asset_quality_pages(pdf)
                 
                 if not pages_info:
                     return ParseResult(
@@ -284,15 +302,21 @@ class ReportManager:
         output_path: str,
         year_quarter: str = None,
         progress_callback: Callable[[str, ParseResult], None] = None,
+        workers: Optional[int] = 1,
     ) -> Optional[pd.DataFrame]:
         """
         生成資產品質報表
         
+        預設在目前行程逐一解析。workers 大於 1（或 None）時改以 spawn 行程池並行
+        （pdfplumber 吃 CPU，執行緒會被 GIL 序列化）：子行程會重新匯入呼叫端的主程式，
+        呼叫端必須放在 if __name__ == "__main__": 之下。結果依檔名順序收回，進度回調與輸出順序固定。
+        
         Args:
             data_dir: PDF 資料目錄
             output_path: 輸出 Excel 檔案路徑
             year_quarter: 年度季度（如 114Q1）
             progress_callback: 進度回調函數
+            workers: 並行行程數（預設 1，在目前行程逐一解析；None 表示 CPU 核心數）
             
         Returns:
             DataFrame 或 None
@@ -315,23 +339,43 @@ class ReportManager:
         success_count = 0
         fail_count = 0
         
+        paths = [str(pdf_file) for pdf_file in pdf_files]
+        bank_names = []
         for pdf_file in pdf_files:
             # 從檔名取得銀行名稱
             parts = pdf_file.stem.split('_')
-            bank_name = parts[1] if len(parts) >= 2 else pdf_file.stem
-            
-            result = self.parse_pdf(str(pdf_file), bank_name)
-            
-            if progress_callback:
-                progress_callback(bank_name, result)
-            
-            if result.is_success or result.status == ParseStatus.PARTIAL:
-                all_rows.extend(result.rows)
-                success_count += 1
-                print(f"✓ {bank_name}: {result.category_count} 筆資料")
-            else:
-                fail_count += 1
-                print(f"✗ {bank_name}: {result.message}")
+            bank_names.append(parts[1] if len(parts) >= 2 else pdf_file.stem)
+        
+        workers = max(1, min(workers or os.cpu_count() or 1, len(pdf_files)))
+        executor = None
+        if workers == 1:
+            results = map(self.parse_pdf, paths, bank_names)
+        else:
+            # spawn：呼叫端可能仍有事件迴圈或瀏覽器的執行緒，fork 不安全
+            # 子行程以 _init_worker 建立一次報表管理器（含警告過濾），之後每個檔案直接解析
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            chunksize = max(1, len(paths) // (workers * 4))
+            results = executor.map(_parse_in_worker, paths, bank_names, chunksize=chunksize)
+        
+        try:
+            for bank_name, result in zip(bank_names, results):
+                if progress_callback:
+                    progress_callback(bank_name, result)
+                
+                if result.is_success or result.status == ParseStatus.PARTIAL:
+                    all_rows.extend(result.rows)
+                    success_count += 1
+                    print(f"✓ {bank_name}: {result.category_count} 筆資料")
+                else:
+                    fail_count += 1
+                    print(f"✗ {bank_name}: {result.message}")
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
         print("=" * 60)
         print(f"成功: {success_count}, 失敗: {fail_count}")
@@ -381,3 +425,18 @@ class ReportManager:
             summary['total_rows'] += result.category_count
         
         return summary
+
+
+# 子行程的報表管理器（_init_worker 建立，整個子行程重複使用）
+_worker_manager: Optional[ReportManager] = None
+
+
+def _init_worker():
+    """子行程初始化：建立報表管理器（同時在子行程套用 pdfplumber 的警告過濾）"""
+    global _worker_manager
+    _worker_manager = ReportManager()
+
+
+def _parse_in_worker(pdf_path: str, bank_name: str = "") -> ParseResult:
+    """子行程的工作函式"""
+    return _worker_manager.parse_pdf(pdf_path, bank_name)
@@ -5,8 +5,10 @@
 import os
 import sys
 import asyncio
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, Type, Optional, List
+from typing import AsyncIterator, Dict, Mapping, Type, Optional, List, Tuple
 from dataclasses import dataclass
 
 # 確保可以導入 banks 子模組
@@ -15,162 +17,182 @@ if str(_current_dir) not in sys.path:
     sys.path.insert(0, str(_current_dir))
 
 from banks.base import BaseBankDownloader, DownloadResult, DownloadStatus
+from banks.browser_pool import BrowserPool
+from banks.headed_lane import HeadedLane
+from banks.http_engine import HttpEngine
+from banks.link_cache import LinkCache
+from banks.registry import BANK_SPECS, LazyDownloaderMap
+from banks.replay import HarArchive
+from banks.rate_limit import AdaptiveLimiter, HostThrottle
+from banks.retry import CircuitBreaker, RetryPolicy
+from banks.route_policy import RouteStats
+from banks.timing import SpanRecorder
+from banks.tracing import FailureTracer
+from banks.waits import WaitStats
+from utils.blob_store import BlobStore
+from utils.ledger import STAGE_DOWNLOAD, TERMINAL_STATUSES, AttemptRecord, JobKey, Ledger
 
-# 導入所有銀行下載器
-from banks.bank_01_bot import BOTDownloader
-from banks.bank_02_landbank import LandBankDownloader
-from banks.bank_03_tcb import TCBBankDownloader
-from banks.bank_04_firstbank import FirstBankDownloader
-from banks.bank_05_hncb import HNCBDownloader
-from banks.bank_06_chb import CHBDownloader
-from banks.bank_07_scsb import SCSBDownloader
-from banks.bank_08_fubon import FubonDownloader
-from banks.bank_09_cathay import CathayDownloader
-from banks.bank_10_eximbank import EximBankDownloader
-from banks.bank_11_bok import BOKDownloader
-from banks.bank_12_megabank import MegaBankDownloader
-from banks.bank_13_citibank import CitibankDownloader
-from banks.bank_15_obank import OBankDownloader
-from banks.bank_16_tbb import TBBDownloader
-from banks.bank_17_scb import SCBDownloader
-from banks.bank_18_taichungbank import TaichungBankDownloader
-from banks.bank_19_ktb import KTBDownloader
-from banks.bank_20_hsbc import HSBCDownloader
-from banks.bank_21_taipeistarbank import TaipeiStarBankDownloader
-from banks.bank_22_hwataibank import HwataiBankDownloader
-from banks.bank_23_skbank import SKBankDownloader
-from banks.bank_24_sunnybank import SunnyBankDownloader
-from banks.bank_25_bop import BOPDownloader
-from banks.bank_26_cotabank import CotaBankDownloader
-from banks.bank_27_ubot import UBOTDownloader
-from banks.bank_28_feib import FEIBDownloader
-from banks.bank_29_yuantabank import YuantaBankDownloader
-from banks.bank_30_sinopac import SinoPacDownloader
-from banks.bank_31_esunbank import ESunBankDownloader
-from banks.bank_32_kgibank import KGIBankDownloader
-from banks.bank_33_dbs import DBSBankDownloader
-from banks.bank_34_taishinbank import TaishinBankDownloader
-from banks.bank_36_entiebank import EntieBankDownloader
-from banks.bank_37_ctbc import CTBCBankDownloader
-from banks.bank_38_rakutenbank import RakutenBankDownloader
-from banks.bank_40_linebank import LineBankDownloader
-from banks.bank_41_nextbank import NextBankDownloader
 
-
-# 銀行下載器對照表
-BANK_DOWNLOADERS: Dict[str, Type[BaseBankDownloader]] = {
-    "臺灣銀行": BOTDownloader,
-    "臺灣土地銀行": LandBankDownloader,
-    "合作金庫商業銀行": TCBBankDownloader,
-    "第一商業銀行": FirstBankDownloader,
-    "華南商業銀行": HNCBDownloader,
-    "彰化商業銀行": CHBDownloader,
-    "上海商業儲蓄銀行": SCSBDownloader,
-    "台北富邦銀行": FubonDownloader,
-    "國泰世華商業銀行": CathayDownloader,
-    "中國輸出入銀行": EximBankDownloader,
-    "高雄銀行": BOKDownloader,
-    "兆豐國際商業銀行": MegaBankDownloader,
-    "花旗（台灣）銀行": CitibankDownloader,
-    "王道商業銀行": OBankDownloader,
-    "臺灣中小企業銀行": TBBDownloader,
-    "渣打國際商業銀行": SCBDownloader,
-    "台中商業銀行": TaichungBankDownloader,
-    "京城商業銀行": KTBDownloader,
-    "匯豐(台灣)商業銀行": HSBCDownloader,
-    "瑞興商業銀行": TaipeiStarBankDownloader,
-    "華泰商業銀行": HwataiBankDownloader,
-    "臺灣新光商業銀行": SKBankDownloader,
-    "陽信商業銀行": SunnyBankDownloader,
-    "板信商業銀行": BOPDownloader,
-    "三信商業銀行": CotaBankDownloader,
-    "聯邦商業銀行": UBOTDownloader,
-    "遠東國際商業銀行": FEIBDownloader,
-    "元大商業銀行": YuantaBankDownloader,
-    "永豐商業銀行": SinoPacDownloader,
-    "玉山商業銀行": ESunBankDownloader,
-    "凱基商業銀行": KGIBankDownloader,
-    "星展(台灣)商業銀行": DBSBankDownloader,
-    "台新國際商業銀行": TaishinBankDownloader,
-    "安泰商業銀行": EntieBankDownloader,
-    "中國信託商業銀行": CTBCBankDownloader,
-    "樂天國際商業銀行": RakutenBankDownloader,
-    "連線商業銀行": LineBankDownloader,
-    "將來商業銀行": NextBankDownloader,
-}
+# 銀行下載器對照表（取值時才匯入該銀行模組與 Playwright）
+BANK_DOWNLOADERS: Mapping[str, Type[BaseBankDownloader]] = LazyDownloaderMap()
 
 # 銀行代碼對照表
-BANK_CODES: Dict[int, str] = {
-    1: "臺灣銀行",
-    2: "臺灣土地銀行",
-    3: "合作金庫商業銀行",
-    4: "第一商業銀行",
-    5: "華南商業銀行",
-    6: "彰化商業銀行",
-    7: "上海商業儲蓄銀行",
-    8: "台北富邦銀行",
-    9: "國泰世華商業銀行",
-    10: "中國輸出入銀行",
-    11: "高雄銀行",
-    12: "兆豐國際商業銀行",
-    13: "花旗（台灣）銀行",
-    15: "王道商業銀行",
-    16: "臺灣中小企業銀行",
-    17: "渣打國際商業銀行",
-    18: "台中商業銀行",
-    19: "京城商業銀行",
-    20: "匯豐(台灣)商業銀行",
-    21: "瑞興商業銀行",
-    22: "華泰商業銀行",
-    23: "臺灣新光商業銀行",
-    24: "陽信商業銀行",
-    25: "板信商業銀行",
-    26: "三信商業銀行",
-    27: "聯邦商業銀行",
-    28: "遠東國際商業銀行",
-    29: "元大商業銀行",
-    30: "永豐商業銀行",
-    31: "玉山商業銀行",
-    32: "凱基商業銀行",
-    33: "星展(台灣)商業銀行",
-    34: "台新國際商業銀行",
-    36: "安泰商業銀行",
-    37: "中國信託商業銀行",
-    38: "樂天國際商業銀行",
-    40: "連線商業銀行",
-    41: "將來商業銀行",
-}
+BANK_CODES: Dict[int, str] = {spec.code: spec.name for spec in BANK_SPECS}
+
+# 支援多季度模式（實作 _discover）的銀行
+HARVEST_BANKS: List[str] = [spec.name for spec in BANK_SPECS if spec.discovery]
 
 
 class BankDownloader:
     """銀行財報下載器（非同步版本）"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(
+        self,
+        data_dir: str = "data",
+        browser_max_uses: int = 20,
+        block_resources: bool = False,
+        headed_concurrent: int = 2,
+        max_attempts: int = 3,
+        ledger: Optional[Ledger] = None,
+        har_dir: Optional[str] = None,
+        har_mode: str = "replay",
+        trace_dir: Optional[str] = None,
+    ):
         """
         初始化下載器
         
         Args:
             data_dir: 資料存放目錄
+            browser_max_uses: 共用瀏覽器被租用幾次後回收重啟
+            block_resources: 是否攔截圖片、字型、影音與追蹤請求（各銀行仍可用 route_allow 放行）
+            headed_concurrent: 有頭瀏覽器通道的並行上限（與無頭工作的並行數分開計算）
+            max_attempts: 暫時性失敗（逾時、5xx、連線中斷）的最多嘗試次數
+            ledger: 執行紀錄資料庫（None 表示不記錄）
+            har_dir: HAR 目錄（離線計時與回歸測試用），None 表示正常連網
+            har_mode: record（連網並錄製到 har_dir）或 replay（由 har_dir 回應，不連網）
+            trace_dir: 失敗（ERROR / NO_DATA）時保存 Playwright trace 的目錄，None 表示不錄製
         """
         self.data_dir = data_dir
+        self.browser_max_uses = browser_max_uses
+        self.block_resources = block_resources
+        self.headed_concurrent = headed_concurrent
+        self.retry_policy = RetryPolicy(max_attempts=max_attempts)
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}  # 每家銀行一個，跨季度共用
+        self.browser_pool: Optional[BrowserPool] = None
+        self.http_engine: Optional[HttpEngine] = None
+        self.headed_lane: Optional[HeadedLane] = None
+        self.browser_limiter: Optional[AdaptiveLimiter] = None
+        self.throttle: Optional[HostThrottle] = None
+        self.route_stats: Dict[str, RouteStats] = {}
+        self.wait_stats: Dict[str, WaitStats] = {}
+        self.timings = SpanRecorder()  # 所有下載的階段計時
         os.makedirs(data_dir, exist_ok=True)
+        self.link_cache = LinkCache.for_data_dir(data_dir)
+        self.blob_store = BlobStore(data_dir)
+        self.ledger = ledger
+        self.har = HarArchive(har_dir, har_mode) if har_dir else None
+        self.tracer = FailureTracer(trace_dir) if trace_dir else None
+        self.traces: Dict[str, List[str]] = {}  # 各銀行失敗時保存的 trace
+        self.run_id: Optional[int] = None
+        self._resumed: Dict[JobKey, AttemptRecord] = {}  # 續跑時已有結果的工作
+    
+    def use_run(self, run_id: Optional[int], resume: bool = False):
+        """
+        之後的下載都記錄在指定的執行編號下
+        
+        Args:
+            run_id: 執行編號（由 Ledger.start_run 取得）
+            resume: 是否為續跑；續跑時該執行中已成功、已存在或查無資料的工作直接略過
+        """
+        self.run_id = run_id
+        self._resumed = {}
+        if resume and self.ledger is not None and run_id is not None:
+            self._resumed = {
+                key: attempt
+                for key, attempt in self.ledger.latest(STAGE_DOWNLOAD, run_id=run_id).items()
+                if attempt.status in TERMINAL_STATUSES
+            }
+    
+    @asynccontextmanager
+    async def session(self):
+        """
+        建立一次執行共用的資源（瀏覽器池、HTTP 連線池、有頭通道、主機節流器）
+        
+        在 session 內的所有下載共用同一個 Playwright driver 與暖機中的瀏覽器，
+        HTTP 快速路徑共用同一個連線池，有頭工作共用有頭通道（含虛擬顯示器），
+        同一主機的請求共用同一個速率上限；巢狀呼叫時沿用外層的 session。
+        
+        使用方式:
+            async with downloader.session():
+                await downloader.download("玉山商業銀行", 114, 1)
+        """
+        if self.browser_pool is not None:
+            yield self
+            return
+        
+        self.browser_pool = BrowserPool(max_uses=self.browser_max_uses)
+        self.throttle = HostThrottle(limiter=self.browser_limiter)
+        self.http_engine = HttpEngine(
+            throttle=self.throttle,
+            transport_factory=self.har.http_transport if self.har else None,
+        )
+        self.headed_lane = HeadedLane(max_concurrent=self.headed_concurrent)
+        try:
+            # 先啟動 driver，各銀行同時取得瀏覽器時才不會各自啟動一個
+            await self.browser_pool.start()
+            yield self
+        finally:
+            pool, self.browser_pool = self.browser_pool, None
+            engine, self.http_engine = self.http_engine, None
+            lane, self.headed_lane = self.headed_lane, None
+            self.throttle = None
+            await engine.close()
+            await pool.close()
+            await lane.close()
+            if self.har is not None:
+                self.har.save()
     
-    def get_downloader(self, bank_name: str) -> Optional[BaseBankDownloader]:
+    def get_downloader(
+        self, bank_name: str, downloader_class: Optional[Type[BaseBankDownloader]] = None
+    ) -> Optional[BaseBankDownloader]:
         """
         取得銀行下載器
         
         Args:
             bank_name: 銀行名稱
+            downloader_class: 指定的下載器類別（例如 DownloadManager 註冊的類別），
+                None 表示依登錄表取得
             
         Returns:
             銀行下載器實例，若不支援則回傳 None
         """
-        downloader_class = BANK_DOWNLOADERS.get(bank_name)
+        if downloader_class is None:
+            downloader_class = BANK_DOWNLOADERS.get(bank_name)
         if downloader_class:
-            return downloader_class(data_dir=self.data_dir)
+            return downloader_class(
+                data_dir=self.data_dir,
+                browser_pool=self.browser_pool,
+                http_engine=self.http_engine,
+                block_resources=self.block_resources,
+                link_cache=self.link_cache,
+                browser_limiter=self.browser_limiter,
+                headed_lane=self.headed_lane,
+                throttle=self.throttle,
+                retry_policy=self.retry_policy,
+                circuit_breaker=self.circuit_breakers.setdefault(bank_name, CircuitBreaker()),
+                har=self.har,
+                tracer=self.tracer,
+            )
         return None
     
-    async def download(self, bank_name: str, year: int, quarter: int) -> DownloadResult:
+    async def download(
+        self,
+        bank_name: str,
+        year: int,
+        quarter: int,
+        revalidate: bool = False,
+        downloader_class: Optional[Type[BaseBankDownloader]] = None,
+    ) -> DownloadResult:
         """
         下載指定銀行的財報（非同步）
         
@@ -178,20 +200,143 @@ class BankDownloader:
             bank_name: 銀行名稱
             year: 民國年
             quarter: 季度 (1-4)
+            revalidate: 檔案已存在時，是否以條件式請求檢查來源是否更新
+            downloader_class: 指定的下載器類別，None 表示依登錄表取得
             
         Returns:
             DownloadResult: 下載結果
         """
-        downloader = self.get_downloader(bank_name)
+        downloader = self.get_downloader(bank_name, downloader_class)
         if not downloader:
             return DownloadResult(
                 status=DownloadStatus.ERROR,
                 message=f"不支援的銀行: {bank_name}"
             )
         
-        return await downloader.download(year, quarter)
+        previous = self._resumed.get((downloader.bank_code, year, quarter))
+        if previous is not None:
+            return DownloadResult(
+                status=DownloadStatus[previous.status.upper()],
+                message=f"續跑略過: {previous.message}",
+                file_path=downloader.get_file_path(year, quarter),
+            )
+        
+        started = time.perf_counter()
+        try:
+            result = await downloader.download(year, quarter, revalidate=revalidate)
+        finally:
+            self._collect_stats(bank_name, downloader)
+        
+        sha256 = ""
+        if result.status == DownloadStatus.SUCCESS:
+            sha256 = await self._store_blob(downloader, year, quarter, result.file_path)
+        self._record_attempt(downloader, year, quarter, result, time.perf_counter() - started, sha256)
+        return result
     
-    async def download_by_code(self, bank_code: int, year: int, quarter: int) -> DownloadResult:
+    async def _store_blob(
+        self, downloader: BaseBankDownloader, year: int, quarter: int, file_path: str
+    ) -> str:
+        """
+        將新下載的檔案納入內容定址儲存（失敗不影響下載結果），回傳檔案雜湊
+        
+        雜湊、頁數與清單寫回都是磁碟 I/O，在執行緒中進行，不阻塞其他銀行的下載
+        """
+        if not file_path or not os.path.isfile(file_path):
+            return ""
+        entry = self.link_cache.get(downloader.bank_code, year, quarter)
+        try:
+            stored = await asyncio.to_thread(
+                self.blob_store.store, file_path, source_url=entry.url if entry else ""
+            )
+            return stored.sha256
+        except OSError as e:
+            print(f"[警告] 無法寫入內容定址儲存: {file_path} ({e})")
+            return ""
+    
+    def _record_attempt(
+        self,
+        downloader: BaseBankDownloader,
+        year: int,
+        quarter: int,
+        result: DownloadResult,
+        elapsed: float,
+        sha256: str = "",
+    ):
+        """將下載結果寫入執行紀錄"""
+        if self.ledger is None:
+            return
+        file_path = result.file_path
+        has_file = bool(file_path) and os.path.isfile(file_path)
+        if not sha256 and has_file and result.status == DownloadStatus.ALREADY_EXISTS:
+            entry = self.blob_store.get(file_path)
+            sha256 = entry.sha256 if entry else ""
+        self.ledger.record(
+            self.run_id,
+            STAGE_DOWNLOAD,
+            downloader.bank_code,
+            downloader.bank_name,
+            year,
+            quarter,
+            result.status.name.lower(),
+            duration_ms=elapsed * 1000,
+            bytes=os.path.getsize(file_path) if has_file else 0,
+            error_kind=result.error_kind.value if result.error_kind else "",
+            message=result.message,
+            sha256=sha256,
+        )
+    
+    def _collect_stats(self, bank_name: str, downloader: BaseBankDownloader):
+        """合併單次下載的攔截、等待統計、階段計時與失敗 trace"""
+        if downloader.route_stats.allowed or downloader.route_stats.blocked:
+            self.route_stats.setdefault(bank_name, RouteStats()).merge(downloader.route_stats)
+        if downloader.wait_stats.fixed_count or downloader.wait_stats.condition_count:
+            self.wait_stats.setdefault(bank_name, WaitStats()).merge(downloader.wait_stats)
+        self.timings.merge(downloader.timings)
+        if downloader.traces:
+            self.traces.setdefault(bank_name, []).extend(downloader.traces)
+    
+    def total_route_stats(self) -> RouteStats:
+        """所有銀行的攔截統計合計"""
+        total = RouteStats()
+        for stats in self.route_stats.values():
+            total.merge(stats)
+        return total
+    
+    def total_wait_stats(self) -> WaitStats:
+        """所有銀行的等待時間合計"""
+        total = WaitStats()
+        for stats in self.wait_stats.values():
+            total.merge(stats)
+        return total
+    
+    def print_wait_report(self, bank_names: Optional[List[str]] = None):
+        """列印各銀行固定等待與條件等待的時間（依總等待時間排序）"""
+        names = [n for n in (bank_names or self.wait_stats) if n in self.wait_stats]
+        if not names:
+            return
+        
+        names.sort(key=lambda n: self.wait_stats[n].total_ms, reverse=True)
+        for bank_name in names:
+            print(f"[等待] {bank_name}: {self.wait_stats[bank_name].summary()}")
+        print(f"[等待] 合計: {self.total_wait_stats().summary()}")
+    
+    def write_timings(self, jsonl_path: str, prometheus_path: Optional[str] = None):
+        """
+        寫出階段計時
+        
+        Args:
+            jsonl_path: JSONL 執行紀錄（每個階段一行，附加寫入）
+            prometheus_path: Prometheus textfile（覆寫），None 表示不寫
+        """
+        if not self.timings:
+            return
+        self.timings.write_jsonl(jsonl_path)
+        if prometheus_path:
+            self.timings.write_prometheus(prometheus_path)
+    
+    async def download_by_code(
+        self, bank_code: int, year: int, quarter: int, revalidate: bool = False
+    ) -> DownloadResult:
         """
         依銀行代碼下載財報（非同步）
         
@@ -199,6 +344,7 @@ class BankDownloader:
             bank_code: 銀行代碼
             year: 民國年
             quarter: 季度 (1-4)
+            revalidate: 檔案已存在時，是否檢查來源是否更新
             
         Returns:
             DownloadResult: 下載結果
@@ -210,9 +356,11 @@ class BankDownloader:
                 message=f"不支援的銀行代碼: {bank_code}"
             )
         
-        return await self.download(bank_name, year, quarter)
+        return await self.download(bank_name, year, quarter, revalidate=revalidate)
     
-    async def download_all(self, year: int, quarter: int, max_concurrent: int = 5) -> Dict[str, DownloadResult]:
+    async def download_all(
+        self, year: int, quarter: int, max_concurrent: int = 5, revalidate: bool = False
+    ) -> Dict[str, DownloadResult]:
         """
         下載所有銀行的財報（非同步並行）
         
@@ -220,19 +368,21 @@ class BankDownloader:
             year: 民國年
             quarter: 季度 (1-4)
             max_concurrent: 最大並行數量（預設 5）
+            revalidate: 檔案已存在時，是否檢查來源是否更新
             
         Returns:
             Dict: 各銀行的下載結果
         """
         bank_names = list(BANK_DOWNLOADERS.keys())
-        return await self.download_banks(bank_names, year, quarter, max_concurrent)
+        return await self.download_banks(bank_names, year, quarter, max_concurrent, revalidate)
     
     async def download_banks(
         self, 
         bank_names: List[str], 
         year: int, 
         quarter: int, 
-        max_concurrent: int = 5
+        max_concurrent: int = 5,
+        revalidate: bool = False
     ) -> Dict[str, DownloadResult]:
         """
         下載指定銀行的財報（非同步並行）
@@ -241,40 +391,102 @@ class BankDownloader:
             bank_names: 銀行名稱列表
             year: 民國年
             quarter: 季度 (1-4)
-            max_concurrent: 最大並行數量
+            max_concurrent: 無頭瀏覽器的最大並行數量（AIMD 從一半開始，依回應狀況調整；
+                有頭工作另由有頭通道限制）
+            revalidate: 檔案已存在時，是否檢查來源是否更新
             
         Returns:
             Dict: 各銀行的下載結果
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
         results = {}
+        async for bank_name, result in self.iter_downloads(
+            bank_names, year, quarter, max_concurrent, revalidate
+        ):
+            results[bank_name] = result
+        # 依傳入順序排列（迭代時為完成順序）
+        results = {name: results[name] for name in bank_names if name in results}
         
-        async def download_with_semaphore(bank_name: str):
-            async with semaphore:
-                print(f"[下載中] {bank_name}...")
-                result = await self.download(bank_name, year, quarter)
-                status_icon = "✓" if result.status == DownloadStatus.SUCCESS else "✗"
-                print(f"[{status_icon}] {bank_name}: {result.message}")
-                return bank_name, result
+        if self.route_stats:
+            for bank_name in bank_names:
+                if bank_name in self.route_stats:
+                    print(f"[攔截] {bank_name}: {self.route_stats[bank_name].summary()}")
+            print(f"[攔截] 合計: {self.total_route_stats().summary()}")
         
-        tasks = [download_with_semaphore(name) for name in bank_names]
-        completed = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for item in completed:
-            if isinstance(item, Exception):
-                print(f"[錯誤] 下載異常: {item}")
-            else:
-                bank_name, result = item
-                results[bank_name] = result
+        self.print_wait_report(bank_names)
         
         return results
     
+    async def iter_downloads(
+        self,
+        bank_names: List[str],
+        year: int,
+        quarter: int,
+        max_concurrent: int = 5,
+        revalidate: bool = False,
+    ) -> AsyncIterator[Tuple[str, DownloadResult]]:
+        """
+        並行下載，依完成順序逐一產出結果（供下載與解析管線使用）
+        
+        所有下載在開始迭代時就排入，不受呼叫端處理速度影響；呼叫端提前結束迭代時，
+        尚未完成的下載會被取消。
+        
+        使用方式:
+            async for bank_name, result in downloader.iter_downloads(names, 114, 1):
+                ...
+        
+        Args:
+            bank_names: 銀行名稱列表
+            year: 民國年
+            quarter: 季度 (1-4)
+            max_concurrent: 無頭瀏覽器的最大並行數量
+            revalidate: 檔案已存在時，是否檢查來源是否更新
+            
+        Yields:
+            (銀行名稱, 下載結果)；下載過程拋出例外的銀行只印出錯誤，不產出結果
+        """
+        # 無頭瀏覽器工作共用 AIMD 名額（上限 max_concurrent）：回應快就加開，
+        # 遇到 429/5xx 或逾時就減半。有頭工作（含有頭重試）改走有頭通道，不佔用無頭名額。
+        # HTTP 快速路徑與網址快取不需要瀏覽器，只受主機速率限制。
+        owns_limiter = self.browser_limiter is None
+        if owns_limiter:
+            self.browser_limiter = AdaptiveLimiter(max_limit=max_concurrent)
+        
+        async def download_one(bank_name: str):
+            print(f"[下載中] {bank_name}...")
+            result = await self.download(bank_name, year, quarter, revalidate=revalidate)
+            status_icon = "✓" if result.status == DownloadStatus.SUCCESS else "✗"
+            print(f"[{status_icon}] {bank_name}: {result.message}")
+            return bank_name, result
+        
+        try:
+            async with self.session():
+                self.throttle.limiter = self.browser_limiter
+                tasks = [asyncio.ensure_future(download_one(name)) for name in bank_names]
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        try:
+                            item = await next_done
+                        except Exception as e:
+                            print(f"[錯誤] 下載異常: {e}")
+                            continue
+                        yield item
+                finally:
+                    pending = [task for task in tasks if not task.done()]
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                print(f"[流量] {self.browser_limiter.summary()}; {self.throttle.summary()}")
+        finally:
+            if owns_limiter:
+                self.browser_limiter = None
+    
     async def download_by_codes(
         self, 
         bank_codes: List[int], 
         year: int, 
         quarter: int,
-        max_concurrent: int = 5
+        max_concurrent: int = 5,
+        revalidate: bool = False
     ) -> Dict[str, DownloadResult]:
         """
         依銀行代碼列表下載財報（非同步並行）
@@ -284,6 +496,7 @@ class BankDownloader:
             year: 民國年
             quarter: 季度 (1-4)
             max_concurrent: 最大並行數量
+            revalidate: 檔案已存在時，是否檢查來源是否更新
             
         Returns:
             Dict: 各銀行的下載結果
@@ -296,7 +509,175 @@ class BankDownloader:
             else:
                 print(f"[警告] 不支援的銀行代碼: {code}")
         
-        return await self.download_banks(bank_names, year, quarter, max_concurrent)
+        return await self.download_banks(bank_names, year, quarter, max_concurrent, revalidate)
+    
+    async def download_range(
+        self,
+        bank_names: List[str],
+        quarters: List[Tuple[int, int]],
+        max_concurrent: int = 5,
+        revalidate: bool = False,
+    ) -> Dict[Tuple[int, int], Dict[str, DownloadResult]]:
+        """
+        下載多個季度（銀行 × 季度攤平成單一排程）
+        
+        - 所有工作共用同一個 session（瀏覽器池、HTTP 連線池、主機速率限制）
+        - 依 quarters 的順序排程，呼叫端應由新到舊排列
+        - 同一家銀行一次只處理一個季度，避免同一網站被多個季度同時請求；
+          工作者會先挑其他銀行的工作，不會閒置等待
+        
+        Args:
+            bank_names: 銀行名稱列表
+            quarters: (民國年, 季度) 列表，依排程順序排列
+            max_concurrent: 無頭瀏覽器的最大並行數量
+            revalidate: 檔案已存在時，是否檢查來源是否更新
+            
+        Returns:
+            Dict: {(民國年, 季度): {銀行名稱: 下載結果}}
+        """
+        pending: List[Tuple[str, int, int]] = [
+            (bank_name, year, quarter) for year, quarter in quarters for bank_name in bank_names
+        ]
+        busy_banks = set()
+        changed = asyncio.Condition()
+        results: Dict[Tuple[int, int], Dict[str, DownloadResult]] = {q: {} for q in quarters}
+        total = len(pending)
+        
+        def next_job() -> Optional[Tuple[str, int, int]]:
+            for i, job in enumerate(pending):
+                if job[0] not in busy_banks:
+                    return pending.pop(i)
+            return None
+        
+        async def worker():
+            while True:
+                async with changed:
+                    job = None
+                    while pending:
+                        job = next_job()
+                        if job:
+                            break
+                        await changed.wait()
+                    if job is None:
+                        return
+                    busy_banks.add(job[0])
+                
+                bank_name, year, quarter = job
+                try:
+                    result = await self.download(bank_name, year, quarter, revalidate=revalidate)
+                except Exception as e:
+                    result = DownloadResult(status=DownloadStatus.ERROR, message=f"下載異常: {e}")
+                results[(year, quarter)][bank_name] = result
+                
+                done = sum(len(r) for r in results.values())
+                status_icon = "✓" if result.status in (DownloadStatus.SUCCESS, DownloadStatus.ALREADY_EXISTS) else "✗"
+                print(f"[{done}/{total}] [{status_icon}] {year}Q{quarter} {bank_name}: {result.message}")
+                
+                async with changed:
+                    busy_banks.discard(bank_name)
+                    changed.notify_all()
+        
+        owns_limiter = self.browser_limiter is None
+        if owns_limiter:
+            self.browser_limiter = AdaptiveLimiter(max_limit=max_concurrent)
+        
+        # 工作者數量大於瀏覽器名額：HTTP 快速路徑與網址快取的工作不必等瀏覽器
+        workers = min(len(bank_names), max_concurrent * 2) or 1
+        try:
+            async with self.session():
+                self.throttle.limiter = self.browser_limiter
+                await asyncio.gather(*(worker() for _ in range(workers)))
+                print(f"[流量] {self.browser_limiter.summary()}; {self.throttle.summary()}")
+        finally:
+            if owns_limiter:
+                self.browser_limiter = None
+        
+        self.print_wait_report(bank_names)
+        return results
+    
+    async def harvest(
+        self, bank_name: str, years: Optional[List[int]] = None
+    ) -> Dict[Tuple[int, int], DownloadResult]:
+        """
+        多季度下載：瀏覽一次列表頁，下載該銀行所有尚未下載的季度
+        
+        Args:
+            bank_name: 銀行名稱
+            years: 只下載這些年度（依年度查詢的網站逐年查詢），None 表示頁面上所有年度
+            
+        Returns:
+            Dict: {(民國年, 季度): 下載結果}
+        """
+        downloader = self.get_downloader(bank_name)
+        if not downloader or not downloader.supports_discovery():
+            return {}
+        
+        try:
+            results = await downloader.harvest(years)
+        finally:
+            self._collect_stats(bank_name, downloader)
+        
+        for (year, quarter), result in results.items():
+            sha256 = ""
+            if result.status == DownloadStatus.SUCCESS:
+                sha256 = await self._store_blob(downloader, year, quarter, result.file_path)
+            # 多季度模式共用一次列表頁瀏覽，不記錄個別耗時
+            self._record_attempt(downloader, year, quarter, result, 0.0, sha256)
+        return results
+    
+    async def harvest_banks(
+        self,
+        bank_names: Optional[List[str]] = None,
+        years: Optional[List[int]] = None,
+        max_concurrent: int = 5,
+    ) -> Dict[str, Dict[Tuple[int, int], DownloadResult]]:
+        """
+        多季度下載多家銀行（非同步並行），不支援多季度模式的銀行略過
+        
+        Args:
+            bank_names: 銀行名稱列表，None 表示所有支援多季度模式的銀行
+            years: 只下載這些年度，None 表示頁面上所有年度
+            max_concurrent: 瀏覽器的最大並行數量
+            
+        Returns:
+            Dict: {銀行名稱: {(民國年, 季度): 下載結果}}
+        """
+        if bank_names is None:
+            bank_names = list(HARVEST_BANKS)
+        skipped = [name for name in bank_names if name not in HARVEST_BANKS]
+        if skipped:
+            print(f"[略過] 不支援多季度模式: {', '.join(skipped)}")
+        bank_names = [name for name in bank_names if name in HARVEST_BANKS]
+        
+        results: Dict[str, Dict[Tuple[int, int], DownloadResult]] = {}
+        owns_limiter = self.browser_limiter is None
+        if owns_limiter:
+            self.browser_limiter = AdaptiveLimiter(max_limit=max_concurrent)
+        
+        async def harvest_one(bank_name: str):
+            print(f"[多季度] {bank_name}...")
+            try:
+                bank_results = await self.harvest(bank_name, years)
+            except Exception as e:
+                print(f"[✗] {bank_name}: {e}")
+                return bank_name, {}
+            success = sum(1 for r in bank_results.values() if r.status == DownloadStatus.SUCCESS)
+            print(f"[✓] {bank_name}: 下載 {success}/{len(bank_results)} 季")
+            return bank_name, bank_results
+        
+        try:
+            async with self.session():
+                self.throttle.limiter = self.browser_limiter
+                for bank_name, bank_results in await asyncio.gather(
+                    *(harvest_one(name) for name in bank_names)
+                ):
+                    results[bank_name] = bank_results
+        finally:
+            if owns_limiter:
+                self.browser_limiter = None
+        
+        self.print_wait_report(bank_names)
+        return results
     
     @staticmethod
     def list_supported_banks() -> list:
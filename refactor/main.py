@@ -16,27 +16,70 @@
     # 只生成報表
     python main.py 114Q1 --report-only
     
+    # 指定報表解析的並行行程數（預設為 CPU 核心數）
+    python main.py 114Q1 --report-only --workers 4
+    
+    # 解析結果快取於 data/.parse_cache/（PDF 或解析程式變更時自動失效），強制全部重新解析
+    python main.py 114Q1 --report-only --no-parse-cache
+    
+    # 下載與解析同時進行：每下載完一家銀行就開始解析，不必等最慢的銀行
+    python main.py 114Q1 --pipeline
+    
     # 指定銀行（支援代碼或名稱）
     python main.py 114Q1 --banks 1 2 3
     python main.py 114Q1 --banks 合作金庫 玉山 台新
     
     # 指定並行數量
     python main.py 114Q1 --parallel 3
+    
+    # 攔截圖片、字型、影音與追蹤請求（加快載入、減少流量）
+    python main.py 114Q1 --block-resources
+    
+    # 檢查已下載的財報在來源端是否有更新（只重新下載有變更的檔案）
+    python main.py 114Q1 --download-only --revalidate
+    
+    # 補抓一段期間（所有銀行 × 季度共用一個排程，由新到舊）
+    python main.py --range 108Q1:114Q3 --download-only
+    
+    # 將既有的 PDF 納入內容定址儲存（相同內容只存一份），並清除不再使用的舊版本
+    python main.py --dedupe
+    
+    # 多季度模式：每家銀行只瀏覽一次列表頁，下載頁面上所有尚未下載的季度
+    python main.py --harvest
+    python main.py --harvest --banks 台中 京城
+    
+    # 列出尚未完成的下載與解析（依 data/.ledger.sqlite，不連線）
+    python main.py 114Q1 --plan
+    python main.py --range 108Q1:114Q3 --plan
+    
+    # 從上一次中斷的地方繼續（沿用當時的季度、銀行與是否產生報表）
+    python main.py --resume
+    
+    # 下載後列出各銀行各階段（啟動、導覽、找連結、傳輸、重試...）的耗時
+    # 每次執行都會寫入 logs/timings/run_*.jsonl 與 logs/timings/bank_download.prom
+    python main.py 114Q1 --download-only --timings
+    
+    # 錄製 Playwright trace，下載失敗（ERROR / NO_DATA）時保存至 logs/traces/，以下列指令檢視
+    python main.py 114Q1 --banks 31 --trace
+    playwright show-trace logs/traces/20250101/31_114Q1_a1_headless_093000.zip
 """
 
 import argparse
 import asyncio
 import logging
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
 # 將 refactor 目錄加入路徑
 sys.path.insert(0, str(Path(__file__).parent))
 
-from downloader import BankDownloader, BANK_CODES
-from report_generator import generate_report
+from downloader import BankDownloader, BANK_CODES, HARVEST_BANKS
 from banks.base import DownloadStatus
+from utils.blob_store import BlobStore
+from utils.file import parse_filename
+from utils.ledger import STAGE_DOWNLOAD, STAGE_PARSE, Ledger
 
 
 # ============================================================
@@ -70,6 +113,12 @@ def setup_logging() -> logging.Logger:
 # 初始化 logger
 logger = setup_logging()
 
+# 階段計時輸出目錄（JSONL 執行紀錄與 Prometheus textfile）
+TIMINGS_DIR = Path(__file__).parent / "logs" / "timings"
+
+# 下載失敗時保存 Playwright trace 的目錄
+TRACES_DIR = Path(__file__).parent / "logs" / "traces"
+
 
 def parse_args():
     """解析命令列參數"""
@@ -106,7 +155,83 @@ def parse_args():
         "--parallel", "-p",
         type=int,
         default=10,
-        help="並行下載數量（預設: 10）"
+        help="無頭瀏覽器並行上限，實際名額依網站回應自動調整（預設: 10）"
+    )
+    
+    parser.add_argument(
+        "--headed-parallel",
+        type=int,
+        default=2,
+        help="有頭瀏覽器通道的並行數量，與 --parallel 分開計算（預設: 2）"
+    )
+    
+    parser.add_argument(
+        "--range",
+        dest="quarter_range",
+        metavar="START:END",
+        help="下載一段期間，例如 108Q1:114Q3（由新到舊排程，忽略 year_quarter，不生成報表）"
+    )
+    
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="將 data/ 下既有的 PDF 納入內容定址儲存並更新 data/.manifest.json，不下載"
+    )
+    
+    parser.add_argument(
+        "--harvest",
+        action="store_true",
+        help="多季度模式：每家銀行瀏覽一次列表頁，下載所有尚未下載的季度（忽略 year_quarter，不生成報表）"
+    )
+    
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="依執行紀錄列出尚未完成的下載與解析（範圍同 year_quarter / --range / --banks），不下載"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="繼續上一次中斷的執行，已完成的銀行與季度直接略過"
+    )
+    
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="下載結束後列出各銀行各階段的耗時（最慢的銀行在前）"
+    )
+    
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=None,
+        help="報表解析的並行行程數（預設: CPU 核心數；1 表示不另開行程）"
+    )
+    
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="下載與解析同時進行：每下載完一家銀行就開始解析（下載 + 報表模式）"
+    )
+    
+    parser.add_argument(
+        "--no-parse-cache",
+        action="store_true",
+        help="不使用解析快取（data/.parse_cache/），所有 PDF 重新解析"
+    )
+    
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="錄製 Playwright trace，只在下載失敗時保存至 logs/traces/（預設關閉，每個瀏覽器 context 都會錄製 DOM 快照）"
+    )
+    
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="逾時、5xx、連線中斷時的最多嘗試次數（預設: 3）"
     )
     
     parser.add_argument(
@@ -122,6 +247,18 @@ def parse_args():
         help="顯示瀏覽器視窗（覆蓋 --headless）"
     )
     
+    parser.add_argument(
+        "--block-resources",
+        action="store_true",
+        help="攔截圖片、字型、影音與追蹤請求"
+    )
+    
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        help="以條件式請求檢查已下載的財報是否更新，只重新下載有變更的檔案"
+    )
+    
     return parser.parse_args()
 
 
@@ -134,17 +271,56 @@ def parse_year_quarter(year_quarter: str) -> tuple:
     raise ValueError(f"無效的年度季度格式: {year_quarter}")
 
 
+def parse_quarter_range(quarter_range: str) -> list:
+    """
+    解析季度範圍字串，例如 108Q1:114Q3
+    
+    Returns:
+        (民國年, 季度) 列表，由新到舊排列
+    """
+    start_text, sep, end_text = quarter_range.partition(":")
+    if not sep:
+        raise ValueError(f"無效的季度範圍格式: {quarter_range}")
+    start = parse_year_quarter(start_text.strip())
+    end = parse_year_quarter(end_text.strip())
+    if start > end:
+        start, end = end, start
+    
+    quarters = []
+    year, quarter = end
+    while (year, quarter) >= start:
+        quarters.append((year, quarter))
+        year, quarter = (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+    return quarters
+
+
 async def run_download(
     year: int, 
     quarter: int, 
     bank_codes: list = None, 
-    max_concurrent: int = 5
+    max_concurrent: int = 5,
+    block_resources: bool = False,
+    revalidate: bool = False,
+    headed_concurrent: int = 2,
+    max_attempts: int = 3,
+    ledger: Ledger = None,
+    run_id: int = None,
+    show_timings: bool = False,
+    trace: bool = False
 ) -> dict:
     """執行下載任務（非同步）"""
     base_dir = Path(__file__).parent
     data_dir = str(base_dir / "data")
     
-    downloader = BankDownloader(data_dir=data_dir)
+    downloader = BankDownloader(
+        data_dir=data_dir,
+        block_resources=block_resources,
+        headed_concurrent=headed_concurrent,
+        max_attempts=max_attempts,
+        ledger=ledger,
+        trace_dir=str(TRACES_DIR) if trace else None,
+    )
+    downloader.use_run(run_id)
     
     print(f"\n{'='*60}")
     print(f"開始下載 {year}Q{quarter} 財報（並行數: {max_concurrent}）")
@@ -155,11 +331,15 @@ async def run_download(
         if bank_codes:
             # 下載指定銀行
             logger.info(f"指定銀行代碼: {bank_codes}")
-            results = await downloader.download_by_codes(bank_codes, year, quarter, max_concurrent)
+            results = await downloader.download_by_codes(
+                bank_codes, year, quarter, max_concurrent, revalidate=revalidate
+            )
         else:
             # 下載所有銀行
             logger.info("下載所有銀行")
-            results = await downloader.download_all(year, quarter, max_concurrent)
+            results = await downloader.download_all(
+                year, quarter, max_concurrent, revalidate=revalidate
+            )
         
         # 記錄結果
         for bank_name, result in results.items():
@@ -168,16 +348,72 @@ async def run_download(
             elif result.status == DownloadStatus.ALREADY_EXISTS:
                 logger.info(f"檔案已存在: {bank_name}")
             else:
-                logger.error(f"下載失敗: {bank_name} - {result.message}")
+                kind = f" [{result.error_kind.value}]" if result.error_kind else ""
+                logger.error(f"下載失敗: {bank_name}{kind} - {result.message}")
+        
+        if downloader.route_stats:
+            logger.info(f"請求攔截: {downloader.total_route_stats().summary()}")
+        for bank_name, stats in downloader.wait_stats.items():
+            logger.debug(f"等待時間: {bank_name} - {stats.summary()}")
+        if downloader.wait_stats:
+            logger.info(f"等待時間: {downloader.total_wait_stats().summary()}")
         
+        save_timings(downloader, show_timings)
+        log_traces(downloader)
         return results
     except Exception as e:
         logger.exception(f"下載過程發生異常")
         raise
 
 
-def run_report(year_quarter: str):
-    """執行報表生成"""
+def parse_recorder(ledger: Ledger = None, run_id: int = None, store: BlobStore = None):
+    """
+    建立將解析結果寫入執行紀錄的回呼（generate_report 的 on_parsed）
+    
+    Args:
+        store: 共用的內容定址儲存（管線模式傳入下載器的），None 表示讀取目前的清單
+    
+    Returns:
+        回呼函式 (PDF 路徑, 資料筆數, 耗時秒數, 錯誤訊息, PDF 雜湊)；沒有執行紀錄時為 None
+    """
+    if ledger is None:
+        return None
+    store = store or BlobStore(str(Path(__file__).parent / "data"))
+    
+    def on_parsed(pdf_file: Path, row_count: int, elapsed: float, error: str, sha256: str = ""):
+        info = parse_filename(pdf_file.name)
+        if not info["bank_code"]:
+            return
+        status = "error" if error else ("success" if row_count else "no_data")
+        ledger.record(
+            run_id, STAGE_PARSE, info["bank_code"], info["bank_name"],
+            info["year"], info["quarter"], status,
+            duration_ms=elapsed * 1000,
+            bytes=pdf_file.stat().st_size,
+            message=error or f"{row_count} 筆資料",
+            sha256=sha256 or store.sha256_of(str(pdf_file)),
+        )
+    
+    return on_parsed
+
+
+def run_report(
+    year_quarter: str,
+    ledger: Ledger = None,
+    run_id: int = None,
+    workers: int = None,
+    use_cache: bool = True,
+):
+    """
+    執行報表生成
+    
+    Args:
+        year_quarter: 年度季度（例如 114Q1）
+        ledger: 執行紀錄（記錄每個 PDF 的解析結果）
+        run_id: 執行編號
+        workers: 解析的並行行程數（None 表示 CPU 核心數）
+        use_cache: 是否使用解析快取（PDF 與解析程式都沒變更的檔案不重新解析）
+    """
     base_dir = Path(__file__).parent
     data_dir = base_dir / "data" / year_quarter
     output_path = base_dir / "Output" / f"{year_quarter}_資產品質報表.xlsx"
@@ -193,8 +429,16 @@ def run_report(year_quarter: str):
         logger.error(f"資料目錄不存在: {data_dir}")
         return None
     
+    on_parsed = parse_recorder(ledger, run_id)
+    
+    # 延遲匯入：pandas / pdfplumber 只在產生報表時載入
+    from report_generator import generate_report
+    
     try:
-        df = generate_report(str(data_dir), str(output_path))
+        df = generate_report(
+            str(data_dir), str(output_path),
+            max_workers=workers, on_parsed=on_parsed, use_processes=True, use_cache=use_cache,
+        )
         if df is not None and not df.empty:
             logger.info(f"報表生成成功: {output_path}, 共 {len(df)} 筆資料")
         else:
@@ -205,6 +449,322 @@ def run_report(year_quarter: str):
         raise
 
 
+async def run_harvest(
+    bank_codes: list = None,
+    max_concurrent: int = 5,
+    block_resources: bool = False,
+    headed_concurrent: int = 2,
+    ledger: Ledger = None,
+    run_id: int = None,
+    show_timings: bool = False,
+    trace: bool = False
+) -> dict:
+    """執行多季度下載（非同步）"""
+    base_dir = Path(__file__).parent
+    data_dir = str(base_dir / "data")
+    
+    downloader = BankDownloader(
+        data_dir=data_dir,
+        block_resources=block_resources,
+        headed_concurrent=headed_concurrent,
+        ledger=ledger,
+        trace_dir=str(TRACES_DIR) if trace else None,
+    )
+    downloader.use_run(run_id)
+    
+    bank_names = [BANK_CODES[c] for c in bank_codes] if bank_codes else None
+    
+    print(f"\n{'='*60}")
+    print(f"多季度下載（支援: {len(HARVEST_BANKS)} 家銀行）")
+    print(f"{'='*60}")
+    logger.info(f"開始多季度下載: {bank_names or '所有支援的銀行'}")
+    
+    results = await downloader.harvest_banks(bank_names, max_concurrent=max_concurrent)
+    
+    for bank_name, bank_results in results.items():
+        for (year, quarter), result in sorted(bank_results.items()):
+            if result.status == DownloadStatus.SUCCESS:
+                logger.info(f"下載成功: {bank_name} {year}Q{quarter}")
+            else:
+                logger.error(f"下載失敗: {bank_name} {year}Q{quarter} - {result.message}")
+    
+    save_timings(downloader, show_timings)
+    log_traces(downloader)
+    return results
+
+
+async def run_pipeline(
+    year: int,
+    quarter: int,
+    bank_codes: list = None,
+    max_concurrent: int = 5,
+    block_resources: bool = False,
+    revalidate: bool = False,
+    headed_concurrent: int = 2,
+    max_attempts: int = 3,
+    ledger: Ledger = None,
+    run_id: int = None,
+    show_timings: bool = False,
+    trace: bool = False,
+    workers: int = None,
+    use_cache: bool = True,
+) -> tuple:
+    """
+    下載與解析管線（非同步）
+    
+    每完成一家銀行的下載就把 PDF 路徑放進佇列，由解析工作者（行程池）取出解析。
+    佇列不設上限也不對下載施加背壓：下載在開始迭代時就全部排入、受網路限制，
+    佇列中只有檔案路徑，解析落後時只是等待解析，不會拖慢下載或佔用大量記憶體。下載全部完成後，
+    資料目錄中其他既有的 PDF（未指定的銀行、本次下載失敗但有舊檔）也一併解析，
+    報表內容與先執行 run_download 再執行 run_report 相同。
+    
+    Returns:
+        (各銀行的下載結果, 報表 DataFrame)
+    """
+    base_dir = Path(__file__).parent
+    year_quarter = f"{year}Q{quarter}"
+    data_dir = base_dir / "data" / year_quarter
+    output_path = base_dir / "Output" / f"{year_quarter}_資產品質報表.xlsx"
+    
+    downloader = BankDownloader(
+        data_dir=str(base_dir / "data"),
+        block_resources=block_resources,
+        headed_concurrent=headed_concurrent,
+        max_attempts=max_attempts,
+        ledger=ledger,
+        trace_dir=str(TRACES_DIR) if trace else None,
+    )
+    downloader.use_run(run_id)
+    
+    if bank_codes:
+        bank_names = [BANK_CODES[code] for code in bank_codes if code in BANK_CODES]
+        for code in bank_codes:
+            if code not in BANK_CODES:
+                print(f"[警告] 不支援的銀行代碼: {code}")
+    else:
+        bank_names = list(BANK_CODES.values())
+    
+    # 延遲匯入：pandas / pdfplumber 只在產生報表時載入
+    from report_generator import ParseWorkers, write_report
+    
+    on_parsed = parse_recorder(ledger, run_id, downloader.blob_store)
+    results = {}
+    outcomes = []
+    queued = set()
+    
+    print(f"\n{'='*60}")
+    print(f"開始下載並解析 {year_quarter}（下載並行數: {max_concurrent}）")
+    print(f"{'='*60}")
+    logger.info(f"開始下載並解析: {year_quarter}, 並行數: {max_concurrent}, 銀行: {bank_codes or '全部'}")
+    
+    with ParseWorkers(
+        str(data_dir), year_quarter, max_workers=workers, use_cache=use_cache, store=downloader.blob_store
+    ) as parser:
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def parse_worker():
+            while True:
+                pdf_file = await queue.get()
+                try:
+                    if pdf_file is None:
+                        return
+                    try:
+                        outcome = await parser.parse(pdf_file)
+                    except Exception as e:
+                        # 行程池異常時繼續取出佇列，其餘檔案照常解析
+                        print(f"[解析 ✗] {pdf_file.name}: 錯誤 - {e}")
+                        logger.exception(f"解析異常: {pdf_file.name}")
+                        continue
+                    outcomes.append(outcome)
+                    if on_parsed:
+                        on_parsed(
+                            outcome.pdf_file, len(outcome.rows), outcome.elapsed, outcome.error, outcome.sha256
+                        )
+                    if outcome.rows:
+                        print(f"[解析 ✓] {outcome.bank_name}: {len(outcome.rows)} 筆資料")
+                        logger.info(f"解析成功: {outcome.bank_name}, {len(outcome.rows)} 筆")
+                    else:
+                        print(f"[解析 ✗] {outcome.bank_name}: {outcome.error or '無資料'}")
+                        logger.warning(f"解析無資料: {outcome.bank_name} {outcome.error}")
+                finally:
+                    queue.task_done()
+        
+        async def enqueue(pdf_file: Path):
+            key = pdf_file.resolve()
+            if key in queued:
+                return
+            queued.add(key)
+            await queue.put(pdf_file)
+        
+        tasks = [asyncio.create_task(parse_worker()) for _ in range(parser.workers)]
+        try:
+            async for bank_name, result in downloader.iter_downloads(
+                bank_names, year, quarter, max_concurrent, revalidate=revalidate
+            ):
+                results[bank_name] = result
+                if result.status in (DownloadStatus.SUCCESS, DownloadStatus.ALREADY_EXISTS):
+                    logger.info(f"下載完成: {bank_name} ({result.status.value})")
+                    if result.file_path and Path(result.file_path).is_file():
+                        await enqueue(Path(result.file_path))
+                else:
+                    kind = f" [{result.error_kind.value}]" if result.error_kind else ""
+                    logger.error(f"下載失敗: {bank_name}{kind} - {result.message}")
+            
+            # 其他既有的 PDF
+            for pdf_file in sorted(data_dir.glob("*.pdf")):
+                await enqueue(pdf_file)
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    save_timings(downloader, show_timings)
+    log_traces(downloader)
+    
+    results = {name: results[name] for name in bank_names if name in results}
+    outcomes.sort(key=lambda outcome: outcome.pdf_file.name)
+    rows = [row for outcome in outcomes for row in outcome.rows]
+    bank_count = sum(1 for outcome in outcomes if outcome.rows)
+    print(f"\n解析: 成功 {bank_count}, 失敗 {len(outcomes) - bank_count}")
+    df = write_report(rows, str(output_path), bank_count)
+    if not df.empty:
+        logger.info(f"報表生成成功: {output_path}, 共 {len(df)} 筆資料")
+    else:
+        logger.warning("報表生成完成但無資料")
+    return results, df
+
+
+async def run_range_download(
+    quarters: list,
+    bank_codes: list = None,
+    max_concurrent: int = 5,
+    block_resources: bool = False,
+    revalidate: bool = False,
+    headed_concurrent: int = 2,
+    max_attempts: int = 3,
+    ledger: Ledger = None,
+    run_id: int = None,
+    resume: bool = False,
+    show_timings: bool = False,
+    trace: bool = False
+) -> dict:
+    """執行多季度範圍下載（非同步）"""
+    base_dir = Path(__file__).parent
+    data_dir = str(base_dir / "data")
+    
+    downloader = BankDownloader(
+        data_dir=data_dir,
+        block_resources=block_resources,
+        headed_concurrent=headed_concurrent,
+        max_attempts=max_attempts,
+        ledger=ledger,
+        trace_dir=str(TRACES_DIR) if trace else None,
+    )
+    downloader.use_run(run_id, resume=resume)
+    
+    bank_names = [BANK_CODES[c] for c in bank_codes] if bank_codes else downloader.list_supported_banks()
+    newest, oldest = quarters[0], quarters[-1]
+    
+    print(f"\n{'='*60}")
+    print(f"範圍下載 {oldest[0]}Q{oldest[1]} ~ {newest[0]}Q{newest[1]}"
+          f"（{len(quarters)} 季 × {len(bank_names)} 家銀行，並行數: {max_concurrent}）")
+    print(f"{'='*60}")
+    logger.info(f"開始範圍下載: {oldest[0]}Q{oldest[1]}~{newest[0]}Q{newest[1]}, 銀行數: {len(bank_names)}")
+    
+    results = await downloader.download_range(
+        bank_names, quarters, max_concurrent, revalidate=revalidate
+    )
+    
+    for (year, quarter), quarter_results in results.items():
+        for bank_name, result in quarter_results.items():
+            if result.status not in (DownloadStatus.SUCCESS, DownloadStatus.ALREADY_EXISTS):
+                logger.error(f"下載失敗: {bank_name} {year}Q{quarter} - {result.message}")
+    
+    save_timings(downloader, show_timings)
+    log_traces(downloader)
+    return results
+
+
+def log_traces(downloader: BankDownloader):
+    """記錄下載失敗時保存的 Playwright trace"""
+    for bank_name, paths in downloader.traces.items():
+        for path in paths:
+            logger.info(f"失敗 trace: {bank_name} - {path}")
+    if downloader.traces:
+        print(f"\n失敗的頁面狀態已保存至 {TRACES_DIR}（以 playwright show-trace 開啟）")
+
+
+def save_timings(downloader: BankDownloader, show: bool = False):
+    """
+    寫出階段計時（logs/timings/run_*.jsonl 與 bank_download.prom）
+    
+    Args:
+        downloader: 已執行完的下載器
+        show: 是否列印各銀行各階段的耗時表
+    """
+    if not downloader.timings:
+        return
+    
+    jsonl_path = TIMINGS_DIR / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    prom_path = TIMINGS_DIR / "bank_download.prom"
+    try:
+        downloader.write_timings(str(jsonl_path), str(prom_path))
+        logger.info(f"階段計時: {jsonl_path}")
+    except OSError as e:
+        logger.warning(f"無法寫入階段計時: {e}")
+    
+    if show:
+        print(f"\n{'='*60}")
+        print("各階段耗時（秒，retry 為重試總花費、與其他欄位重疊）")
+        print(f"{'='*60}")
+        print(downloader.timings.format_table())
+        print(f"\n明細: {jsonl_path}")
+
+
+def print_plan(ledger: Ledger, quarters: list, bank_codes: list = None) -> dict:
+    """
+    依執行紀錄列出尚未完成的工作（不連線、不掃描資料夾）
+    
+    Returns:
+        {"download": [...], "parse": [...]}，每項為 (銀行代碼, 民國年, 季度)
+    """
+    started = time.perf_counter()
+    codes = bank_codes or sorted(BANK_CODES)
+    jobs = [(code, year, quarter) for year, quarter in quarters for code in codes]
+    pending_download = ledger.plan(STAGE_DOWNLOAD, jobs)
+    missing = set(pending_download)
+    pending_parse = ledger.plan(STAGE_PARSE, [job for job in jobs if job not in missing])
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    print(f"\n{'='*60}")
+    print(f"待辦工作（{len(quarters)} 季 × {len(codes)} 家銀行，查詢 {elapsed_ms:.1f} ms）")
+    print(f"{'='*60}")
+    for stage, pending in (("下載", pending_download), ("解析", pending_parse)):
+        print(f"[{stage}] 待辦 {len(pending)} / {len(jobs)}")
+        for year, quarter in quarters:
+            names = [BANK_CODES[code] for code, y, q in pending if (y, q) == (year, quarter)]
+            if names:
+                print(f"  {year}Q{quarter} ({len(names)}): {', '.join(names)}")
+    
+    run = ledger.last_unfinished_run()
+    if run is not None:
+        print(f"\n上一次執行 #{run.id}（{run.started_at}）未完成，可用 --resume 繼續")
+    
+    logger.info(f"待辦工作: 下載 {len(pending_download)}, 解析 {len(pending_parse)}")
+    return {"download": pending_download, "parse": pending_parse}
+
+
+def print_download_summary(label: str, results: list):
+    """列印下載統計"""
+    success = sum(1 for r in results if r.status == DownloadStatus.SUCCESS)
+    already = sum(1 for r in results if r.status == DownloadStatus.ALREADY_EXISTS)
+    failed = len(results) - success - already
+    print(f"\n{label}: 成功 {success}, 已存在 {already}, 失敗 {failed}")
+    logger.info(f"{label}: 成功 {success}, 已存在 {already}, 失敗 {failed}")
+
+
 def parse_bank_input(banks: list) -> list:
     """解析銀行輸入（支援代碼或名稱）"""
     bank_codes = []
@@ -250,23 +810,159 @@ async def main():
                 print(f"指定銀行: {[BANK_CODES[c] for c in bank_codes]}")
                 logger.info(f"指定銀行: {[BANK_CODES[c] for c in bank_codes]}")
         
+        # 內容定址儲存
+        if args.dedupe:
+            store = BlobStore(str(Path(__file__).parent / "data"))
+            saved = store.store_all()
+            removed = store.gc()
+            print(f"\n已納入 {len(store)} 個檔案，重複內容省下 {saved / 1024 / 1024:.1f} MB，清除 {removed} 個舊版本")
+            logger.info(f"內容定址儲存: {len(store)} 個檔案, 省下 {saved} bytes, 清除 {removed} 個 blob")
+            return
+        
+        ledger = Ledger.for_data_dir(str(Path(__file__).parent / "data"))
+        quarters = parse_quarter_range(args.quarter_range) if args.quarter_range else [(year, quarter)]
+        
+        # 列出待辦工作
+        if args.plan:
+            print_plan(ledger, quarters, bank_codes)
+            return
+        
+        # 繼續上一次中斷的執行
+        if args.resume:
+            run = ledger.last_unfinished_run()
+            if run is None:
+                print("\n沒有中斷的執行")
+                return
+            scope = run.scope
+            print(f"\n繼續執行 #{run.id}（{run.started_at}, {scope.get('mode')}）")
+            logger.info(f"繼續執行: #{run.id}, 範圍: {scope}")
+            
+            if scope.get("mode") == "harvest":
+                await run_harvest(
+                    scope.get("bank_codes"), args.parallel,
+                    block_resources=args.block_resources,
+                    headed_concurrent=args.headed_parallel,
+                    ledger=ledger, run_id=run.id,
+                    show_timings=args.timings,
+                    trace=args.trace,
+                )
+            else:
+                run_quarters = [tuple(q) for q in scope.get("quarters", [])]
+                if scope.get("download", True):
+                    results = await run_range_download(
+                        run_quarters, scope.get("bank_codes"), args.parallel,
+                        block_resources=args.block_resources,
+                        revalidate=scope.get("revalidate", False),
+                        headed_concurrent=args.headed_parallel,
+                        max_attempts=args.retries,
+                        ledger=ledger, run_id=run.id, resume=True,
+                        show_timings=args.timings,
+                        trace=args.trace,
+                    )
+                    print_download_summary(
+                        "續跑下載統計", [r for quarter_results in results.values() for r in quarter_results.values()]
+                    )
+                if scope.get("report"):
+                    for run_year, run_quarter in run_quarters:
+                        run_report(
+                            f"{run_year}Q{run_quarter}", ledger, run.id,
+                            workers=args.workers, use_cache=not args.no_parse_cache,
+                        )
+            ledger.finish_run(run.id)
+            return
+        
+        # 範圍下載
+        if args.quarter_range:
+            run_id = ledger.start_run("main", {
+                "mode": "range", "quarters": quarters, "bank_codes": bank_codes,
+                "download": True, "report": False, "revalidate": args.revalidate,
+            })
+            results = await run_range_download(
+                quarters, bank_codes, args.parallel,
+                block_resources=args.block_resources,
+                revalidate=args.revalidate,
+                headed_concurrent=args.headed_parallel,
+                max_attempts=args.retries,
+                ledger=ledger, run_id=run_id,
+                show_timings=args.timings,
+                trace=args.trace,
+            )
+            ledger.finish_run(run_id)
+            print_download_summary(
+                "範圍下載統計", [r for quarter_results in results.values() for r in quarter_results.values()]
+            )
+            return
+        
+        # 多季度模式
+        if args.harvest:
+            run_id = ledger.start_run("main", {"mode": "harvest", "bank_codes": bank_codes})
+            results = await run_harvest(
+                bank_codes, args.parallel,
+                block_resources=args.block_resources,
+                headed_concurrent=args.headed_parallel,
+                ledger=ledger, run_id=run_id,
+                show_timings=args.timings,
+                trace=args.trace,
+            )
+            ledger.finish_run(run_id)
+            attempted = [r for bank_results in results.values() for r in bank_results.values()]
+            success = sum(1 for r in attempted if r.status == DownloadStatus.SUCCESS)
+            print(f"\n多季度下載統計: 成功 {success}, 失敗 {len(attempted) - success}")
+            logger.info(f"多季度下載統計: 成功 {success}, 失敗 {len(attempted) - success}")
+            return
+        
+        run_id = ledger.start_run("main", {
+            "mode": "quarter", "quarters": quarters, "bank_codes": bank_codes,
+            "download": not args.report_only, "report": not args.download_only,
+            "revalidate": args.revalidate,
+        })
+        
+        # 下載與解析管線（取代下面分開的下載與報表）
+        pipelined = args.pipeline and not args.report_only and not args.download_only
+        if pipelined:
+            results, df = await run_pipeline(
+                year, quarter, bank_codes, args.parallel,
+                block_resources=args.block_resources,
+                revalidate=args.revalidate,
+                headed_concurrent=args.headed_parallel,
+                max_attempts=args.retries,
+                ledger=ledger, run_id=run_id,
+                show_timings=args.timings,
+                trace=args.trace,
+                workers=args.workers,
+                use_cache=not args.no_parse_cache,
+            )
+            print_download_summary("下載統計", list(results.values()))
+            if not df.empty:
+                print(f"\n報表已生成，共 {len(df)} 筆資料")
+        
         # 執行下載
-        if not args.report_only:
-            results = await run_download(year, quarter, bank_codes, args.parallel)
+        if not args.report_only and not pipelined:
+            results = await run_download(
+                year, quarter, bank_codes, args.parallel,
+                block_resources=args.block_resources,
+                revalidate=args.revalidate,
+                headed_concurrent=args.headed_parallel,
+                max_attempts=args.retries,
+                ledger=ledger, run_id=run_id,
+                show_timings=args.timings,
+                trace=args.trace,
+            )
             
             # 統計結果
-            success = sum(1 for r in results.values() if r.status == DownloadStatus.SUCCESS)
-            already = sum(1 for r in results.values() if r.status == DownloadStatus.ALREADY_EXISTS)
-            failed = len(results) - success - already
-            print(f"\n下載統計: 成功 {success}, 已存在 {already}, 失敗 {failed}")
-            logger.info(f"下載統計: 成功 {success}, 已存在 {already}, 失敗 {failed}")
+            print_download_summary("下載統計", list(results.values()))
         
         # 生成報表
-        if not args.download_only:
-            df = run_report(year_quarter)
+        if not args.download_only and not pipelined:
+            df = run_report(
+                year_quarter, ledger, run_id,
+                workers=args.workers, use_cache=not args.no_parse_cache,
+            )
             if df is not None and not df.empty:
                 print(f"\n報表已生成，共 {len(df)} 筆資料")
         
+        ledger.finish_run(run_id)
+        
         print(f"\n{'='*60}")
         print("處理完成！")
         print(f"{'='*60}")
@@ -8,28 +8,43 @@
 1. 表格模式 (pdfplumber extract_tables) - 適用於標準表格格式
 2. 文字模式 (純文字解析) - 適用於特殊排版的 PDF
 
-支援多工並行解析 PDF 檔案以提升效能。
+安裝 PyMuPDF 時先以關鍵字預篩頁面（utils/pdf_text.py），
+pdfplumber 只對候選頁面做版面分析與表格擷取。
+之前解析成功過的銀行則先探測頁碼索引（utils/page_index.py）記錄的頁面。
+
+支援多行程並行解析 PDF 檔案以提升效能（預設並行數為 CPU 核心數）。
 """
 
 import os
 import re
+import time
+import asyncio
+import hashlib
+import inspect
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, Optional, List, Tuple
+from dataclasses import asdict, dataclass
 
 import pandas as pd
 import pdfplumber
 
+from utils.blob_store import BlobStore
+from utils import pdf_text
+from utils.page_index import PageIndex, PageIndexUpdates, PageLocation, report_type_of
+from utils.parse_cache import ParseCache
+from utils.pdf_text import candidate_pages
+
 
 # ============================================================
 # Logging 設定
 # ============================================================
 
 def setup_logging() -> logging.Logger:
-    """設定 logging"""
+    """設定 logging（第一次產生報表時才建立記錄檔，匯入本模組不會開檔）"""
     log_dir = Path(__file__).parent / "logs"
     log_dir.mkdir(exist_ok=True)
     
@@ -51,8 +66,8 @@ def setup_logging() -> logging.Logger:
     
     return logger
 
-# 初始化 logger
-logger = setup_logging()
+# 取得 logger（handler 由 setup_logging 在產生報表時加入）
+logger = logging.getLogger("bank_report")
 
 
 @dataclass
@@ -157,13 +172,18 @@ def extract_year_quarter_from_filename(filename: str) -> tuple[str, str]:
     return "", ""
 
 
-def find_asset_quality_pages(pdf: pdfplumber.PDF) -> list[tuple]:
+def find_asset_quality_pages(pdf: pdfplumber.PDF, page_numbers: Optional[List[int]] = None) -> list[tuple]:
     """
     找到所有包含「資產品質」的頁面，按相關性排序。
+    
+    Args:
+        pdf: pdfplumber PDF 物件
+        page_numbers: 只檢查這些頁面（預篩結果，從 0 開始），None 表示逐頁檢查
     """
     candidates = []
+    pages = pdf.pages if page_numbers is None else [pdf.pages[i] for i in page_numbers]
     
-    for page in pdf.pages:
+    for page in pages:
         text = page.extract_text() or ""
         if "資產品質" not in text:
             continue
@@ -425,120 +445,279 @@ def extract_feib_by_position(page, year: str, quarter: str, bank_code: int, bank
     return results
 
 
-def extract_asset_quality_data(pdf_path: str, bank_code: int, bank_name: str, force_year_quarter: str = None) -> list[AssetQualityRow]:
+def _extract_from_pages(pages_info: list[tuple], year: str, quarter: str, bank_code: int, bank_name: str) -> tuple:
+    """
+    依序嘗試各頁面，取得第一個解析出資料的頁面。
+    
+    Args:
+        pages_info: find_asset_quality_pages 的結果
+        
+    Returns:
+        (資料列表, 取得資料的頁面)，都解析不到時頁面為 None
+    """
+    for page, has_table in pages_info:
+        text = page.extract_text() or ""
+        results = []
+        
+        # 強制使用檔名/指定的年度季度
+        # （不再從 PDF 內容提取，避免抓到錯誤時間段的資料）
+        
+        if has_table:
+            # 表格模式
+            tables = page.extract_tables()
+            for table in tables:
+                if len(table) >= 5:  # 至少需要 5 列才是有效表格
+                    rows = extract_from_table(table, year, quarter, bank_code, bank_name)
+                    if rows:
+                        results.extend(rows)
+                        break
+        
+        if not results:
+            # 文字模式（備援）
+            rows = extract_from_text(text, year, quarter, bank_code, bank_name)
+            if rows:
+                results.extend(rows)
+        
+        # 如果已經有結果就不再繼續
+        if results:
+            return results, page
+    
+    return [], None
+
+
+def _extract_feib(pdf: pdfplumber.PDF, page_numbers: Optional[List[int]], year: str, quarter: str, bank_code: int, bank_name: str) -> tuple:
+    """
+    遠東銀行：依序嘗試各頁面的位置解析。
+    
+    Returns:
+        (資料列表, 取得資料的頁面)，都解析不到時頁面為 None
+    """
+    pages = pdf.pages if page_numbers is None else [pdf.pages[i] for i in page_numbers]
+    for page in pages:
+        text = page.extract_text() or ""
+        if "資產品質" in text:
+            # 使用預設的年度季度
+            results = extract_feib_by_position(page, year, quarter, bank_code, bank_name)
+            if results:
+                return results, page
+    return [], None
+
+
+# ============================================================
+# 解析版本（解析快取的鍵值）
+# ============================================================
+
+# 只用於特定銀行的解析器（銀行名稱關鍵字 → 函式）：修改時只有該銀行的快取失效
+BANK_SPECIFIC_PARSERS = {
+    "遠東": (extract_feib_by_position, _extract_feib),
+}
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _parser_versions() -> Tuple[str, Dict[str, str]]:
+    """
+    由解析程式原始碼計算版本，程式碼變更時快取自動失效。
+    
+    只納入會影響資料列的程式（GENERIC_PARSERS、頁面預篩與頁碼探測），
+    調整 Excel 輸出、記錄檔或命令列不會讓快取失效。
+    
+    Returns:
+        (通用解析版本, {銀行名稱關鍵字: 專用解析器版本})；
+        通用版本另含業務別對應表與 pdfplumber 版本
+    """
+    sources = [inspect.getsource(parser) for parser in GENERIC_PARSERS]
+    sources.append(Path(pdf_text.__file__).read_text(encoding="utf-8"))
+    bank_versions = {
+        keyword: _digest(*(inspect.getsource(function) for function in functions))
+        for keyword, functions in BANK_SPECIFIC_PARSERS.items()
+    }
+    return _digest(*sources, repr(SUBJECT_MAPPING), pdfplumber.__version__), bank_versions
+
+
+def bank_profile(bank_code: int, bank_name: str) -> str:
+    """銀行設定版本：銀行代碼、名稱與適用的專用解析器版本"""
+    versions = [version for keyword, version in _BANK_PARSER_VERSIONS.items() if keyword in bank_name]
+    return "_".join([str(bank_code), bank_name, *versions])
+
+
+def _resolve_year_quarter(pdf_path: str, force_year_quarter: str = None) -> Tuple[str, str]:
+    """資料列使用的年度季度：強制指定的值優先，否則取自檔名（不從 PDF 內容提取）"""
+    # 從檔名預先提取年度季度
+    filename = os.path.basename(pdf_path)
+    year, quarter = extract_year_quarter_from_filename(filename)
+    
+    # 如果有強制指定的年度季度，優先使用
+    if force_year_quarter:
+        match = re.match(r'(\d+)Q(\d+)', force_year_quarter)
+        if match:
+            year = match.group(1)
+            quarter = f"Q{match.group(2)}"
+    return year, quarter
+
+
+def _cache_key(cache: ParseCache, pdf_path: str, bank_code: int, bank_name: str, year: str, quarter: str) -> Optional[str]:
+    """計算解析快取鍵值（檔案無法讀取時回傳 None，不使用快取）"""
+    try:
+        return cache.key(pdf_path, bank_profile(bank_code, bank_name), f"{year}{quarter}")
+    except OSError:
+        return None
+
+
+def extract_asset_quality_data(
+    pdf_path: str,
+    bank_code: int,
+    bank_name: str,
+    force_year_quarter: str = None,
+    page_index: Optional[PageIndex] = None,
+    cache: Optional[ParseCache] = None,
+) -> list[AssetQualityRow]:
     """
     從 PDF 提取資產品質資料。
     
+    有解析快取時先以 (PDF 雜湊, 解析版本, 銀行設定版本) 查詢，命中就不開啟 PDF；
+    解析完成（包含解析不到資料）後寫回快取，發生例外時不寫。
+    
     Args:
         pdf_path: PDF 檔案路徑
         bank_code: 銀行代碼
         bank_name: 銀行名稱
         force_year_quarter: 強制指定年度季度（如 "114Q2"），優先使用此值
+        page_index: 頁碼索引（None 表示不使用）
+        cache: 解析快取（None 表示不使用）
         
     Returns:
         資產品質資料列表（最多 8 筆資料）
     """
-    results = []
+    # 強制使用檔名/指定的年度季度，不從 PDF 內容提取
+    year, quarter = _resolve_year_quarter(pdf_path, force_year_quarter)
     
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # 從檔名預先提取年度季度
-            filename = os.path.basename(pdf_path)
-            default_year, default_quarter = extract_year_quarter_from_filename(filename)
-            
-            # 如果有強制指定的年度季度，優先使用
-            if force_year_quarter:
-                import re
-                match = re.match(r'(\d+)Q(\d+)', force_year_quarter)
-                if match:
-                    default_year = match.group(1)
-                    default_quarter = f"Q{match.group(2)}"
-            
-            # 強制使用檔名/指定的年度季度，不從 PDF 內容提取
-            year, quarter = default_year, default_quarter
-            
-            # 遠東銀行專用解析器（文字被拆散成單字排列）
-            if "遠東" in bank_name:
-                # 找資產品質頁面（通常是第3頁）
-                for page in pdf.pages:
-                    text = page.extract_text() or ""
-                    if "資產品質" in text:
-                        # 使用預設的年度季度
-                        results = extract_feib_by_position(page, year, quarter, bank_code, bank_name)
-                        if results:
-                            break
-                
-                if results:
-                    return results
-            
-            # 通用解析流程
-            # 找到相關頁面
-            pages_info = find_asset_quality_pages(pdf)
-            if not pages_info:
-                print(f"[警告] {bank_name}: 找不到資產品質頁面")
-                return results
-            
-            # 嘗試從各頁面提取資料
-            for page, has_table in pages_info:
-                text = page.extract_text() or ""
-                
-                # 強制使用檔名/指定的年度季度
-                # （不再從 PDF 內容提取，避免抓到錯誤時間段的資料）
-                
-                if has_table:
-                    # 表格模式
-                    tables = page.extract_tables()
-                    for table in tables:
-                        if len(table) >= 5:  # 至少需要 5 列才是有效表格
-                            rows = extract_from_table(table, year, quarter, bank_code, bank_name)
-                            if rows:
-                                results.extend(rows)
-                                break
-                
-                if not results:
-                    # 文字模式（備援）
-                    rows = extract_from_text(text, year, quarter, bank_code, bank_name)
-                    if rows:
-                        results.extend(rows)
-                
-                # 如果已經有結果就不再繼續
-                if results:
-                    break
-            
-            # 去重（按 subject）
-            seen = set()
-            unique_results = []
-            for row in results:
-                if row.subject not in seen:
-                    seen.add(row.subject)
-                    unique_results.append(row)
-            
-            if not unique_results:
-                print(f"[警告] {bank_name}: 無法解析資料（可能是特殊格式）")
-            
-            return unique_results
+    key = _cache_key(cache, pdf_path, bank_code, bank_name, year, quarter) if cache else None
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return [AssetQualityRow(**row) for row in cached]
     
+    try:
+        results = _parse_asset_quality_data(pdf_path, bank_code, bank_name, year, quarter, page_index)
     except Exception as e:
         print(f"[錯誤] {bank_name}: 解析 PDF 失敗 - {e}")
         import traceback
         traceback.print_exc()
+        return []
     
+    if key is not None:
+        cache.put(key, [asdict(row) for row in results], source=os.path.basename(pdf_path))
     return results
 
 
-def _parse_single_pdf(pdf_file: Path, force_year_quarter: str = None) -> Tuple[int, str, List[AssetQualityRow]]:
+def _parse_asset_quality_data(
+    pdf_path: str,
+    bank_code: int,
+    bank_name: str,
+    year: str,
+    quarter: str,
+    page_index: Optional[PageIndex] = None,
+) -> list[AssetQualityRow]:
     """
-    解析單一 PDF 檔案（用於多工執行）
+    以 pdfplumber 解析 PDF（例外由呼叫端處理）。
     
-    Args:
-        pdf_file: PDF 檔案路徑
-        force_year_quarter: 強制指定年度季度（如 "114Q2"）
+    頁面檢查順序：頁碼索引預測的頁面（page_index）→ 關鍵字預篩的候選頁 → 逐頁掃描，
+    前一步解析到資料就不再往下。解析成功時把取得資料的頁碼記錄回索引。
+    """
+    results = []
+    
+    with pdfplumber.open(pdf_path) as pdf:
+        # 先探測頁碼索引預測的頁面（通常只需要分析一、兩頁）
+        page_count = len(pdf.pages)
+        report_type = report_type_of(quarter)
+        probe = page_index.probe(pdf_path, bank_code, report_type, page_count) if page_index else []
+        is_feib = "遠東" in bank_name
         
-    Returns:
-        (銀行代碼, 銀行名稱, 資料列表)
+        hit_page = None
+        if probe:
+            if is_feib:
+                results, hit_page = _extract_feib(pdf, probe, year, quarter, bank_code, bank_name)
+            else:
+                pages_info = find_asset_quality_pages(pdf, probe)
+                results, hit_page = _extract_from_pages(pages_info, year, quarter, bank_code, bank_name)
+            page_index.count(hit=bool(results))
+            if not results:
+                logger.debug(f"頁碼索引未命中: {bank_name}, 探測頁 {[p + 1 for p in probe]}")
+        
+        if not results:
+            # 預篩候選頁面（PyMuPDF 不做版面分析，比 pdfplumber 快很多）；
+            # 無法預篩或沒有候選頁時逐頁掃描
+            page_numbers = candidate_pages(pdf_path) or None
+            
+            # 遠東銀行專用解析器（文字被拆散成單字排列）
+            if is_feib:
+                # 找資產品質頁面（通常是第3頁）
+                results, hit_page = _extract_feib(pdf, page_numbers, year, quarter, bank_code, bank_name)
+            
+            if not results:
+                # 通用解析流程
+                # 找到相關頁面
+                pages_info = find_asset_quality_pages(pdf, page_numbers)
+                if not pages_info and page_numbers is not None:
+                    # 預篩的頁面都不符合時，保險起見再逐頁掃描一次
+                    pages_info = find_asset_quality_pages(pdf)
+                if not pages_info:
+                    print(f"[警告] {bank_name}: 找不到資產品質頁面")
+                    return results
+                
+                # 嘗試從各頁面提取資料
+                results, hit_page = _extract_from_pages(pages_info, year, quarter, bank_code, bank_name)
+        
+        # 去重（按 subject）
+        seen = set()
+        unique_results = []
+        for row in results:
+            if row.subject not in seen:
+                seen.add(row.subject)
+                unique_results.append(row)
+        
+        if not unique_results:
+            print(f"[警告] {bank_name}: 無法解析資料（可能是特殊格式）")
+        elif page_index is not None and hit_page is not None:
+            page_index.record(
+                bank_code, report_type, page_count,
+                hit_page.page_number - 1, hit_page.extract_text() or "",
+            )
+        
+        return unique_results
+
+
+# 會影響解析結果的程式（計算 PARSER_VERSION 用；新增解析步驟時記得加入）
+GENERIC_PARSERS = (
+    AssetQualityRow,
+    parse_number,
+    parse_ratio,
+    extract_year_quarter,
+    extract_year_quarter_from_filename,
+    find_asset_quality_pages,
+    normalize_text,
+    extract_from_table,
+    extract_from_text,
+    _extract_from_pages,
+    _resolve_year_quarter,
+    extract_asset_quality_data,
+    _parse_asset_quality_data,
+    PageLocation.probe_pages,
+    PageIndex.probe,
+)
+
+PARSER_VERSION, _BANK_PARSER_VERSIONS = _parser_versions()
+
+
+def _bank_from_filename(pdf_file: Path) -> Tuple[int, str]:
+    """
+    從檔名提取銀行代碼和名稱
+    
+    檔名格式: {bank_code}_{bank_name}_{year}Q{quarter}.pdf
     """
-    # 從檔名提取銀行代碼和名稱
-    # 檔名格式: {bank_code}_{bank_name}_{year}Q{quarter}.pdf
     filename = pdf_file.stem
     parts = filename.split('_')
     if len(parts) >= 2:
@@ -546,37 +725,170 @@ def _parse_single_pdf(pdf_file: Path, force_year_quarter: str = None) -> Tuple[i
             bank_code = int(parts[0])
         except ValueError:
             bank_code = 99  # 無法解析代碼時使用預設值
-        bank_name = parts[1]
-    else:
-        bank_code = 99
-        bank_name = filename
+        return bank_code, parts[1]
+    return 99, filename
+
+
+def _parse_single_pdf(
+    pdf_file: Path,
+    force_year_quarter: str = None,
+    page_index: Optional[PageIndex] = None,
+    cache: Optional[ParseCache] = None,
+) -> Tuple[int, str, List[AssetQualityRow]]:
+    """
+    解析單一 PDF 檔案（用於多工執行）
+    
+    Args:
+        pdf_file: PDF 檔案路徑
+        force_year_quarter: 強制指定年度季度（如 "114Q2"）
+        page_index: 頁碼索引（None 表示不使用）
+        cache: 解析快取（None 表示不使用）
+        
+    Returns:
+        (銀行代碼, 銀行名稱, 資料列表)
+    """
+    bank_code, bank_name = _bank_from_filename(pdf_file)
     
     try:
-        rows = extract_asset_quality_data(str(pdf_file), bank_code, bank_name, force_year_quarter)
+        rows = extract_asset_quality_data(
+            str(pdf_file), bank_code, bank_name, force_year_quarter, page_index, cache
+        )
         return bank_code, bank_name, rows
     except Exception as e:
         logger.exception(f"解析 PDF 失敗: {bank_name}")
         return bank_code, bank_name, []
 
 
+@dataclass
+class ParseOutcome:
+    """單一 PDF 的解析結果（可跨行程傳遞）"""
+    pdf_file: Path
+    bank_code: int
+    bank_name: str
+    rows: List[AssetQualityRow]
+    elapsed: float                                  # 耗時（秒）
+    error: str = ""
+    index_updates: Optional[PageIndexUpdates] = None  # 子行程的頁碼索引變更
+    cached: bool = False                            # 是否取自解析快取
+    sha256: str = ""                                # PDF 雜湊（計算快取鍵值時取得，未使用快取時為空）
+
+
+# 子行程的頁碼索引與解析快取（_init_worker 建立，整個子行程重複使用）
+_worker_page_index: Optional[PageIndex] = None
+_worker_cache: Optional[ParseCache] = None
+
+
+def _open_cache(index_dir: str, store: Optional[BlobStore] = None) -> ParseCache:
+    """
+    資料目錄的解析快取（以 .manifest.json 的雜湊避免重新讀取 PDF）
+    
+    Args:
+        index_dir: 資料目錄
+        store: 共用的內容定址儲存（例如下載器的），None 表示讀取目前的清單
+    """
+    return ParseCache(index_dir, PARSER_VERSION, store or BlobStore(index_dir))
+
+
+def _init_worker(index_dir: str, use_cache: bool = True):
+    """
+    子行程初始化：設定 logging 並讀取頁碼索引。
+    
+    pdfplumber / pdfminer 在匯入本模組時已載入，子行程建立後即可直接解析，
+    之後每個檔案都不必再付出匯入與讀取索引的成本。
+    """
+    global _worker_page_index, _worker_cache
+    setup_logging()
+    _worker_page_index = PageIndex(index_dir)
+    _worker_cache = _open_cache(index_dir) if use_cache else None
+
+
+def _timed_parse(
+    pdf_file: Path,
+    force_year_quarter: str = None,
+    page_index: Optional[PageIndex] = None,
+    cache: Optional[ParseCache] = None,
+) -> ParseOutcome:
+    """解析單一 PDF 並計時（例外轉為錯誤訊息，不中斷整批解析）"""
+    started = time.perf_counter()
+    try:
+        bank_code, bank_name, rows = _parse_single_pdf(pdf_file, force_year_quarter, page_index, cache)
+        error = ""
+    except Exception as e:
+        (bank_code, bank_name), rows = _bank_from_filename(pdf_file), []
+        error = str(e)
+        logger.exception(f"解析異常: {bank_name}")
+    outcome = ParseOutcome(pdf_file, bank_code, bank_name, rows, time.perf_counter() - started, error)
+    if cache is not None:
+        # 計算快取鍵值時已算過，不會重新讀取 PDF
+        outcome.sha256 = cache.sha256_of(str(pdf_file))
+    return outcome
+
+
+def _cached_outcome(pdf_file: Path, force_year_quarter: str, cache: ParseCache) -> Optional[ParseOutcome]:
+    """在主行程查詢解析快取，命中時不必送進行程池"""
+    started = time.perf_counter()
+    bank_code, bank_name = _bank_from_filename(pdf_file)
+    year, quarter = _resolve_year_quarter(str(pdf_file), force_year_quarter)
+    key = _cache_key(cache, str(pdf_file), bank_code, bank_name, year, quarter)
+    cached = cache.get(key) if key is not None else None
+    if cached is None:
+        return None
+    rows = [AssetQualityRow(**row) for row in cached]
+    return ParseOutcome(
+        pdf_file, bank_code, bank_name, rows, time.perf_counter() - started,
+        cached=True, sha256=cache.sha256_of(str(pdf_file)),
+    )
+
+
+def _parse_in_worker(pdf_file: Path, force_year_quarter: str = None) -> ParseOutcome:
+    """子行程的工作函式：使用子行程自己的頁碼索引，並把索引變更帶回主行程"""
+    outcome = _timed_parse(pdf_file, force_year_quarter, _worker_page_index, _worker_cache)
+    if _worker_page_index is not None:
+        outcome.index_updates = _worker_page_index.take_updates()
+    return outcome
+
+
+def default_workers() -> int:
+    """預設並行數：CPU 核心數"""
+    return os.cpu_count() or 1
+
+
 def generate_report(
     data_dir: str,
     output_path: str,
     year_quarter: str = None,
-    max_workers: int = 10,
+    max_workers: Optional[int] = None,
+    on_parsed: Optional[Callable[[Path, int, float, str, str], None]] = None,
+    use_processes: bool = False,
+    use_cache: bool = True,
 ) -> pd.DataFrame:
     """
     生成資產品質報表（多工並行解析）。
     
+    pdfplumber / pdfminer 是純 Python 且吃 CPU，多執行緒會被 GIL 序列化，
+    命令列（main.py、cli.py）以 use_processes=True 改用行程池解析：子行程建立時先載入套件與頁碼索引，
+    檔案分批送出。行程池以 spawn 建立，子行程會重新匯入呼叫端的主程式，
+    因此呼叫端必須放在 if __name__ == "__main__": 之下；作為函式庫呼叫時預設使用執行緒池。
+    結果依檔名順序收回，輸出與進度順序每次都相同。
+    
     Args:
         data_dir: PDF 資料目錄（例如 data/114Q1）
         output_path: 輸出 Excel 檔案路徑
         year_quarter: 年度季度（例如 114Q1），如果為 None 則從目錄名稱推斷
-        max_workers: 最大並行數量（預設 10）
+        max_workers: 最大並行數量（None 表示 CPU 核心數；1 表示在目前行程逐一解析）
+        on_parsed: 每個 PDF 解析完成後的回呼 (PDF 路徑, 資料筆數, 耗時秒數, 錯誤訊息, PDF 雜湊)；
+            未使用解析快取時雜湊為空字串
+        use_processes: 是否使用行程池（預設 False 使用執行緒池；True 時呼叫端需有 __main__ 保護）
+        use_cache: 是否使用解析快取（False 時全部重新解析，也不寫入快取）
         
     Returns:
         包含所有銀行資料的 DataFrame
+    
+    資產品質表格的頁碼記錄在資料目錄上一層的 .page_index.json（與 .manifest.json 同層），
+    之後的季度優先探測記錄的頁碼。解析結果快取於同一層的 .parse_cache/，
+    PDF 與解析程式都沒有變更時直接取用，只有快取未命中的檔案送進行程池。
     """
+    setup_logging()
     data_path = Path(data_dir)
     
     # 從目錄名稱推斷年度季度
@@ -586,51 +898,119 @@ def generate_report(
     all_data = []
     success_count = 0
     fail_count = 0
+    index_dir = str(data_path.parent)
+    page_index = PageIndex(index_dir)
+    cache = _open_cache(index_dir) if use_cache else None
     
     # 掃描所有 PDF 檔案
     pdf_files = sorted(data_path.glob("*.pdf"))
     total = len(pdf_files)
     print(f"找到 {total} 個 PDF 檔案")
-    print(f"使用 {max_workers} 個執行緒並行解析")
+    
+    # 先在主行程查詢解析快取，只有未命中的檔案需要解析
+    cached = {}
+    if cache is not None:
+        for pdf_file in pdf_files:
+            outcome = _cached_outcome(pdf_file, year_quarter, cache)
+            if outcome is not None:
+                cached[pdf_file] = outcome
+    pending = [pdf_file for pdf_file in pdf_files if pdf_file not in cached]
+    if cached:
+        print(f"解析快取命中 {len(cached)} 個，需要解析 {len(pending)} 個")
+    
+    workers = max(1, min(max_workers or default_workers(), len(pending) or 1))
+    mode = "行程" if use_processes and workers > 1 else "執行緒"
+    if pending:
+        print(f"使用 {workers} 個{mode}並行解析")
     print("="*60)
-    logger.info(f"開始解析報表: {year_quarter}, 共 {total} 個 PDF, 並行數: {max_workers}")
-    
-    # 使用 ThreadPoolExecutor 進行多工解析
-    completed = 0
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # 提交所有任務，傳入 year_quarter 強制指定年度季度
-        future_to_pdf = {
-            executor.submit(_parse_single_pdf, pdf_file, year_quarter): pdf_file 
-            for pdf_file in pdf_files
-        }
-        
-        # 收集結果
-        for future in as_completed(future_to_pdf):
-            completed += 1
-            try:
-                bank_code, bank_name, rows = future.result()
-                if rows:
-                    all_data.extend(rows)
-                    print(f"[{completed:02d}/{total}] ✓ {bank_name}: {len(rows)} 筆資料")
-                    logger.info(f"解析成功: {bank_name}, {len(rows)} 筆")
-                    success_count += 1
-                else:
-                    print(f"[{completed:02d}/{total}] ✗ {bank_name}: 無資料")
-                    logger.warning(f"解析無資料: {bank_name}")
-                    fail_count += 1
-            except Exception as e:
-                pdf_file = future_to_pdf[future]
-                bank_name = pdf_file.stem.split('_')[1] if '_' in pdf_file.stem else pdf_file.stem
-                print(f"[{completed:02d}/{total}] ✗ {bank_name}: 錯誤 - {e}")
-                logger.exception(f"解析異常: {bank_name}")
+    logger.info(
+        f"開始解析報表: {year_quarter}, 共 {total} 個 PDF, 快取命中 {len(cached)}, "
+        f"並行數: {workers}（{mode}）"
+    )
+    
+    # 依檔名順序收回結果（map 保持送出順序），輸出與進度順序固定
+    executor = None
+    if not pending:
+        parsed = iter(())
+    elif workers == 1:
+        parsed = (_timed_parse(pdf_file, year_quarter, page_index, cache) for pdf_file in pending)
+    elif use_processes:
+        # 以 spawn 建立子行程：主行程可能仍有事件迴圈或瀏覽器的執行緒，fork 不安全
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(index_dir, use_cache),
+        )
+        # 分批送出減少行程間往返；每個子行程至少分到約 4 批，大檔案較不會集中在同一批
+        chunksize = max(1, len(pending) // (workers * 4))
+        parsed = executor.map(
+            _parse_in_worker, pending, [year_quarter] * len(pending), chunksize=chunksize
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        parsed = executor.map(
+            lambda pdf_file: _timed_parse(pdf_file, year_quarter, page_index, cache), pending
+        )
+    
+    # 快取命中與解析結果依檔名順序合併
+    outcomes = (cached[pdf_file] if pdf_file in cached else next(parsed) for pdf_file in pdf_files)
+    
+    try:
+        for completed, outcome in enumerate(outcomes, start=1):
+            if outcome.index_updates is not None:
+                page_index.merge_updates(outcome.index_updates)
+            bank_name = outcome.bank_name
+            if on_parsed:
+                on_parsed(outcome.pdf_file, len(outcome.rows), outcome.elapsed, outcome.error, outcome.sha256)
+            source = "（快取）" if outcome.cached else ""
+            if outcome.error:
+                print(f"[{completed:02d}/{total}] ✗ {bank_name}: 錯誤 - {outcome.error}")
                 fail_count += 1
+            elif outcome.rows:
+                all_data.extend(outcome.rows)
+                print(f"[{completed:02d}/{total}] ✓ {bank_name}: {len(outcome.rows)} 筆資料{source}")
+                logger.info(f"解析成功: {bank_name}, {len(outcome.rows)} 筆{source}")
+                success_count += 1
+            else:
+                print(f"[{completed:02d}/{total}] ✗ {bank_name}: 無資料{source}")
+                logger.warning(f"解析無資料: {bank_name}{source}")
+                fail_count += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    if cache is not None:
+        # 解析程式更新後，舊版本的快取不會再被讀取
+        cache.prune()
     
     print("="*60)
     print(f"成功: {success_count}, 失敗: {fail_count}")
-    logger.info(f"解析完成: 成功 {success_count}, 失敗 {fail_count}")
+    if page_index.hits or page_index.misses:
+        print(f"頁碼索引: 命中 {page_index.hits}, 未命中 {page_index.misses}")
+    logger.info(
+        f"解析完成: 成功 {success_count}, 失敗 {fail_count}, "
+        f"頁碼索引命中 {page_index.hits}, 未命中 {page_index.misses}"
+    )
+    page_index.save()
+    
+    return write_report(all_data, output_path, success_count)
+
+
+def write_report(rows: List[AssetQualityRow], output_path: str, bank_count: int) -> pd.DataFrame:
+    """
+    將資料列依銀行代碼排序後輸出為 Excel。
     
+    Args:
+        rows: 所有銀行的資料列
+        output_path: 輸出 Excel 檔案路徑
+        bank_count: 有資料的銀行數（只用於顯示）
+        
+    Returns:
+        包含所有銀行資料的 DataFrame（沒有資料時為空的 DataFrame）
+    """
     # 轉換為 DataFrame
-    if all_data:
+    if rows:
         df = pd.DataFrame([
             {
                 "資料年度": row.year,
@@ -642,7 +1022,7 @@ def generate_report(
                 "銀行代碼": row.bank_code,
                 "銀行名稱": row.bank_name,
             }
-            for row in all_data
+            for row in rows
         ])
         
         # 按銀行代碼排序（依據 refactor/banks 資料夾的順序）
@@ -659,7 +1039,7 @@ def generate_report(
         # 輸出為 Excel
         df_output.to_excel(output_path, index=False, engine='openpyxl')
         print(f"\n報表已輸出: {output_path}")
-        print(f"共 {len(df)} 筆資料（{success_count} 家銀行）")
+        print(f"共 {len(df)} 筆資料（{bank_count} 家銀行）")
         
         return df
     else:
@@ -667,6 +1047,98 @@ def generate_report(
         return pd.DataFrame()
 
 
+class ParseWorkers:
+    """
+    逐一送入 PDF 的非同步解析池（下載與解析管線使用）。
+    
+    與 generate_report 相同：主行程先查解析快取，未命中的檔案交給行程池，
+    子行程的頁碼索引變更帶回主行程合併，結束時寫回頁碼索引。
+    快取查詢與雜湊計算在執行緒中進行，不阻塞同時進行的下載；傳入下載器的 BlobStore 時，
+    剛下載的檔案直接使用清單中的雜湊。
+    進入時就先讓子行程暖機（載入 pdfplumber 與頁碼索引），第一個檔案下載完成時可以直接解析。
+    
+    使用方式:
+        with ParseWorkers("data/114Q1", max_workers=4) as workers:
+            outcome = await workers.parse(Path("data/114Q1/31_玉山商業銀行_114Q1.pdf"))
+    """
+    
+    def __init__(
+        self,
+        data_dir: str,
+        year_quarter: str = None,
+        max_workers: Optional[int] = None,
+        use_cache: bool = True,
+        store: Optional[BlobStore] = None,
+    ):
+        """
+        Args:
+            data_dir: PDF 資料目錄（例如 data/114Q1）
+            year_quarter: 年度季度（例如 114Q1），如果為 None 則從目錄名稱推斷
+            max_workers: 並行行程數（None 表示 CPU 核心數）
+            use_cache: 是否使用解析快取
+            store: 共用的內容定址儲存（下載器的 blob_store），None 表示讀取目前的清單
+        """
+        data_path = Path(data_dir)
+        self.year_quarter = year_quarter or data_path.name
+        self.workers = max(1, max_workers or default_workers())
+        self.index_dir = str(data_path.parent)
+        self.use_cache = use_cache
+        self.page_index = PageIndex(self.index_dir)
+        self.store = store or BlobStore(self.index_dir)
+        self.cache = _open_cache(self.index_dir, self.store) if use_cache else None
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def __enter__(self) -> "ParseWorkers":
+        setup_logging()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.index_dir, self.use_cache),
+        )
+        # 先送出空工作讓子行程啟動並執行初始化，與下載同時進行
+        for _ in range(self.workers):
+            self._executor.submit(_warm_up)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    async def parse(self, pdf_file: Path) -> ParseOutcome:
+        """
+        解析單一 PDF（快取命中時不送進行程池）
+        
+        Args:
+            pdf_file: PDF 檔案路徑
+        """
+        if self.cache is not None:
+            outcome = await asyncio.to_thread(_cached_outcome, pdf_file, self.year_quarter, self.cache)
+            if outcome is not None:
+                return outcome
+        loop = asyncio.get_running_loop()
+        outcome = await loop.run_in_executor(
+            self._executor, _parse_in_worker, pdf_file, self.year_quarter
+        )
+        if outcome.index_updates is not None:
+            self.page_index.merge_updates(outcome.index_updates)
+        if not outcome.sha256:
+            outcome.sha256 = await asyncio.to_thread(self.store.sha256_of, str(pdf_file))
+        return outcome
+    
+    def close(self):
+        """關閉行程池並寫回頁碼索引"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self.page_index.save()
+        if self.cache is not None:
+            self.cache.prune()
+
+
+def _warm_up():
+    """子行程暖機用的空工作（初始化已在 _init_worker 完成）"""
+
+
 def generate_single_bank_report(
     pdf_path: str,
     bank_code: int,
@@ -685,6 +1157,7 @@ def generate_single_bank_report(
     Returns:
         該銀行的資產品質 DataFrame
     """
+    setup_logging()
     rows = extract_asset_quality_data(pdf_path, bank_code, bank_name)
     
     if rows:
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+離線下載計時（HAR 錄製 / 重播）
+
+先連網錄製一次各銀行的瀏覽過程與 PDF，之後在離線環境以相同流程
+（並行控制、節流、重試）重複下載並計時，不受銀行網站狀況影響。
+
+使用方式:
+    # 錄製（連網，寫入 tests/har/114Q1）
+    python tests/benchmark_replay.py record 114Q1
+    python tests/benchmark_replay.py record 114Q1 --banks 2 18 31
+    
+    # 重播計時（離線，每次使用新的暫存資料目錄）
+    python tests/benchmark_replay.py replay 114Q1 --repeat 3 --parallel 5
+    
+    # 比較錄製失敗 trace 的額外耗時（trace 寫入暫存目錄）
+    python tests/benchmark_replay.py replay 114Q1 --repeat 3 --parallel 5 --trace
+"""
+import argparse
+import asyncio
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 將 refactor 目錄加入路徑
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from downloader import BankDownloader, BANK_CODES
+from banks.base import DownloadStatus
+from banks.replay import RECORD, REPLAY
+
+
+DEFAULT_HAR_ROOT = Path(__file__).parent / "har"
+
+
+async def run_once(
+    mode: str,
+    har_dir: Path,
+    year: int,
+    quarter: int,
+    bank_names: list,
+    parallel: int,
+    retries: int,
+    trace: bool = False,
+) -> dict:
+    """以全新的暫存資料目錄下載一次，回傳計時與結果"""
+    with tempfile.TemporaryDirectory(prefix="bank_replay_") as data_dir:
+        downloader = BankDownloader(
+            data_dir=data_dir,
+            max_attempts=retries,
+            har_dir=str(har_dir),
+            har_mode=mode,
+            trace_dir=str(Path(data_dir) / "traces") if trace else None,
+        )
+        start = time.perf_counter()
+        results = await downloader.download_banks(bank_names, year, quarter, parallel)
+        elapsed = time.perf_counter() - start
+        misses = downloader.har.misses
+    
+    ok = [name for name, r in results.items() if r.status in (DownloadStatus.SUCCESS, DownloadStatus.ALREADY_EXISTS)]
+    failed = {name: r.message for name, r in results.items() if name not in ok}
+    return {"elapsed": elapsed, "ok": ok, "failed": failed, "misses": misses}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="離線下載計時（HAR 錄製 / 重播）")
+    parser.add_argument("mode", choices=[RECORD, REPLAY], help="record: 連網錄製; replay: 離線重播計時")
+    parser.add_argument("year_quarter", help="年度季度，例如 114Q1")
+    parser.add_argument("--banks", nargs="+", type=int, help="銀行代碼（預設: 全部）")
+    parser.add_argument("--har-dir", help="HAR 目錄（預設: tests/har/{year_quarter}）")
+    parser.add_argument("--parallel", "-p", type=int, default=5, help="無頭瀏覽器並行上限（預設: 5）")
+    parser.add_argument("--retries", type=int, default=3, help="暫時性失敗的最多嘗試次數（預設: 3）")
+    parser.add_argument("--repeat", type=int, default=3, help="重播次數（預設: 3，錄製固定 1 次）")
+    parser.add_argument("--trace", action="store_true", help="錄製失敗 trace（比較錄製的額外耗時）")
+    args = parser.parse_args()
+    
+    match = re.fullmatch(r"(\d+)Q([1-4])", args.year_quarter)
+    if not match:
+        parser.error(f"無效的年度季度格式: {args.year_quarter}")
+    year, quarter = int(match.group(1)), int(match.group(2))
+    
+    har_dir = Path(args.har_dir) if args.har_dir else DEFAULT_HAR_ROOT / args.year_quarter
+    codes = args.banks or list(BANK_CODES)
+    bank_names = [BANK_CODES[c] for c in codes if c in BANK_CODES]
+    
+    if args.mode == REPLAY and not har_dir.exists():
+        print(f"[錯誤] 找不到 HAR 目錄: {har_dir}，請先執行 record")
+        sys.exit(1)
+    
+    repeat = 1 if args.mode == RECORD else max(1, args.repeat)
+    print(f"\n{'='*60}")
+    print(f"{'錄製' if args.mode == RECORD else '重播'} {args.year_quarter}（{len(bank_names)} 家銀行，"
+          f"並行數: {args.parallel}，次數: {repeat}{'，錄製 trace' if args.trace else ''}）")
+    print(f"HAR 目錄: {har_dir}")
+    print(f"{'='*60}\n")
+    
+    timings = []
+    for i in range(1, repeat + 1):
+        run = asyncio.run(run_once(
+            args.mode, har_dir, year, quarter, bank_names, args.parallel, args.retries, args.trace
+        ))
+        timings.append(run["elapsed"])
+        print(f"\n[第 {i} 次] {run['elapsed']:.2f} 秒，成功 {len(run['ok'])}/{len(bank_names)}"
+              + (f"，HAR 未命中 {run['misses']} 次" if run["misses"] else ""))
+        for name, message in run["failed"].items():
+            print(f"  ✗ {name}: {message}")
+    
+    if len(timings) > 1:
+        print(f"\n{'='*60}")
+        print(f"最短 {min(timings):.2f} 秒，中位數 {statistics.median(timings):.2f} 秒，最長 {max(timings):.2f} 秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+pytest 設定
+
+test_all.py 是連網下載所有銀行的批次腳本（以 python tests/test_all.py 執行），不列入 pytest 收集；
+其餘 test_*.py 都是離線測試，直接執行 python -m pytest -q tests 即可。
+"""
+collect_ignore = ["test_all.py"]
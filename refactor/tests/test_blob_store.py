@@ -0,0 +1,116 @@
+"""
+內容定址儲存測試（離線，不需要網路）
+"""
+import os
+import sys
+from unittest import mock
+
+# 加入 refactor 目錄到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.blob_store import BlobStore, sha256_file
+
+
+def write_pdf(data_dir, name, content):
+    quarter_dir = data_dir / name.rsplit("_", 1)[1][:-4]
+    quarter_dir.mkdir(exist_ok=True)
+    path = quarter_dir / name
+    path.write_bytes(content)
+    return path
+
+
+def test_store_links_file_to_blob(tmp_path):
+    store = BlobStore(str(tmp_path))
+    path = write_pdf(tmp_path, "1_A_114Q1.pdf", b"%PDF same")
+    sha256 = sha256_file(str(path))
+
+    entry = store.store(str(path), source_url="https://example.com/a.pdf")
+    assert entry.sha256 == sha256
+    assert entry.link == "hardlink"
+    assert os.path.samefile(store.blob_path(sha256), path)
+    assert store.get(str(path)) == entry
+
+    # 清單寫回後重新開啟仍可取得
+    reopened = BlobStore(str(tmp_path))
+    assert reopened.get(str(path)).source_url == "https://example.com/a.pdf"
+
+
+def test_duplicate_content_shares_one_blob(tmp_path):
+    store = BlobStore(str(tmp_path))
+    first = write_pdf(tmp_path, "1_A_114Q1.pdf", b"%PDF same")
+    second = write_pdf(tmp_path, "1_A_114Q2.pdf", b"%PDF same")
+
+    store.store(str(first))
+    store.store(str(second))
+    assert len(list(store.blob_dir.glob("*/*.pdf"))) == 1
+    assert sorted(store.find_by_hash(sha256_file(str(first)))) == ["114Q1/1_A_114Q1.pdf", "114Q2/1_A_114Q2.pdf"]
+
+
+def test_symlink_fallback_keeps_manifest_key(tmp_path):
+    store = BlobStore(str(tmp_path))
+    path = write_pdf(tmp_path, "1_A_114Q1.pdf", b"%PDF symlink")
+
+    with mock.patch("os.link", side_effect=OSError):
+        entry = store.store(str(path))
+    assert entry.link == "symlink"
+    assert path.is_symlink()
+    assert path.read_bytes() == b"%PDF symlink"
+    # 鍵值是原本的路徑，不是連結指向的 blob
+    assert store.get(str(path)) == entry
+    assert store.sha256_of(str(path)) == entry.sha256
+
+
+def test_copy_fallback(tmp_path):
+    store = BlobStore(str(tmp_path))
+    path = write_pdf(tmp_path, "1_A_114Q1.pdf", b"%PDF copy")
+
+    with mock.patch("os.link", side_effect=OSError), mock.patch("os.symlink", side_effect=OSError):
+        entry = store.store(str(path))
+    assert entry.link == "copy"
+    assert not path.is_symlink()
+    assert not os.path.samefile(store.blob_path(entry.sha256), path)
+    assert store.get(str(path)) == entry
+
+
+def test_store_again_keeps_download_time(tmp_path):
+    store = BlobStore(str(tmp_path))
+    path = write_pdf(tmp_path, "1_A_114Q1.pdf", b"%PDF again")
+
+    first = store.store(str(path), source_url="https://example.com/a.pdf")
+    second = store.store(str(path))
+    assert second.downloaded_at == first.downloaded_at
+    assert second.source_url == first.source_url
+    assert len(store) == 1
+
+
+def test_gc_removes_unreferenced_blobs(tmp_path):
+    store = BlobStore(str(tmp_path))
+    kept = write_pdf(tmp_path, "1_A_114Q1.pdf", b"%PDF kept")
+    replaced = write_pdf(tmp_path, "2_B_114Q1.pdf", b"%PDF old")
+    store.store(str(kept))
+    old = store.store(str(replaced))
+
+    # 來源更新：同一路徑換成新內容
+    replaced.unlink()
+    replaced.write_bytes(b"%PDF new")
+    store.store(str(replaced))
+    assert store.gc() == 1
+    assert not store.blob_path(old.sha256).exists()
+
+    # 檔案被刪除後清單項目與 blob 一併移除
+    kept_sha = store.get(str(kept)).sha256
+    kept.unlink()
+    assert store.gc() == 1
+    assert store.get(str(kept)) is None
+    assert not store.blob_path(kept_sha).exists()
+
+
+def test_sha256_of_is_memoized(tmp_path):
+    store = BlobStore(str(tmp_path))
+    path = write_pdf(tmp_path, "1_A_114Q1.pdf", b"%PDF memo")
+    expected = sha256_file(str(path))
+
+    with mock.patch("utils.blob_store.sha256_file", wraps=sha256_file) as hashed:
+        assert store.sha256_of(str(path)) == expected
+        assert store.sha256_of(str(path)) == expected
+    assert hashed.call_count == 1
@@ -0,0 +1,78 @@
+"""
+季度範圍與多季度排程測試（離線，以假的下載取代瀏覽器）
+"""
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+
+import pytest
+
+# 加入 refactor 目錄到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from banks.base import DownloadResult, DownloadStatus
+from banks.rate_limit import HostThrottle
+from downloader import BankDownloader
+from main import parse_quarter_range
+
+
+def offline_downloader(tmp_path, delays):
+    """session 不啟動瀏覽器、download 依 delays 等待後回傳成功"""
+    downloader = BankDownloader(data_dir=str(tmp_path))
+    calls = []
+    active = {}
+
+    @asynccontextmanager
+    async def session():
+        downloader.throttle = HostThrottle()
+        yield downloader
+
+    async def download(bank_name, year, quarter, revalidate=False):
+        active[bank_name] = active.get(bank_name, 0) + 1
+        calls.append((bank_name, year, quarter, dict(active)))
+        await asyncio.sleep(delays.get(bank_name, 0))
+        active[bank_name] -= 1
+        return DownloadResult(status=DownloadStatus.SUCCESS, message="ok")
+
+    downloader.session = session
+    downloader.download = download
+    return downloader, calls
+
+
+def test_parse_quarter_range():
+    assert parse_quarter_range("113Q3:114Q1") == [(114, 1), (113, 4), (113, 3)]
+    assert parse_quarter_range("114Q1:113Q3") == [(114, 1), (113, 4), (113, 3)]
+    assert parse_quarter_range("114Q2:114Q2") == [(114, 2)]
+    with pytest.raises(ValueError):
+        parse_quarter_range("114Q1")
+    with pytest.raises(ValueError):
+        parse_quarter_range("114:113Q1")
+
+
+def test_download_range_covers_every_job(tmp_path):
+    downloader, calls = offline_downloader(tmp_path, {})
+    quarters = parse_quarter_range("113Q4:114Q1")
+    results = asyncio.run(downloader.download_range(["A", "B", "C"], quarters, max_concurrent=2))
+
+    assert set(results) == {(114, 1), (113, 4)}
+    assert all(set(r) == {"A", "B", "C"} for r in results.values())
+    assert sorted(call[:3] for call in calls) == sorted(
+        (bank, year, quarter) for year, quarter in quarters for bank in "ABC"
+    )
+    # 依 quarters 順序排程：新的季度先開始
+    assert calls[0][1:3] == (114, 1)
+
+
+def test_download_range_one_quarter_per_bank(tmp_path):
+    # A 很慢：其他工作者先處理 B 的各季度，不會同時下載 A 的兩個季度
+    downloader, calls = offline_downloader(tmp_path, {"A": 0.05})
+    quarters = parse_quarter_range("113Q3:114Q1")
+    asyncio.run(downloader.download_range(["A", "B"], quarters, max_concurrent=2))
+
+    assert all(active[bank] == 1 for bank, _, _, active in calls)
+    b_jobs = [call[1:3] for call in calls if call[0] == "B"]
+    assert b_jobs == quarters
+    # B 的三個季度都在 A 的第二個季度之前開始
+    order = [call[:3] for call in calls]
+    assert order.index(("A", 113, 4)) > order.index(("B", 113, 3))
@@ -0,0 +1,124 @@
+"""
+執行紀錄資料庫測試（離線，不需要網路）
+"""
+import asyncio
+import os
+import sys
+
+# 加入 refactor 目錄到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from banks.base import BaseBankDownloader, DownloadStatus
+from downloader import BankDownloader
+from utils.ledger import STAGE_DOWNLOAD, STAGE_PARSE, Ledger
+
+
+class FakeBankDownloader(BaseBankDownloader):
+    bank_name = "測試銀行"
+    bank_code = 99
+    bank_url = "https://example.com"
+
+    async def _download(self, page, year, quarter):
+        raise AssertionError("續跑時不應實際下載")
+
+
+def make_ledger(tmp_path):
+    return Ledger(str(tmp_path / ".ledger.sqlite"))
+
+
+def test_plan_keeps_jobs_without_success(tmp_path):
+    ledger = make_ledger(tmp_path)
+    run_id = ledger.start_run("main")
+    ledger.record(run_id, STAGE_DOWNLOAD, 1, "A", 114, 1, "success")
+    ledger.record(run_id, STAGE_DOWNLOAD, 2, "B", 114, 1, "error")
+    ledger.record(run_id, STAGE_DOWNLOAD, 3, "C", 114, 1, "already_exists")
+    ledger.record(run_id, STAGE_DOWNLOAD, 4, "D", 114, 1, "no_data")
+
+    jobs = [(5, 114, 1), (4, 114, 1), (3, 114, 1), (2, 114, 1), (1, 114, 1)]
+    assert ledger.plan(STAGE_DOWNLOAD, jobs) == [(5, 114, 1), (4, 114, 1), (2, 114, 1)]
+    # 不同階段各自計算
+    assert ledger.plan(STAGE_PARSE, jobs) == jobs
+
+
+def test_plan_uses_latest_attempt(tmp_path):
+    ledger = make_ledger(tmp_path)
+    run_id = ledger.start_run("main")
+    ledger.record(run_id, STAGE_DOWNLOAD, 1, "A", 114, 1, "error")
+    ledger.record(run_id, STAGE_DOWNLOAD, 1, "A", 114, 1, "success")
+    ledger.record(run_id, STAGE_DOWNLOAD, 2, "B", 114, 1, "success")
+    ledger.record(run_id, STAGE_DOWNLOAD, 2, "B", 114, 1, "error")
+
+    assert ledger.plan(STAGE_DOWNLOAD, [(1, 114, 1), (2, 114, 1)]) == [(2, 114, 1)]
+
+
+def test_latest_filters_by_run(tmp_path):
+    ledger = make_ledger(tmp_path)
+    first = ledger.start_run("main")
+    ledger.record(first, STAGE_DOWNLOAD, 1, "A", 114, 1, "success", sha256="aa")
+    ledger.finish_run(first)
+    second = ledger.start_run("main")
+    ledger.record(second, STAGE_DOWNLOAD, 1, "A", 114, 1, "error", error_kind="timeout")
+    ledger.record(second, STAGE_DOWNLOAD, 2, "B", 114, 1, "no_data")
+
+    latest = ledger.latest(STAGE_DOWNLOAD)
+    assert latest[(1, 114, 1)].status == "error"
+    assert latest[(1, 114, 1)].error_kind == "timeout"
+
+    only_first = ledger.latest(STAGE_DOWNLOAD, run_id=first)
+    assert list(only_first) == [(1, 114, 1)]
+    assert only_first[(1, 114, 1)].done
+    assert only_first[(1, 114, 1)].sha256 == "aa"
+    assert set(ledger.latest(STAGE_DOWNLOAD, run_id=second)) == {(1, 114, 1), (2, 114, 1)}
+
+
+def test_last_unfinished_run(tmp_path):
+    ledger = make_ledger(tmp_path)
+    assert ledger.last_unfinished_run() is None
+
+    first = ledger.start_run("main", {"quarters": [[114, 1]]})
+    second = ledger.start_run("cli")
+    ledger.finish_run(second)
+
+    run = ledger.last_unfinished_run()
+    assert run.id == first
+    assert run.scope == {"quarters": [[114, 1]]}
+    assert ledger.get_run(second).finished_at is not None
+
+
+def test_for_data_dir_imports_existing_files(tmp_path):
+    quarter_dir = tmp_path / "114Q1"
+    quarter_dir.mkdir()
+    (quarter_dir / "31_玉山商業銀行_114Q1.pdf").write_bytes(b"%PDF-1.4 test")
+
+    ledger = Ledger.for_data_dir(str(tmp_path))
+    assert ledger.plan(STAGE_DOWNLOAD, [(31, 114, 1), (5, 114, 1)]) == [(5, 114, 1)]
+    assert ledger.latest(STAGE_DOWNLOAD)[(31, 114, 1)].status == "already_exists"
+    ledger.close()
+
+    # 已有紀錄時不再重複匯入
+    ledger = Ledger.for_data_dir(str(tmp_path))
+    assert len(ledger._conn.execute("SELECT * FROM attempts").fetchall()) == 1
+
+
+def test_resume_skips_finished_jobs(tmp_path):
+    ledger = make_ledger(tmp_path)
+    run_id = ledger.start_run("main")
+    ledger.record(run_id, STAGE_DOWNLOAD, 99, "測試銀行", 114, 1, "success")
+    ledger.record(run_id, STAGE_DOWNLOAD, 99, "測試銀行", 113, 4, "no_data")
+    ledger.record(run_id, STAGE_DOWNLOAD, 99, "測試銀行", 113, 3, "error")
+    other = ledger.start_run("main")
+    ledger.record(other, STAGE_DOWNLOAD, 99, "測試銀行", 113, 2, "success")
+
+    downloader = BankDownloader(data_dir=str(tmp_path), ledger=ledger)
+    downloader.use_run(run_id, resume=True)
+    assert set(downloader._resumed) == {(99, 114, 1), (99, 113, 4)}
+
+    result = asyncio.run(downloader.download("測試銀行", 114, 1, downloader_class=FakeBankDownloader))
+    assert result.status == DownloadStatus.SUCCESS
+    assert result.message.startswith("續跑略過")
+    result = asyncio.run(downloader.download("測試銀行", 113, 4, downloader_class=FakeBankDownloader))
+    assert result.status == DownloadStatus.NO_DATA
+
+    # 不是續跑時不略過
+    downloader.use_run(run_id)
+    assert downloader._resumed == {}
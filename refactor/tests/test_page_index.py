@@ -0,0 +1,98 @@
+"""
+資產品質頁碼索引測試（離線，不需要網路）
+"""
+import os
+import sys
+from unittest import mock
+
+# 加入 refactor 目錄到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.page_index import PageIndex, PageLocation, report_type_of
+
+
+PAGE_TEXT = "資 產 品 質\n逾期放款 123\n"
+
+
+def test_report_type_of():
+    assert report_type_of(4) == "annual"
+    assert report_type_of("Q2") == "semiannual"
+    assert report_type_of("1") == "quarterly"
+
+
+def test_probe_pages_expand_around_prediction():
+    location = PageLocation(page=3)
+    assert location.probe_pages(100) == [3, 2, 4, 1, 5]
+    assert PageLocation(page=0).probe_pages(2) == [0, 1]
+
+
+def test_probe_without_record(tmp_path):
+    index = PageIndex(str(tmp_path))
+    assert index.probe("unused.pdf", 5, "quarterly", 10) == []
+    assert index.misses == 0
+
+
+def test_record_and_probe(tmp_path):
+    index = PageIndex(str(tmp_path))
+    index.record(5, "quarterly", 10, page=2, text=PAGE_TEXT)
+    assert index.lookup(5, "quarterly", 10).anchors == ["資產品質", "逾期放款"]
+
+    # 不以關鍵字確認時回傳預測頁碼與前後頁
+    with mock.patch("utils.page_index.pages_with_keywords", return_value=None):
+        assert index.probe("unused.pdf", 5, "quarterly", 10) == [2, 1, 3, 0, 4]
+    with mock.patch("utils.page_index.pages_with_keywords", return_value=[3]) as confirm:
+        assert index.probe("unused.pdf", 5, "quarterly", 10) == [3]
+    confirm.assert_called_once_with("unused.pdf", [2, 1, 3, 0, 4], ["資產品質", "逾期放款"])
+
+    # 關鍵字都不在探測頁中視為未命中
+    with mock.patch("utils.page_index.pages_with_keywords", return_value=[]):
+        assert index.probe("unused.pdf", 5, "quarterly", 10) == []
+    assert index.misses == 1
+
+
+def test_lookup_nearest_page_count(tmp_path):
+    index = PageIndex(str(tmp_path))
+    index.record(5, "annual", 100, page=40)
+    index.record(5, "annual", 120, page=50)
+    index.record(5, "quarterly", 30, page=2)
+
+    assert index.lookup(5, "annual", 118).page == 50
+    assert index.lookup(5, "annual", 100).page == 40
+    assert index.lookup(5, "semiannual", 100) is None
+    assert index.lookup(6, "annual", 100) is None
+
+
+def test_save_and_reload(tmp_path):
+    index = PageIndex(str(tmp_path))
+    index.record(5, "quarterly", 10, page=2, text=PAGE_TEXT)
+    index.save()
+
+    reloaded = PageIndex(str(tmp_path))
+    assert len(reloaded) == 1
+    assert reloaded.lookup(5, "quarterly", 10).page == 2
+
+
+def test_take_and_merge_updates(tmp_path):
+    worker = PageIndex(str(tmp_path / "worker"))
+    worker.record(5, "quarterly", 10, page=2)
+    worker.count(hit=True)
+    worker.count(hit=False)
+
+    updates = worker.take_updates()
+    assert list(updates.entries) == ["5_quarterly_10"]
+    assert (updates.hits, updates.misses) == (1, 1)
+
+    # 取出後只帶回之後的變更；相同紀錄不算變更
+    worker.record(5, "quarterly", 10, page=2)
+    worker.count(hit=True)
+    again = worker.take_updates()
+    assert again.entries == {}
+    assert (again.hits, again.misses) == (1, 0)
+
+    main = PageIndex(str(tmp_path / "main"))
+    main.merge_updates(updates)
+    main.merge_updates(again)
+    assert main.lookup(5, "quarterly", 10).page == 2
+    assert (main.hits, main.misses) == (2, 1)
+    main.save()
+    assert main.path.is_file()
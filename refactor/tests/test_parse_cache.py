@@ -0,0 +1,58 @@
+"""
+解析快取測試（離線，不需要網路）
+"""
+import os
+import sys
+
+# 加入 refactor 目錄到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.blob_store import BlobStore
+from utils.parse_cache import ParseCache
+
+
+def write_pdf(data_dir, name, content):
+    quarter_dir = data_dir / name.rsplit("_", 1)[1][:-4]
+    quarter_dir.mkdir(exist_ok=True)
+    path = quarter_dir / name
+    path.write_bytes(content)
+    return path
+
+
+def test_parse_cache_get_put(tmp_path):
+    path = write_pdf(tmp_path, "1_A_114Q1.pdf", b"%PDF cache")
+    cache = ParseCache(str(tmp_path), parser_version="v1", store=BlobStore(str(tmp_path)))
+    key = cache.key(str(path), "1_A_v1", "114Q1")
+
+    assert cache.get(key) is None
+    cache.put(key, [{"項目": "逾期放款", "金額": 1}], source=path.name)
+    assert cache.get(key) == [{"項目": "逾期放款", "金額": 1}]
+
+    # 沒有資料的結果也快取
+    empty_key = cache.key(str(path), "1_A_v1", "114Q2")
+    assert empty_key != key
+    cache.put(empty_key, [])
+    assert cache.get(empty_key) == []
+
+    # 設定版本不同鍵值就不同
+    assert cache.key(str(path), "1_A_v2", "114Q1") != key
+
+
+def test_parse_cache_ignores_corrupt_entry(tmp_path):
+    cache = ParseCache(str(tmp_path), parser_version="v1")
+    key = "ab" + "0" * 62
+    cache.put(key, [{"a": 1}])
+    cache._path(key).write_text("{broken", encoding="utf-8")
+    assert cache.get(key) is None
+
+
+def test_parse_cache_prune_other_versions(tmp_path):
+    old = ParseCache(str(tmp_path), parser_version="v1")
+    old.put("ab" + "0" * 62, [{"a": 1}])
+    cache = ParseCache(str(tmp_path), parser_version="v2")
+    cache.put("cd" + "0" * 62, [{"a": 2}])
+
+    assert cache.prune() == 1
+    assert not old.version_dir.exists()
+    assert cache.get("cd" + "0" * 62) == [{"a": 2}]
+    assert ParseCache(str(tmp_path / "missing"), parser_version="v1").prune() == 0
@@ -0,0 +1,141 @@
+"""
+流量控制測試（離線，不需要網路）
+"""
+import asyncio
+import os
+import sys
+from unittest import mock
+
+# 加入 refactor 目錄到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from banks.rate_limit import AdaptiveLimiter, HostThrottle, TokenBucket
+
+
+class FakeClock:
+    """取代 time.monotonic 的可控時鐘"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_burst_then_wait():
+    clock = FakeClock()
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    async def take(bucket, count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    with mock.patch("banks.rate_limit.time.monotonic", clock), \
+            mock.patch("banks.rate_limit.asyncio.sleep", fake_sleep):
+        bucket = TokenBucket(rate=2.0, burst=3)
+        asyncio.run(take(bucket, 3))
+        assert sleeps == []
+        asyncio.run(take(bucket, 1))
+    assert sleeps == [0.5]
+
+
+def test_token_bucket_slow_down_and_recover():
+    bucket = TokenBucket(rate=8.0, burst=1)
+    for _ in range(5):
+        bucket.slow_down()
+    assert bucket.rate == 1.0
+    bucket.recover()
+    assert bucket.rate == 1.8
+    for _ in range(20):
+        bucket.recover()
+    assert bucket.rate == 8.0
+
+
+def test_adaptive_limiter_additive_increase():
+    limiter = AdaptiveLimiter(max_limit=4)
+    assert limiter.limit == 2
+    limiter.on_success(10.0)   # 慢回應不計
+    limiter.on_success(0.1)
+    assert limiter.limit == 2
+    limiter.on_success(0.1)
+    assert limiter.limit == 3
+    for _ in range(10):
+        limiter.on_success(0.1)
+    assert (limiter.limit, limiter.peak) == (4, 4)
+
+
+def test_adaptive_limiter_multiplicative_decrease():
+    clock = FakeClock()
+    with mock.patch("banks.rate_limit.time.monotonic", clock):
+        limiter = AdaptiveLimiter(max_limit=8, initial=8, cooldown=5.0)
+        limiter.on_congestion()
+        assert limiter.limit == 4
+        limiter.on_congestion()   # 冷卻期間只減一次
+        assert limiter.limit == 4
+        clock.now += 6
+        limiter.on_congestion()
+        clock.now += 6
+        limiter.on_congestion()
+        clock.now += 6
+        limiter.on_congestion()
+    assert (limiter.limit, limiter.decreases) == (1, 3)
+
+
+def test_adaptive_limiter_caps_concurrency():
+    limiter = AdaptiveLimiter(max_limit=2, initial=2)
+    active = 0
+    peak = 0
+
+    async def job():
+        nonlocal active, peak
+        async with limiter:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(job() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter._active == 0
+
+
+def test_adaptive_limiter_cancelled_waiter():
+    limiter = AdaptiveLimiter(max_limit=1, initial=1)
+
+    async def main():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release()
+        # 取消的等待者不佔名額
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+        limiter.release()
+
+    asyncio.run(main())
+    assert limiter._active == 0
+    assert not limiter._waiters
+
+
+def test_host_throttle_reports_congestion():
+    limiter = AdaptiveLimiter(max_limit=4, initial=4)
+    throttle = HostThrottle(limiter=limiter, overrides={})
+    url = "https://doc.twse.com.tw/a.pdf"
+
+    throttle.record(url, 429, 0.1)
+    throttle.record(url, 502, 0.1)
+    throttle.record_timeout(url)
+    stats = throttle.stats["doc.twse.com.tw"]
+    assert (stats.throttled, stats.server_errors, stats.timeouts) == (1, 1, 1)
+    assert throttle._buckets["doc.twse.com.tw"].rate < throttle.default_rate[0]
+    assert limiter.limit == 2   # 冷卻期間只減一次
+    assert "doc.twse.com.tw" in throttle.summary()
+    assert HostThrottle().summary() == "無壅塞"
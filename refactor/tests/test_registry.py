@@ -0,0 +1,66 @@
+"""
+銀行登錄表測試（離線，不需要網路）
+"""
+import os
+import sys
+
+import pytest
+
+# 加入 refactor 目錄到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from banks.registry import BANK_SPECS, MODULE_PATTERN, load_all, scan_specs, spec_from_source
+
+
+SOURCE = '''
+class NewBankDownloader(BaseBankDownloader):
+    bank_name = "新銀行"
+    bank_code = 99
+    bank_url = "https://example.com"
+
+    async def _discover(self, page, year=None):
+        return []
+'''
+
+
+def test_every_bank_module_is_registered():
+    banks_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "banks")
+    modules = {name[:-3] for name in os.listdir(banks_dir) if MODULE_PATTERN.match(name[:-3])}
+    assert {spec.module for spec in BANK_SPECS} == modules
+
+
+def test_codes_and_names_are_unique():
+    assert len({spec.code for spec in BANK_SPECS}) == len(BANK_SPECS)
+    assert len({spec.name for spec in BANK_SPECS}) == len(BANK_SPECS)
+
+
+def test_spec_from_source():
+    spec = spec_from_source("bank_99_newbank", SOURCE)
+    assert (spec.code, spec.name, spec.class_name, spec.discovery) == (99, "新銀行", "NewBankDownloader", True)
+
+
+def test_spec_code_must_match_filename():
+    with pytest.raises(ValueError):
+        spec_from_source("bank_98_newbank", SOURCE)
+
+
+def test_spec_requires_downloader_class():
+    with pytest.raises(ValueError):
+        spec_from_source("bank_99_newbank", "class Helper:\n    pass\n")
+
+
+def test_scan_specs(tmp_path):
+    (tmp_path / "bank_99_newbank.py").write_text(SOURCE, encoding="utf-8")
+    (tmp_path / "base.py").write_text("", encoding="utf-8")
+    assert [spec.module for spec in scan_specs(tmp_path)] == ["bank_99_newbank"]
+
+
+def test_loaded_classes_match_specs():
+    pytest.importorskip("playwright")
+    classes = load_all()
+    for spec in BANK_SPECS:
+        downloader_class = classes[spec.name]
+        assert downloader_class.__name__ == spec.class_name
+        assert downloader_class.bank_code == spec.code
+        assert downloader_class.bank_name == spec.name
+        assert downloader_class.supports_discovery() == spec.discovery
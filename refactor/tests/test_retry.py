@@ -0,0 +1,85 @@
+"""
+重試策略與斷路器測試（離線，不需要網路）
+"""
+import os
+import sys
+from unittest import mock
+
+# 加入 refactor 目錄到 path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from banks.retry import (
+    CircuitBreaker,
+    FailureKind,
+    RetryPolicy,
+    classify_exception,
+    classify_message,
+    failure_for_status,
+)
+
+
+class FakeClock:
+    """取代 time.monotonic 的可控時鐘"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_classify_failures():
+    assert failure_for_status(503) == FailureKind.SERVER_ERROR
+    assert failure_for_status(429) == FailureKind.SERVER_ERROR
+    assert failure_for_status(404) is None
+    assert classify_message("Timeout 30000ms exceeded") == FailureKind.TIMEOUT
+    assert classify_message("net::ERR_CONNECTION_RESET") == FailureKind.NETWORK
+    assert classify_message("找不到 PDF 連結") == FailureKind.UNKNOWN
+
+    class TimeoutError(Exception):
+        pass
+
+    assert classify_exception(TimeoutError("Timeout 30000ms exceeded.")) == FailureKind.TIMEOUT
+    assert classify_exception(TimeoutError("waiting for locator('a')")) == FailureKind.SELECTOR_MISSING
+    assert classify_exception(ConnectionResetError()) == FailureKind.NETWORK
+    assert not FailureKind.NOT_PDF.transient
+
+
+def test_retry_policy():
+    policy = RetryPolicy(max_attempts=3, base_delay=2.0, max_delay=5.0)
+    assert policy.should_retry(FailureKind.TIMEOUT, 1)
+    assert policy.should_retry(FailureKind.SERVER_ERROR, 2)
+    assert not policy.should_retry(FailureKind.TIMEOUT, 3)
+    assert not policy.should_retry(FailureKind.SELECTOR_MISSING, 1)
+    assert not policy.should_retry(None, 1)
+
+    with mock.patch("banks.retry.random.uniform", side_effect=lambda low, high: high):
+        assert [policy.delay(n) for n in (1, 2, 3, 4)] == [2.0, 4.0, 5.0, 5.0]
+
+
+def test_circuit_breaker_states():
+    clock = FakeClock()
+    with mock.patch("banks.retry.time.monotonic", clock):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.retry_after == 60
+
+        # 逾時後只放行一次試探
+        clock.now += 61
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()
+
+        # 試探失敗重新開啟
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        clock.now += 61
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.failures == 0
+        assert breaker.retry_after == 0.0
@@ -0,0 +1,287 @@
+"""
+內容定址 PDF 儲存
+
+PDF 內容依 SHA-256 存放於 {data_dir}/.blobs/ab/abcdef....pdf，
+原本的 {data_dir}/{year}Q{quarter}/{code}_{name}_{year}Q{quarter}.pdf 改為指向 blob 的
+硬連結（不支援時改用符號連結，再不行才複製）。內容相同的檔案只存一份。
+
+{data_dir}/.manifest.json 記錄每個檔案的雜湊、大小、來源網址、下載時間與頁數，
+解析快取與變更偵測可直接以雜湊判斷，不必重新讀取整份 PDF。
+
+頁數需要安裝（可選）：
+- PyMuPDF: pip install pymupdf
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fitz  # PyMuPDF
+    HAS_FITZ = True
+except ImportError:
+    fitz = None
+    HAS_FITZ = False
+
+
+BLOB_DIRNAME = ".blobs"
+MANIFEST_FILENAME = ".manifest.json"
+
+
+@dataclass
+class ManifestEntry:
+    """清單項目"""
+    sha256: str
+    size: int
+    source_url: str = ""
+    downloaded_at: str = ""
+    page_count: Optional[int] = None
+    mtime: float = 0.0          # 記錄時的修改時間，用於判斷雜湊是否仍有效
+    link: str = ""              # hardlink / symlink / copy
+
+
+def sha256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """計算檔案的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def count_pages(path: str) -> Optional[int]:
+    """取得 PDF 頁數（未安裝 PyMuPDF 或讀取失敗時回傳 None）"""
+    if not HAS_FITZ:
+        return None
+    try:
+        with fitz.open(path) as doc:
+            return doc.page_count
+    except Exception:
+        return None
+
+
+class BlobStore:
+    """
+    內容定址 PDF 儲存
+    
+    store 可能在多個執行緒中同時執行（下載流程以 asyncio.to_thread 呼叫），
+    雜湊計算不鎖定，連結與清單更新、寫回以鎖保護。
+    
+    使用方式:
+        store = BlobStore("data")
+        entry = store.store("data/114Q1/31_玉山商業銀行_114Q1.pdf", source_url="https://...")
+        print(entry.sha256, entry.page_count)
+    """
+    
+    def __init__(self, data_dir: str):
+        """
+        初始化儲存區
+        
+        Args:
+            data_dir: 資料目錄
+        """
+        self.data_dir = Path(data_dir)
+        self.blob_dir = self.data_dir / BLOB_DIRNAME
+        self.manifest_path = self.data_dir / MANIFEST_FILENAME
+        self._entries: Dict[str, ManifestEntry] = {}
+        self._lock = threading.RLock()
+        self._hashed: Dict[str, Tuple[int, float, str]] = {}  # 清單以外算過的雜湊 (大小, 修改時間, 雜湊)
+        self._load()
+    
+    def _load(self):
+        """讀取清單（不存在或格式錯誤時視為空清單）"""
+        if not self.manifest_path.is_file():
+            return
+        try:
+            raw = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            for key, value in raw.items():
+                if isinstance(value, dict) and value.get("sha256"):
+                    self._entries[key] = ManifestEntry(**{
+                        k: value[k] for k in ManifestEntry.__dataclass_fields__ if k in value
+                    })
+        except (OSError, ValueError, TypeError):
+            self._entries = {}
+    
+    def save(self):
+        """寫回清單（先寫暫存檔再改名）"""
+        with self._lock:
+            data = {key: asdict(entry) for key, entry in sorted(self._entries.items())}
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self.manifest_path.with_name(self.manifest_path.name + ".part")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.manifest_path)
+    
+    def _key(self, file_path: str) -> str:
+        """
+        清單鍵值：相對於資料目錄的路徑（統一使用 /）
+        
+        不使用 resolve()：檔案可能是指向 blob 的符號連結，解析後會變成 blob 路徑
+        """
+        path = Path(os.path.abspath(file_path))
+        try:
+            path = path.relative_to(os.path.abspath(self.data_dir))
+        except ValueError:
+            pass
+        return path.as_posix()
+    
+    def blob_path(self, sha256: str) -> Path:
+        """取得 blob 路徑"""
+        return self.blob_dir / sha256[:2] / f"{sha256}.pdf"
+    
+    def get(self, file_path: str) -> Optional[ManifestEntry]:
+        """取得檔案的清單項目"""
+        return self._entries.get(self._key(file_path))
+    
+    def sha256_of(self, file_path: str) -> str:
+        """
+        取得檔案雜湊：大小與修改時間與清單相同時直接使用清單的值，否則重新計算
+        （算過的結果記在記憶體中，檔案沒變時同一個 BlobStore 不會重算）
+        
+        Args:
+            file_path: 檔案路徑
+        """
+        key = self._key(file_path)
+        entry = self._entries.get(key)
+        stat = os.stat(file_path)
+        if entry and entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+            return entry.sha256
+        known = self._hashed.get(key)
+        if known and known[:2] == (stat.st_size, stat.st_mtime):
+            return known[2]
+        sha256 = sha256_file(file_path)
+        self._hashed[key] = (stat.st_size, stat.st_mtime, sha256)
+        return sha256
+    
+    def find_by_hash(self, sha256: str) -> List[str]:
+        """列出內容相同的檔案（相對路徑）"""
+        with self._lock:
+            return [key for key, entry in self._entries.items() if entry.sha256 == sha256]
+    
+    def _link(self, blob: Path, target: Path) -> str:
+        """將 target 指向 blob，回傳使用的方式"""
+        temp = target.with_name(target.name + ".link")
+        if temp.exists() or temp.is_symlink():
+            temp.unlink()
+        try:
+            os.link(blob, temp)
+            method = "hardlink"
+        except OSError:
+            try:
+                os.symlink(os.path.relpath(blob, target.parent), temp)
+                method = "symlink"
+            except OSError:
+                shutil.copy2(blob, temp)
+                method = "copy"
+        os.replace(temp, target)
+        return method
+    
+    def store(self, file_path: str, source_url: str = "", save: bool = True) -> ManifestEntry:
+        """
+        將檔案移入儲存區並以連結取代原路徑
+        
+        Args:
+            file_path: 已下載的 PDF 路徑
+            source_url: 來源網址
+            save: 是否立即寫回清單
+        
+        Returns:
+            ManifestEntry: 清單項目
+        """
+        target = Path(file_path)
+        key = self._key(file_path)
+        sha256 = sha256_file(file_path)
+        blob = self.blob_path(sha256)
+        with self._lock:
+            entry = self._store_locked(target, key, sha256, blob, source_url)
+            if save:
+                self.save()
+        return entry
+    
+    def _store_locked(
+        self, target: Path, key: str, sha256: str, blob: Path, source_url: str
+    ) -> ManifestEntry:
+        """store 需要持有鎖的部分：建立 blob 與連結、更新清單"""
+        previous = self._entries.get(key)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            # 先複製成暫存 blob 再改名，原檔在連結完成前都保持完整
+            temp_blob = blob.with_name(blob.name + ".part")
+            shutil.copy2(target, temp_blob)
+            os.replace(temp_blob, blob)
+        
+        if not os.path.samefile(blob, target):
+            link = self._link(blob, target)
+        else:
+            link = previous.link if previous else "hardlink"
+        
+        entry = ManifestEntry(
+            sha256=sha256,
+            size=blob.stat().st_size,
+            source_url=source_url or (previous.source_url if previous else ""),
+            downloaded_at=(
+                previous.downloaded_at if previous and previous.sha256 == sha256
+                else datetime.now().isoformat(timespec="seconds")
+            ),
+            page_count=(
+                previous.page_count if previous and previous.sha256 == sha256 and previous.page_count
+                else count_pages(str(blob))
+            ),
+            mtime=os.stat(target).st_mtime,
+            link=link,
+        )
+        self._entries[key] = entry
+        return entry
+    
+    def store_all(self) -> int:
+        """
+        將資料目錄中所有 PDF 納入儲存區（已建立連結的檔案只更新清單）
+        
+        Returns:
+            因內容重複而省下的位元組數
+        """
+        sizes: Dict[str, int] = {}
+        total = 0
+        for subdir in sorted(self.data_dir.iterdir()):
+            if not subdir.is_dir() or subdir.name.startswith(".") or "Q" not in subdir.name:
+                continue
+            for pdf in sorted(subdir.glob("*.pdf")):
+                entry = self.store(str(pdf), save=False)
+                sizes[entry.sha256] = entry.size
+                total += entry.size
+        self.save()
+        return total - sum(sizes.values())
+    
+    def gc(self) -> int:
+        """
+        刪除沒有任何檔案引用的 blob（例如來源更新後被取代的舊版本）
+        
+        Returns:
+            刪除的 blob 數
+        """
+        with self._lock:
+            # 先移除已不存在的檔案的清單項目
+            missing = [key for key in self._entries if not (self.data_dir / key).exists()]
+            for key in missing:
+                del self._entries[key]
+            if missing:
+                self.save()
+            referenced = {entry.sha256 for entry in self._entries.values()}
+        removed = 0
+        if not self.blob_dir.exists():
+            return 0
+        for blob in self.blob_dir.glob("*/*.pdf"):
+            if blob.stem not in referenced:
+                blob.unlink()
+                removed += 1
+        return removed
+    
+    def __len__(self) -> int:
+        return len(self._entries)
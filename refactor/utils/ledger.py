@@ -0,0 +1,323 @@
+"""
+執行紀錄資料庫（SQLite）
+
+記錄每一次執行（runs）與每個 (銀行, 季度, 階段) 的嘗試（attempts），
+包含狀態、耗時、位元組數、錯誤分類與檔案雜湊。
+待辦工作直接由資料庫查詢（不必掃描資料夾），中斷的執行也能從停下的地方繼續。
+
+資料庫位置: {data_dir}/.ledger.sqlite
+"""
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .file import list_pdf_files, parse_filename
+
+
+LEDGER_FILENAME = ".ledger.sqlite"
+
+STAGE_DOWNLOAD = "download"
+STAGE_PARSE = "parse"
+
+# 視為已完成、不需要再做的狀態
+DONE_STATUSES = ("success", "already_exists")
+
+# 續跑時不再重試的狀態（查無資料也算有結果）
+TERMINAL_STATUSES = DONE_STATUSES + ("no_data",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    command TEXT NOT NULL,
+    scope TEXT NOT NULL DEFAULT '{}',
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER REFERENCES runs(id),
+    stage TEXT NOT NULL,
+    bank_code INTEGER NOT NULL,
+    bank_name TEXT NOT NULL DEFAULT '',
+    year INTEGER NOT NULL,
+    quarter INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    duration_ms REAL NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    error_kind TEXT NOT NULL DEFAULT '',
+    message TEXT NOT NULL DEFAULT '',
+    sha256 TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_job ON attempts(stage, bank_code, year, quarter, id);
+CREATE INDEX IF NOT EXISTS idx_attempts_run ON attempts(run_id, stage);
+"""
+
+# (銀行代碼, 民國年, 季度)
+JobKey = Tuple[int, int, int]
+
+
+@dataclass
+class RunRecord:
+    """執行紀錄"""
+    id: int
+    command: str
+    scope: dict
+    started_at: str
+    finished_at: Optional[str] = None
+
+
+@dataclass
+class AttemptRecord:
+    """嘗試紀錄"""
+    run_id: int
+    stage: str
+    bank_code: int
+    bank_name: str
+    year: int
+    quarter: int
+    status: str
+    started_at: str
+    duration_ms: float = 0.0
+    bytes: int = 0
+    error_kind: str = ""
+    message: str = ""
+    sha256: str = ""
+    
+    @property
+    def key(self) -> JobKey:
+        return (self.bank_code, self.year, self.quarter)
+    
+    @property
+    def done(self) -> bool:
+        return self.status in DONE_STATUSES
+
+
+class Ledger:
+    """
+    執行紀錄資料庫
+    
+    使用方式:
+        ledger = Ledger.for_data_dir("data")
+        run_id = ledger.start_run("main", {"quarters": [[114, 1]]})
+        ledger.record(run_id, STAGE_DOWNLOAD, 31, "玉山商業銀行", 114, 1, "success", duration_ms=1234)
+        ledger.finish_run(run_id)
+        outstanding = ledger.plan(STAGE_DOWNLOAD, [(31, 114, 1)])
+    """
+    
+    def __init__(self, path: str):
+        """
+        開啟（必要時建立）資料庫
+        
+        Args:
+            path: 資料庫檔案路徑
+        """
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # 下載在事件迴圈、解析在執行緒池回呼，統一以鎖保護寫入
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+    
+    @classmethod
+    def for_data_dir(cls, data_dir: str) -> "Ledger":
+        """
+        取得資料目錄下的預設資料庫
+        
+        第一次建立時將既有的 PDF 匯入為已下載，避免 plan 把已有的檔案列為待辦。
+        """
+        ledger = cls(str(Path(data_dir) / LEDGER_FILENAME))
+        if not ledger.has_attempts(STAGE_DOWNLOAD):
+            ledger.import_files(data_dir)
+        return ledger
+    
+    def close(self):
+        """關閉資料庫"""
+        self._conn.close()
+    
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat(timespec="seconds")
+    
+    # ------------------------------------------------------------
+    # 執行
+    # ------------------------------------------------------------
+    
+    def start_run(self, command: str, scope: Optional[dict] = None) -> int:
+        """
+        開始一次執行
+        
+        Args:
+            command: 執行來源（例如 main、cli）
+            scope: 執行範圍（季度、銀行、是否產生報表），續跑時依此重建工作
+        
+        Returns:
+            執行編號
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (command, scope, started_at) VALUES (?, ?, ?)",
+                (command, json.dumps(scope or {}, ensure_ascii=False), self._now()),
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+    
+    def finish_run(self, run_id: int):
+        """標記執行完成"""
+        with self._lock:
+            self._conn.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (self._now(), run_id))
+            self._conn.commit()
+    
+    @staticmethod
+    def _run_from_row(row: sqlite3.Row) -> RunRecord:
+        return RunRecord(
+            id=row["id"],
+            command=row["command"],
+            scope=json.loads(row["scope"] or "{}"),
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+        )
+    
+    def get_run(self, run_id: int) -> Optional[RunRecord]:
+        """取得執行紀錄"""
+        row = self._conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return self._run_from_row(row) if row else None
+    
+    def last_unfinished_run(self) -> Optional[RunRecord]:
+        """取得最近一次未完成（中斷）的執行"""
+        row = self._conn.execute(
+            "SELECT * FROM runs WHERE finished_at IS NULL ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        return self._run_from_row(row) if row else None
+    
+    # ------------------------------------------------------------
+    # 嘗試
+    # ------------------------------------------------------------
+    
+    def record(
+        self,
+        run_id: Optional[int],
+        stage: str,
+        bank_code: int,
+        bank_name: str,
+        year: int,
+        quarter: int,
+        status: str,
+        duration_ms: float = 0.0,
+        bytes: int = 0,
+        error_kind: str = "",
+        message: str = "",
+        sha256: str = "",
+    ):
+        """
+        記錄一次嘗試
+        
+        Args:
+            run_id: 執行編號
+            stage: 階段（download / parse）
+            bank_code: 銀行代碼
+            bank_name: 銀行名稱
+            year: 民國年
+            quarter: 季度
+            status: 狀態（success / already_exists / no_data / error ...）
+            duration_ms: 耗時（毫秒）
+            bytes: 檔案大小
+            error_kind: 錯誤分類
+            message: 訊息
+            sha256: 產出檔案的雜湊
+        """
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO attempts (
+                    run_id, stage, bank_code, bank_name, year, quarter, status,
+                    started_at, duration_ms, bytes, error_kind, message, sha256
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    run_id, stage, bank_code, bank_name, year, quarter, status,
+                    self._now(), duration_ms, bytes, error_kind or "", message or "", sha256 or "",
+                ),
+            )
+            self._conn.commit()
+    
+    @staticmethod
+    def _attempt_from_row(row: sqlite3.Row) -> AttemptRecord:
+        return AttemptRecord(**{k: row[k] for k in AttemptRecord.__dataclass_fields__})
+    
+    def latest(self, stage: str, run_id: Optional[int] = None) -> Dict[JobKey, AttemptRecord]:
+        """
+        取得每個 (銀行, 季度) 最近一次的嘗試
+        
+        Args:
+            stage: 階段
+            run_id: 只看指定執行的嘗試，None 表示所有執行
+        """
+        query = """
+            SELECT a.* FROM attempts a
+            JOIN (
+                SELECT MAX(id) AS id FROM attempts
+                WHERE stage = ? {run_filter}
+                GROUP BY bank_code, year, quarter
+            ) latest ON a.id = latest.id
+        """
+        params: list = [stage]
+        if run_id is not None:
+            query = query.format(run_filter="AND run_id = ?")
+            params.append(run_id)
+        else:
+            query = query.format(run_filter="")
+        rows = self._conn.execute(query, params).fetchall()
+        return {(r["bank_code"], r["year"], r["quarter"]): self._attempt_from_row(r) for r in rows}
+    
+    def plan(self, stage: str, jobs: Iterable[JobKey]) -> List[JobKey]:
+        """
+        計算尚未完成的工作
+        
+        Args:
+            stage: 階段
+            jobs: 要檢查的 (銀行代碼, 民國年, 季度)
+        
+        Returns:
+            最近一次嘗試未成功（或從未嘗試）的工作，順序與輸入相同
+        """
+        latest = self.latest(stage)
+        return [job for job in jobs if not (job in latest and latest[job].done)]
+    
+    def has_attempts(self, stage: str) -> bool:
+        """是否有任何該階段的紀錄"""
+        row = self._conn.execute("SELECT 1 FROM attempts WHERE stage = ? LIMIT 1", (stage,)).fetchone()
+        return row is not None
+    
+    def import_files(self, data_dir: str) -> int:
+        """
+        將資料目錄中既有的 PDF 記為已下載（第一次使用資料庫時執行一次）
+        
+        Returns:
+            匯入的檔案數
+        """
+        files = list_pdf_files(data_dir) if Path(data_dir).exists() else []
+        if not files:
+            return 0
+        
+        run_id = self.start_run("import", {})
+        count = 0
+        for pdf in files:
+            info = parse_filename(pdf.name)
+            if not info["bank_code"]:
+                continue
+            self.record(
+                run_id, STAGE_DOWNLOAD, info["bank_code"], info["bank_name"],
+                info["year"], info["quarter"], "already_exists",
+                bytes=pdf.stat().st_size, message="匯入既有檔案",
+            )
+            count += 1
+        self.finish_run(run_id)
+        return count
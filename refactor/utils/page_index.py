@@ -0,0 +1,253 @@
+"""
+資產品質表格頁碼索引
+
+同一家銀行同一種報告（季報 / 半年報 / 年報）的資產品質表格幾乎都在固定位置
+（例如合庫、第一、兆豐在第 1 頁，土銀、彰銀在第 3 頁）。每次解析成功後記錄
+(銀行代碼, 報告種類, 總頁數) → 頁碼與該頁出現的關鍵字，存放於 {data_dir}/.page_index.json。
+
+之後解析時先探測預測頁碼與前後各 2 頁；安裝 PyMuPDF 時再以記錄的關鍵字確認，
+通常只需要 pdfplumber 分析一頁。探測不到才退回關鍵字預篩與逐頁掃描。
+"""
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .pdf_text import ASSET_QUALITY_KEYWORDS, compact_text, pages_with_keywords
+
+
+INDEX_FILENAME = ".page_index.json"
+
+# 預測頁碼前後各探測幾頁
+PROBE_RADIUS = 2
+
+
+def report_type_of(quarter: Union[int, str]) -> str:
+    """
+    報告種類（第 4 季為年報、第 2 季為半年報，其餘為季報）
+    
+    Args:
+        quarter: 季度（1-4 或 "Q1"-"Q4"）
+    """
+    text = str(quarter).upper().lstrip("Q")
+    if text == "4":
+        return "annual"
+    if text == "2":
+        return "semiannual"
+    return "quarterly"
+
+
+@dataclass
+class PageLocation:
+    """索引項目"""
+    page: int                                          # 資產品質表格頁碼（從 0 開始）
+    anchors: List[str] = field(default_factory=list)   # 該頁出現的關鍵字
+    page_count: int = 0
+    updated_at: str = ""
+    
+    def probe_pages(self, page_count: int, radius: int = PROBE_RADIUS) -> List[int]:
+        """
+        探測順序：預測頁碼，再往前後各 radius 頁交錯展開
+        
+        Args:
+            page_count: 這份 PDF 的總頁數
+            radius: 前後各探測幾頁
+        """
+        pages = [self.page]
+        for offset in range(1, radius + 1):
+            pages.extend((self.page - offset, self.page + offset))
+        return [p for p in pages if 0 <= p < page_count]
+
+
+@dataclass
+class PageIndexUpdates:
+    """子行程累積的索引變更（多行程解析時回傳給主行程合併）"""
+    entries: Dict[str, PageLocation] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+
+class PageIndex:
+    """
+    資產品質表格頁碼索引（JSON 檔）
+    
+    解析可能在多個執行緒中進行，讀寫都以鎖保護；record 只更新記憶體，
+    整批解析結束後再呼叫 save 寫回。多行程解析時每個子行程各有一份，
+    以 take_updates / merge_updates 將變更帶回主行程。
+    
+    使用方式:
+        index = PageIndex("data")
+        probe = index.probe("data/114Q1/5_臺灣土地銀行_114Q1.pdf", 5, "quarterly", 120)
+        ...
+        index.record(5, "quarterly", 120, page=2, text=page_text)
+        index.save()
+    """
+    
+    def __init__(self, data_dir: str):
+        """
+        初始化索引
+        
+        Args:
+            data_dir: 資料目錄（與 .manifest.json 同一層）
+        """
+        self.path = Path(data_dir) / INDEX_FILENAME
+        self.hits = 0     # 探測頁面中找到資料的次數
+        self.misses = 0   # 有預測但探測失敗、退回完整掃描的次數
+        self._entries: Dict[str, PageLocation] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._changed: Dict[str, PageLocation] = {}   # take_updates 之後的變更
+        self._taken = (0, 0)                          # take_updates 時的 (hits, misses)
+        self._load()
+    
+    @staticmethod
+    def _key(bank_code: int, report_type: str, page_count: int) -> str:
+        return f"{bank_code}_{report_type}_{page_count}"
+    
+    def _load(self):
+        """讀取索引（不存在或格式錯誤時視為空索引）"""
+        if not self.path.is_file():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            for key, value in raw.items():
+                if isinstance(value, dict) and isinstance(value.get("page"), int):
+                    self._entries[key] = PageLocation(**{
+                        k: value[k] for k in PageLocation.__dataclass_fields__ if k in value
+                    })
+        except (OSError, ValueError, TypeError):
+            self._entries = {}
+    
+    def save(self):
+        """寫回索引（沒有變更時不寫；先寫暫存檔再改名）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {key: asdict(entry) for key, entry in sorted(self._entries.items())}
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".part")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+    
+    def lookup(self, bank_code: int, report_type: str, page_count: int) -> Optional[PageLocation]:
+        """
+        取得預測位置
+        
+        總頁數完全相同的紀錄優先；沒有時改用同銀行同報告種類中總頁數最接近的紀錄
+        （每季頁數常有小幅增減，表格位置通常不變）。
+        
+        Args:
+            bank_code: 銀行代碼
+            report_type: 報告種類（見 report_type_of）
+            page_count: 這份 PDF 的總頁數
+        """
+        with self._lock:
+            entry = self._entries.get(self._key(bank_code, report_type, page_count))
+            if entry is not None:
+                return entry
+            prefix = f"{bank_code}_{report_type}_"
+            similar = [e for k, e in self._entries.items() if k.startswith(prefix)]
+        if not similar:
+            return None
+        # 頁數差距相同時取最近更新的紀錄
+        return max(similar, key=lambda e: (-abs(e.page_count - page_count), e.updated_at))
+    
+    def probe(
+        self,
+        pdf_path: str,
+        bank_code: int,
+        report_type: str,
+        page_count: int,
+        radius: int = PROBE_RADIUS,
+    ) -> List[int]:
+        """
+        應優先檢查的頁碼
+        
+        安裝 PyMuPDF 時只保留含有全部記錄關鍵字的頁面；
+        都不含時回傳空串列（視為未命中，直接走完整流程）。
+        
+        Args:
+            pdf_path: PDF 檔案路徑
+            bank_code: 銀行代碼
+            report_type: 報告種類
+            page_count: 這份 PDF 的總頁數
+            radius: 預測頁碼前後各探測幾頁
+        
+        Returns:
+            頁碼（從 0 開始），沒有紀錄時為空串列
+        """
+        location = self.lookup(bank_code, report_type, page_count)
+        if location is None:
+            return []
+        pages = location.probe_pages(page_count, radius)
+        if pages and location.anchors:
+            confirmed = pages_with_keywords(pdf_path, pages, location.anchors)
+            if confirmed is not None:
+                pages = confirmed
+        if not pages:
+            self.count(hit=False)
+        return pages
+    
+    def count(self, hit: bool):
+        """記錄一次探測結果"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    def record(self, bank_code: int, report_type: str, page_count: int, page: int, text: str = ""):
+        """
+        記錄解析成功的頁碼（只更新記憶體，需另外呼叫 save）
+        
+        Args:
+            bank_code: 銀行代碼
+            report_type: 報告種類
+            page_count: 這份 PDF 的總頁數
+            page: 取得資料的頁碼（從 0 開始）
+            text: 該頁文字（用來記錄出現的關鍵字）
+        """
+        compact = compact_text(text)
+        anchors = [keyword for keyword in ASSET_QUALITY_KEYWORDS if keyword in compact]
+        key = self._key(bank_code, report_type, page_count)
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous and previous.page == page and previous.anchors == anchors:
+                return
+            self._entries[key] = self._changed[key] = PageLocation(
+                page=page,
+                anchors=anchors,
+                page_count=page_count,
+                updated_at=datetime.now().isoformat(timespec="seconds"),
+            )
+            self._dirty = True
+    
+    def take_updates(self) -> PageIndexUpdates:
+        """取出上次呼叫之後的新紀錄與探測次數（子行程每解析完一個檔案呼叫一次）"""
+        with self._lock:
+            taken_hits, taken_misses = self._taken
+            updates = PageIndexUpdates(
+                entries=self._changed,
+                hits=self.hits - taken_hits,
+                misses=self.misses - taken_misses,
+            )
+            self._changed = {}
+            self._taken = (self.hits, self.misses)
+        return updates
+    
+    def merge_updates(self, updates: PageIndexUpdates):
+        """合併子行程的變更（只更新記憶體，需另外呼叫 save）"""
+        with self._lock:
+            self.hits += updates.hits
+            self.misses += updates.misses
+            if updates.entries:
+                self._entries.update(updates.entries)
+                self._dirty = True
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,131 @@
+"""
+PDF 解析結果快取
+
+同一份 PDF 用同一版解析程式得到的資料列一定相同，重新產生報表（例如只調整 Excel 輸出）
+時不必再用 pdfplumber 分析。每份 PDF 的解析結果存成一個 JSON 檔：
+
+    {data_dir}/.parse_cache/{parser_version}/{key[:2]}/{key}.json
+
+key 由 PDF 的 SHA-256、銀行設定版本與年度季度組成（內容相同的 PDF 可能出現在不同季度，
+資料列中的年度季度不同）。解析程式變更時 parser_version 跟著改變，舊版本的快取整個目錄
+不再被讀取，可用 prune() 刪除。
+
+每個項目各自以暫存檔改名寫入，多個解析行程同時寫入也不會互相覆蓋成半個檔案。
+"""
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from .blob_store import BlobStore, sha256_file
+
+
+CACHE_DIRNAME = ".parse_cache"
+
+
+class ParseCache:
+    """
+    PDF 解析結果快取
+    
+    使用方式:
+        cache = ParseCache("data", parser_version="3f2a9c...", store=BlobStore("data"))
+        key = cache.key("data/114Q1/31_玉山商業銀行_114Q1.pdf", "31_玉山商業銀行_v1", "114Q1")
+        rows = cache.get(key)
+        if rows is None:
+            rows = ...  # 解析
+            cache.put(key, rows, source="31_玉山商業銀行_114Q1.pdf")
+    """
+    
+    def __init__(self, data_dir: str, parser_version: str, store: Optional[BlobStore] = None):
+        """
+        初始化快取
+        
+        Args:
+            data_dir: 資料目錄（與 .manifest.json 同一層）
+            parser_version: 解析程式版本（程式碼變更時應跟著改變）
+            store: 內容定址儲存（有的話以清單中的雜湊避免重新讀取整份 PDF）
+        """
+        self.root = Path(data_dir) / CACHE_DIRNAME
+        self.parser_version = parser_version
+        self.version_dir = self.root / parser_version
+        self.store = store
+    
+    def sha256_of(self, pdf_path: str) -> str:
+        """取得 PDF 雜湊（清單中的大小與修改時間相符時不必重新計算）"""
+        if self.store is not None:
+            return self.store.sha256_of(pdf_path)
+        return sha256_file(pdf_path)
+    
+    def key(self, pdf_path: str, profile: str, year_quarter: str) -> str:
+        """
+        計算快取鍵值
+        
+        Args:
+            pdf_path: PDF 檔案路徑
+            profile: 銀行設定版本（銀行代碼、名稱與解析設定的版本）
+            year_quarter: 資料列使用的年度季度（例如 114Q1）
+        """
+        parts = (self.sha256_of(pdf_path), profile, year_quarter)
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.version_dir / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[List[dict]]:
+        """
+        讀取快取的資料列
+        
+        Returns:
+            資料列（欄位字典）；沒有快取或檔案損毀時回傳 None。
+            解析失敗（沒有資料）的結果也會快取，回傳空串列。
+        """
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            rows = entry["rows"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return rows if isinstance(rows, list) else None
+    
+    def put(self, key: str, rows: List[dict], source: str = ""):
+        """
+        寫入資料列（先寫暫存檔再改名）
+        
+        Args:
+            key: 快取鍵值（見 key）
+            rows: 資料列（欄位字典）
+            source: 來源檔名（只供檢視，不影響比對）
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "source": source,
+            "parser_version": self.parser_version,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "rows": rows,
+        }
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.part")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    
+    def prune(self) -> int:
+        """
+        刪除其他解析程式版本的快取
+        
+        Returns:
+            刪除的版本目錄數
+        """
+        if not self.root.is_dir():
+            return 0
+        removed = 0
+        for version_dir in self.root.iterdir():
+            if version_dir.is_dir() and version_dir.name != self.parser_version:
+                shutil.rmtree(version_dir, ignore_errors=True)
+                removed += 1
+        return removed
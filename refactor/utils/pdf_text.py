@@ -0,0 +1,102 @@
+"""
+PDF 頁面快速預篩
+
+pdfplumber 的 extract_text / extract_tables 需要做版面分析，年報動輒上百頁，
+逐頁分析非常慢。這裡先用 PyMuPDF（C 實作，只取文字不做版面分析）找出
+含有資產品質關鍵字的頁面，pdfplumber 只需要處理這幾頁。
+頁碼索引（utils/page_index.py）也用這裡的函式確認預測的頁面。
+
+未安裝 PyMuPDF、PDF 無法讀取或完全沒有文字（掃描檔）時回傳 None，
+呼叫端應退回逐頁掃描。
+
+需要安裝（可選）：
+- PyMuPDF: pip install pymupdf
+"""
+from typing import List, Optional, Sequence
+
+try:
+    import fitz  # PyMuPDF
+    HAS_FITZ = True
+except ImportError:
+    fitz = None
+    HAS_FITZ = False
+
+
+# 資產品質表格頁面的關鍵字
+ASSET_QUALITY_KEYWORDS = ("資產品質", "逾期放款", "放款業務合計")
+
+
+def compact_text(text: str) -> str:
+    """移除所有空白（PDF 常把「資 產 品 質」拆成單字），方便比對關鍵字"""
+    return "".join(text.split())
+
+
+def candidate_pages(
+    pdf_path: str,
+    keywords: Sequence[str] = ASSET_QUALITY_KEYWORDS,
+) -> Optional[List[int]]:
+    """
+    找出含有關鍵字的頁面
+    
+    Args:
+        pdf_path: PDF 檔案路徑
+        keywords: 關鍵字（任一出現即列入候選）
+    
+    Returns:
+        候選頁碼（從 0 開始），依命中的關鍵字數由多到少、同分依頁碼排列；
+        無法預篩時回傳 None（呼叫端應逐頁掃描）
+    """
+    if not HAS_FITZ:
+        return None
+    
+    scored = []
+    has_text = False
+    try:
+        with fitz.open(pdf_path) as doc:
+            for index, page in enumerate(doc):
+                text = compact_text(page.get_text("text"))
+                if not text:
+                    continue
+                has_text = True
+                score = sum(1 for keyword in keywords if keyword in text)
+                if score:
+                    scored.append((-score, index))
+    except Exception:
+        return None
+    
+    if not has_text:
+        return None
+    return [index for _, index in sorted(scored)]
+
+
+def pages_with_keywords(
+    pdf_path: str,
+    pages: Sequence[int],
+    keywords: Sequence[str],
+) -> Optional[List[int]]:
+    """
+    只檢查指定頁面，保留含有全部關鍵字的頁面（頁碼索引探測用）
+    
+    Args:
+        pdf_path: PDF 檔案路徑
+        pages: 要檢查的頁碼（從 0 開始），結果保持此順序
+        keywords: 關鍵字（需全部出現）
+    
+    Returns:
+        符合的頁碼；無法檢查時回傳 None（呼叫端應直接使用 pages）
+    """
+    if not HAS_FITZ:
+        return None
+    
+    matched = []
+    try:
+        with fitz.open(pdf_path) as doc:
+            for index in pages:
+                if not 0 <= index < doc.page_count:
+                    continue
+                text = compact_text(doc.load_page(index).get_text("text"))
+                if all(keyword in text for keyword in keywords):
+                    matched.append(index)
+    except Exception:
+        return None
+    return matched